@@ -1,9 +1,36 @@
 import streamlit as st
 import os
 
+from fourier.backends import DEFAULT_BACKEND, SESSION_KEY, backend_names
+from fourier.cache import compute_cache, figure_cache
+from fourier.figures import figure_stats
+from fourier.fragments import fragment_report
+from fourier.imports import ImportProfiler
+from fourier.inputs import input_report
+from fourier.jobs import cancel_jobs_except
+from fourier.page_loader import PageRegistry
+from fourier.windows import DEFAULT_WINDOW, window_label, window_names
+from fourier.windows import SESSION_KEY as WINDOW_SESSION_KEY
+
 # Get the base directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+
+@st.cache_resource(show_spinner=False)
+def get_page_registry():
+    # Shared by every session: each page is compiled once per server process
+    return PageRegistry(BASE_DIR)
+
+
+@st.cache_resource(show_spinner=False)
+def get_import_profiler():
+    # Created on the first (cold) session; warms the scientific stack in the
+    # background while the home page renders
+    profiler = ImportProfiler()
+    profiler.warm_up()
+    return profiler
+
+
 # Page configuration
 st.set_page_config(
     page_title="Fourier Transform Explorer",
@@ -12,6 +39,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Start warming heavy imports as early as possible on a cold server
+get_import_profiler()
+
 # Custom CSS for vibrant styling
 st.markdown("""
     <style>
@@ -84,24 +114,59 @@ st.sidebar.title("🌊 Fourier Transform Explorer")
 st.sidebar.markdown("---")
 
 # Navigation
+# Each page maps to its file and the heavy modules it needs before running
+PLOTTING = ("numpy", "matplotlib.figure")
+# Goertzel tone levels (fourier.goertzel) filter with scipy.signal
+SIGNAL = PLOTTING + ("scipy.signal",)
+PAGES = {
+    "🏠 Home": (None, ()),
+    "📚 Introduction & Origin": ("pages/01_introduction.py", PLOTTING),
+    "🔢 Mathematical Foundation": ("pages/02_mathematical_foundation.py", PLOTTING),
+    "💻 Code Examples": ("pages/03_code_examples.py", PLOTTING),
+    "⚡ Fast Fourier Transform (FFT)": ("pages/04_fft.py", SIGNAL),
+    "🔧 Engineering Applications": ("pages/05_engineering_applications.py", SIGNAL),
+    "📖 Code Components": ("pages/06_code_components.py", ()),
+    "⬇️ Download": ("pages/07_download.py", ()),
+    "💭 Final Thoughts": ("pages/08_final_thoughts.py", ()),
+    "📖 Development Story": ("pages/09_development_story.py", ()),
+    "🤖 AI Agents in Development": ("pages/10_ai_agents.py", ()),
+}
+
 page = st.sidebar.radio(
     "Navigate to:",
-    [
-        "🏠 Home",
-        "📚 Introduction & Origin",
-        "🔢 Mathematical Foundation",
-        "💻 Code Examples",
-        "⚡ Fast Fourier Transform (FFT)",
-        "🔧 Engineering Applications",
-        "📖 Code Components",
-        "⬇️ Download",
-        "💭 Final Thoughts",
-        "📖 Development Story",
-        "🤖 AI Agents in Development"
-    ],
+    list(PAGES),
     label_visibility="collapsed"
 )
 
+# FFT implementation used by every page in this session
+fft_backends = backend_names()
+default_backend = os.environ.get("FOURIER_FFT_BACKEND", DEFAULT_BACKEND)
+st.sidebar.selectbox(
+    "FFT backend",
+    fft_backends,
+    index=fft_backends.index(default_backend) if default_backend in fft_backends else 0,
+    key=SESSION_KEY,
+    help="numpy.fft, scipy.fft (multithreaded) or any optional backend that is installed"
+)
+
+# Window every spectrum on every page is tapered with
+spectrum_windows = window_names()
+default_window = os.environ.get("FOURIER_WINDOW", DEFAULT_WINDOW)
+st.sidebar.selectbox(
+    "Spectrum window",
+    spectrum_windows,
+    index=spectrum_windows.index(default_window) if default_window in spectrum_windows else 0,
+    format_func=window_label,
+    key=WINDOW_SESSION_KEY,
+    help="Tapers each signal before its spectrum is taken, reducing leakage; "
+         "amplitudes are corrected by the window's coherent gain. Filters are not windowed."
+)
+
+page_file, page_modules = PAGES[page]
+
+# Navigating away from a page cancels the background jobs it started
+cancel_jobs_except(os.path.join(BASE_DIR, page_file) if page_file else None)
+
 # Route to pages
 if page == "🏠 Home":
     st.title("🌊 Welcome to Fourier Transform Explorer")
@@ -171,33 +236,50 @@ if page == "🏠 Home":
         </div>
         """, unsafe_allow_html=True)
 
-elif page == "📚 Introduction & Origin":
-    exec(open(os.path.join(BASE_DIR, "pages/01_introduction.py")).read())
-
-elif page == "🔢 Mathematical Foundation":
-    exec(open(os.path.join(BASE_DIR, "pages/02_mathematical_foundation.py")).read())
-
-elif page == "💻 Code Examples":
-    exec(open(os.path.join(BASE_DIR, "pages/03_code_examples.py")).read())
-
-elif page == "⚡ Fast Fourier Transform (FFT)":
-    exec(open(os.path.join(BASE_DIR, "pages/04_fft.py")).read())
+else:
+    get_import_profiler().require(page_file, page_modules)
+    get_page_registry().run(page_file)
 
-elif page == "🔧 Engineering Applications":
-    exec(open(os.path.join(BASE_DIR, "pages/05_engineering_applications.py")).read())
+# Per-page compile/execute timings (compile only happens on first load or edit)
+with st.sidebar.expander("⏱️ Page Timings"):
+    page_stats = get_page_registry().stats()
+    if page_stats:
+        st.table([{"page": os.path.basename(name), **s} for name, s in page_stats.items()])
+    else:
+        st.caption("No pages loaded yet.")
 
-elif page == "📖 Code Components":
-    exec(open(os.path.join(BASE_DIR, "pages/06_code_components.py")).read())
+# Import cost attributed to the page that first needed each module
+with st.sidebar.expander("📦 Import Profile"):
+    import_report = get_import_profiler().report()
+    if import_report:
+        st.table(import_report)
+    else:
+        st.caption("No heavy modules imported yet.")
 
-elif page == "⬇️ Download":
-    exec(open(os.path.join(BASE_DIR, "pages/07_download.py")).read())
+# Demo sections rerun on their own; "skipped" is work a full rerun would have done
+with st.sidebar.expander("🧩 Fragment Reruns"):
+    fragment_rows = fragment_report()
+    if fragment_rows:
+        st.table(fragment_rows)
+    else:
+        st.caption("No interactive demos run in this session yet.")
 
-elif page == "💭 Final Thoughts":
-    exec(open(os.path.join(BASE_DIR, "pages/08_final_thoughts.py")).read())
+# Widget changes vs. reruns and computations for each demo's input batching mode
+with st.sidebar.expander("🎚️ Input Batching"):
+    input_rows = input_report()
+    if input_rows:
+        st.table(input_rows)
+    else:
+        st.caption("No batched demos run in this session yet.")
 
-elif page == "📖 Development Story":
-    exec(open(os.path.join(BASE_DIR, "pages/09_development_story.py")).read())
+# Shared demo result cache (one per server process, used by every session)
+with st.sidebar.expander("🗄️ Compute Cache"):
+    st.table([compute_cache.stats()])
 
-elif page == "🤖 AI Agents in Development":
-    exec(open(os.path.join(BASE_DIR, "pages/10_ai_agents.py")).read())
+# Encoded figures reused across reruns and sessions
+with st.sidebar.expander("🖼️ Figure Cache"):
+    st.table([figure_cache.stats()])
 
+# Live matplotlib figures; should return to 0 between reruns
+with st.sidebar.expander("📈 Figure Lifecycle"):
+    st.table([figure_stats()])
@@ -0,0 +1 @@
+"""Shared runtime helpers for the Fourier Transform Explorer pages."""
@@ -0,0 +1,233 @@
+"""Pluggable FFT backends.
+
+The demos call the transform functions of the *active* backend instead of
+``np.fft`` directly. Backends wrap a NumPy-compatible FFT module:
+
+* ``numpy``: ``numpy.fft`` (pocketfft, single-threaded);
+* ``scipy``: ``scipy.fft`` with ``workers=`` threading;
+* ``pyfftw``: ``pyfftw.interfaces.scipy_fft`` with FFTW's plan cache
+  enabled, so repeated shapes reuse their plans (optional install);
+* ``mkl_fft``: ``mkl_fft.interfaces.scipy_fft`` (optional install).
+
+NumPy and SciPy keep their own internal caches of pocketfft plans; FFTW
+plans are expensive to build, which is why the ``pyfftw`` backend turns on
+its interface cache. Each backend is built once per process.
+
+The active backend is chosen, in order, by ``use_backend`` (for code
+running outside a Streamlit session, such as jobs and CLIs), the session's
+sidebar choice stored under ``SESSION_KEY``, and the ``FOURIER_FFT_BACKEND``
+environment variable (default ``numpy``). ``FOURIER_FFT_WORKERS`` sets the
+thread count of threaded backends (default: all CPUs).
+
+Run ``python -m fourier.backends`` for a side-by-side throughput benchmark.
+"""
+
+import contextlib
+import contextvars
+import functools
+import importlib.util
+import math
+import os
+import sys
+
+DEFAULT_BACKEND = "numpy"
+SESSION_KEY = "fourier_fft_backend"
+
+TRANSFORMS = ("fft", "ifft", "rfft", "irfft", "fft2", "ifft2", "rfft2", "irfft2",
+              "fftn", "ifftn")
+
+_active = contextvars.ContextVar("fourier_fft_backend", default=None)
+
+
+class FFTBackend:
+    """NumPy-style transform functions bound to one FFT implementation."""
+
+    def __init__(self, name, label, module, workers=None, plan_cache=None):
+        self.name = name
+        self.label = label
+        self.workers = workers or 1
+        self.plan_cache = plan_cache
+        extra = {"workers": workers} if workers else {}
+        for fname in TRANSFORMS:
+            setattr(self, fname, functools.partial(getattr(module, fname), **extra))
+
+    def __repr__(self):
+        return f"FFTBackend({self.name!r}, workers={self.workers})"
+
+
+def default_workers():
+    return int(os.environ.get("FOURIER_FFT_WORKERS", os.cpu_count() or 1))
+
+
+def _numpy():
+    import numpy as np
+
+    return FFTBackend("numpy", "numpy.fft", np.fft, plan_cache="pocketfft (internal)")
+
+
+def _scipy():
+    import scipy.fft
+
+    return FFTBackend("scipy", "scipy.fft", scipy.fft, workers=default_workers(),
+                      plan_cache="pocketfft (internal)")
+
+
+def _pyfftw():
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    return FFTBackend("pyfftw", "pyfftw (FFTW)", pyfftw.interfaces.scipy_fft,
+                      workers=default_workers(), plan_cache="FFTW plans, 60 s keepalive")
+
+
+def _mkl_fft():
+    import mkl_fft.interfaces.scipy_fft
+
+    return FFTBackend("mkl_fft", "mkl_fft (Intel MKL)", mkl_fft.interfaces.scipy_fft,
+                      workers=default_workers(), plan_cache="MKL descriptors (internal)")
+
+
+# name -> (module that must be importable, factory)
+BACKENDS = {
+    "numpy": ("numpy", _numpy),
+    "scipy": ("scipy", _scipy),
+    "pyfftw": ("pyfftw", _pyfftw),
+    "mkl_fft": ("mkl_fft", _mkl_fft),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def backend_names():
+    """Names of the backends whose package is installed (nothing is imported)."""
+    return tuple(name for name, (module, _) in BACKENDS.items()
+                 if importlib.util.find_spec(module) is not None)
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend(name=None):
+    """The backend called ``name`` (default: ``FOURIER_FFT_BACKEND``)."""
+    name = name or os.environ.get("FOURIER_FFT_BACKEND", DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"unknown FFT backend {name!r}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name][1]()
+
+
+def _session_choice():
+    """The sidebar choice when called from a Streamlit script thread."""
+    if "streamlit" not in sys.modules:
+        return None
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(SESSION_KEY)
+
+
+def active_backend():
+    """The backend the current code should transform with."""
+    return get_backend(_active.get() or _session_choice())
+
+
+@contextlib.contextmanager
+def use_backend(name):
+    """Make ``name`` the active backend inside the ``with`` block."""
+    token = _active.set(name)
+    try:
+        yield get_backend(name)
+    finally:
+        _active.reset(token)
+
+
+def _flops(shape):
+    # Conventional 5 N log2 N flop count of a complex FFT, per transformed axis
+    n = math.prod(shape)
+    return 5 * n * math.log2(n)
+
+
+def benchmark(names=None, n=1 << 16, shape_2d=(512, 512), batch=(64, 4096), progress=None):
+    """Time 1D, 2D and batched complex FFTs with each backend.
+
+    Returns one row per (backend, transform) with the median time, the
+    throughput in mega-samples per second and GFLOP/s (5 N log2 N).
+    ``progress(fraction, message)`` is called before each measurement.
+    """
+    import numpy as np
+
+    from fourier.timing import measure
+
+    rng = np.random.default_rng(0)
+
+    def signal(shape):
+        return rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+
+    cases = (
+        ("1D", (n,), "fft", signal((n,))),
+        ("2D", shape_2d, "fft2", signal(shape_2d)),
+        ("Batched 1D", batch, "fft", signal(batch)),
+    )
+    names = list(names or backend_names())
+    rows = []
+    for i, name in enumerate(names):
+        backend = get_backend(name)
+        for j, (kind, shape, fname, x) in enumerate(cases):
+            if progress is not None:
+                progress((i * len(cases) + j) / (len(names) * len(cases)), f"{name}: {kind}")
+            timing = measure(getattr(backend, fname), x, budget_s=0.1, max_total_s=1.0)
+            # A batch of 1D transforms: flops of each row times the number of rows
+            flops = _flops(shape[-1:]) * shape[0] if kind == "Batched 1D" else _flops(shape)
+            rows.append({
+                "backend": name,
+                "workers": backend.workers,
+                "transform": kind,
+                "shape": "×".join(str(s) for s in shape),
+                "median_ms": round(timing.median_ms, 4),
+                "msamples_s": round(x.size / timing.median_s / 1e6, 1),
+                "gflops": round(flops / timing.median_s / 1e9, 2),
+            })
+    return rows
+
+
+def draw_benchmark(rows):
+    """Grouped bars of GFLOP/s per transform, one bar per backend."""
+    import numpy as np
+
+    from fourier.figures import new_figure
+
+    kinds = list(dict.fromkeys(row["transform"] for row in rows))
+    names = list(dict.fromkeys(row["backend"] for row in rows))
+    gflops = {(row["backend"], row["transform"]): row["gflops"] for row in rows}
+    width = 0.8 / len(names)
+    x = np.arange(len(kinds))
+
+    fig, ax = new_figure(figsize=(10, 5))
+    for i, name in enumerate(names):
+        ax.bar(x + (i - (len(names) - 1) / 2) * width,
+               [gflops.get((name, kind), 0) for kind in kinds], width, label=name)
+    ax.set_xticks(x)
+    ax.set_xticklabels(kinds)
+    ax.set_ylabel("GFLOP/s (5 N log₂ N)")
+    ax.set_title("FFT Backend Throughput", fontweight="bold")
+    ax.grid(True, axis="y", alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("backends", nargs="*", help=f"default: installed ({', '.join(backend_names())})")
+    parser.add_argument("-n", type=int, default=1 << 16, help="1D transform length")
+    args = parser.parse_args(argv)
+
+    for row in benchmark(args.backends or None, n=args.n):
+        print("  ".join(f"{k}={v}" for k, v in row.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Shared, parameter-keyed result cache for the interactive demos.
+
+Streamlit reruns a page for every widget change and every session, but the
+demos are pure functions of their slider values. ``ComputeCache`` keeps the
+results in one process-wide LRU with a memory budget, so popular settings
+(the defaults in particular) are computed once and then served from memory
+to every session.
+
+The budget defaults to 64 MB and can be changed with the
+``FOURIER_CACHE_MB`` environment variable. A second instance,
+``figure_cache``, holds encoded figure images (``FOURIER_FIGURE_CACHE_MB``,
+default 32 MB); see ``fourier.plotting``.
+"""
+
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_BUDGET_MB = 64
+DEFAULT_FIGURE_BUDGET_MB = 32
+
+
+def _sizeof(value):
+    """Approximate the memory held by a cached result, in bytes."""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Mark arrays read-only so one session cannot corrupt another's result."""
+    if hasattr(value, "flags") and hasattr(value, "setflags"):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    return value
+
+
+class ComputeCache:
+    """Thread-safe LRU cache bounded by an approximate byte budget."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            # Larger than the whole budget: serve it, but never cache it
+            return value
+        _freeze(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def resize(self, max_bytes):
+        """Change the budget, evicting least recently used entries if needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_MISSING = object()
+
+
+def _budget(env_var, default_mb):
+    return int(float(os.environ.get(env_var, default_mb)) * 1024 * 1024)
+
+
+compute_cache = ComputeCache(_budget("FOURIER_CACHE_MB", DEFAULT_BUDGET_MB))
+figure_cache = ComputeCache(_budget("FOURIER_FIGURE_CACHE_MB", DEFAULT_FIGURE_BUDGET_MB))
+
+
+def memoize(name, cache=None):
+    """Cache a pure function's result under ``name`` and its arguments.
+
+    Pages are re-executed on every rerun, so their functions are new objects
+    each time; the explicit ``name`` keeps the key stable across reruns and
+    sessions. Arguments must be hashable (slider values, strings, tuples).
+    Cached arrays are returned read-only.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = compute_cache if cache is None else cache
+            key = (name, args, tuple(sorted(kwargs.items())))
+            value = target.get(key, _MISSING)
+            if value is _MISSING:
+                value = target.put(key, func(*args, **kwargs))
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,220 @@
+"""Decimation of long line plots down to the pixels they are drawn on.
+
+A line of N samples costs matplotlib O(N) to transform, clip and rasterize,
+however few pixels it covers. Figures from ``fourier.figures.new_figure``
+use ``DecimatedAxes``, whose ``plot`` keeps the full data of long lines and
+whose ``draw`` replaces each of them, just before rendering, with a reduced
+copy of the part inside the current x limits:
+
+* ``minmax`` (default): the samples are split into one bucket per pixel
+  column and the minimum and maximum of each bucket are kept in time order,
+  so every peak and the full envelope survive exactly;
+* ``lttb``: Largest-Triangle-Three-Buckets picks, per bucket, the sample
+  forming the largest triangle with the previous pick and the next
+  bucket's mean, which keeps the visual shape with one point per bucket;
+* ``off``: plot every sample.
+
+Decimating at draw time uses the final axes width in device pixels and the
+final x limits, so zooming with ``set_xlim`` after plotting still shows
+full detail. Only ``plot(x, y[, fmt])`` calls with increasing x longer than
+``MIN_POINTS`` are handled; matplotlib is given a min/max preview of the
+line, which has the same extremes and end points as the full data, so
+autoscaling is unchanged and matplotlib never copies the long arrays.
+``FOURIER_DECIMATE`` sets the default mode, ``plot(..., decimate=mode)``
+overrides it per line.
+
+Run ``python -m fourier.decimate`` to time rendering at 10^4 to 10^7
+samples in each mode (``--max-log10 8`` goes to 10^8).
+"""
+
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+
+MODES = ("minmax", "lttb", "off")
+DEFAULT_MODE = "minmax"
+PROJECTION = "fourier_decimated"
+# Shorter lines are never worth checking
+MIN_POINTS = 4096
+# Buckets of the preview matplotlib holds until the first draw
+PREVIEW_BUCKETS = 2048
+
+
+def default_mode():
+    mode = os.environ.get("FOURIER_DECIMATE", DEFAULT_MODE)
+    return mode if mode in MODES else DEFAULT_MODE
+
+
+def minmax_indices(y, buckets):
+    """Indices of the minimum and maximum of ``buckets`` equal slices of ``y``."""
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    full = n // size * size
+    body = y[:full].reshape(-1, size)
+    base = np.arange(len(body)) * size
+    lo, hi = body.argmin(axis=1), body.argmax(axis=1)
+    pairs = [np.minimum(lo, hi) + base, np.maximum(lo, hi) + base]
+    idx = np.stack(pairs, axis=1).ravel()
+    if full < n:
+        tail = y[full:]
+        idx = np.concatenate([idx, full + np.sort([tail.argmin(), tail.argmax()])])
+    # Keep both end points so the line spans the same x range
+    return np.concatenate([[0], idx, [n - 1]])
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: ``n_out`` indices into ``(x, y)``."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    # Buckets of the interior points; the first and last points are kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+        # Twice the triangle area (a, candidate, next-bucket mean), up to sign
+        area = np.abs((ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay))
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def decimate(x, y, width, mode=None):
+    """``(x, y)`` reduced for a line ``width`` pixels wide with ``mode``."""
+    mode = mode or default_mode()
+    width = max(int(width), 1)
+    if mode == "off" or len(y) <= 2 * width:
+        return x, y
+    if mode == "lttb":
+        idx = lttb_indices(x, y, 2 * width)
+    else:
+        idx = minmax_indices(y, width)
+    return x[idx], y[idx]
+
+
+def _visible(x, lo, hi):
+    """Slice of increasing ``x`` inside [lo, hi], plus one point either side."""
+    start = max(int(np.searchsorted(x, lo, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, hi, side="right")) + 1, len(x))
+    return slice(start, stop)
+
+
+def _long_line(args):
+    """``(x, y)`` if ``plot(*args)`` draws one long line over increasing x."""
+    if len(args) not in (2, 3) or (len(args) == 3 and not isinstance(args[2], str)):
+        return None
+    x, y = np.asarray(args[0]), np.asarray(args[1])
+    if (x.ndim != 1 or x.shape != y.shape or len(x) <= MIN_POINTS
+            or x.dtype.kind not in "fiu" or y.dtype.kind not in "fiu"):
+        return None
+    return (x, y) if np.all(x[1:] >= x[:-1]) else None
+
+
+@functools.lru_cache(maxsize=None)
+def projection():
+    """Register ``DecimatedAxes`` with matplotlib and return its name."""
+    from matplotlib.axes import Axes
+    from matplotlib.projections import register_projection
+
+    class DecimatedAxes(Axes):
+        """``Axes`` that decimates long lines to its pixel width when drawn."""
+
+        name = PROJECTION
+
+        def plot(self, *args, decimate=None, **kwargs):
+            mode = decimate or default_mode()
+            line = None if mode == "off" else _long_line(args)
+            if line is None:
+                return super().plot(*args, **kwargs)
+            x, y = line
+            preview = minmax_indices(y, PREVIEW_BUCKETS)
+            lines = super().plot(x[preview], y[preview], *args[2:], **kwargs)
+            lines[0]._fourier_full = (x, y, mode)
+            return lines
+
+        def draw(self, renderer):
+            width = self.bbox.width
+            lo, hi = sorted(self.get_xlim())
+            for line in self.lines:
+                full = getattr(line, "_fourier_full", None)
+                if full is not None:
+                    x, y, mode = full
+                    view = _visible(x, lo, hi)
+                    line.set_data(*decimate(x[view], y[view], width, mode))
+            super().draw(renderer)
+
+    register_projection(DecimatedAxes)
+    return PROJECTION
+
+
+def benchmark(sizes=(10**4, 10**5, 10**6, 10**7), modes=MODES, max_full=10**7):
+    """PNG render time of one long line per size and mode.
+
+    ``off`` is skipped above ``max_full`` samples. Returns dict rows with
+    the render time and the number of points matplotlib actually drew.
+    """
+    from fourier.figures import new_figure
+    from fourier.plotting import encode_figure
+
+    def render(t, y, mode):
+        fig, ax = new_figure(figsize=(10, 3))
+        (line,) = ax.plot(t, y, "b-", linewidth=1, decimate=mode)
+        fig.tight_layout()
+        encode_figure(fig)
+        return line
+
+    render(np.arange(10.0), np.zeros(10), "off")  # import and font cache warm-up
+    rows = []
+    for n in sizes:
+        # Built in place: at 10^8 samples every temporary is 800 MB
+        t = np.linspace(0, 10, n)
+        y = np.random.default_rng(0).standard_normal(n)
+        y *= 0.2
+        wave = t * (2 * np.pi * 3)
+        y += np.sin(wave, out=wave)
+        del wave
+        y[n // 3] = 5.0  # a single-sample spike decimation must keep
+        for mode in modes:
+            if mode == "off" and n > max_full:
+                continue
+            start = time.perf_counter()
+            line = render(t, y, mode)
+            elapsed = time.perf_counter() - start
+            # The line keeps the data of its last draw
+            drawn = line.get_ydata()
+            rows.append({"n": n, "mode": mode, "render_s": elapsed,
+                         "points_drawn": len(drawn), "peak_kept": float(np.max(drawn)) == 5.0})
+    return rows
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-log10", type=int, default=7)
+    parser.add_argument("--max-full-log10", type=int, default=7,
+                        help="largest size rendered with decimation off")
+    args = parser.parse_args(argv)
+
+    sizes = [10**k for k in range(4, args.max_log10 + 1)]
+    for row in benchmark(sizes, max_full=10**args.max_full_log10):
+        print(f"n={row['n']:<10,} mode={row['mode']:<6} render={row['render_s']:8.3f} s  "
+              f"points drawn={row['points_drawn']:<10,} peak kept={row['peak_kept']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Arbitrary-length FFT engine written with NumPy array operations.
+
+``fft`` transforms any length, the way the "FFT Algorithm Types" section
+describes, using three algorithms:
+
+* **Mixed radix** (Cooley-Tukey): for N = r * m the signal is split into r
+  interleaved subsequences of length m, transformed recursively as one
+  batch, multiplied by twiddle factors and combined by length-r DFTs. The
+  radix is 4 when N is divisible by 4, otherwise N's smallest prime factor.
+* **Rader**: a prime length p becomes a cyclic convolution of length p - 1
+  (by permuting the inputs with powers of a primitive root), which is
+  computed with the engine itself. Used when p - 1 has only small factors.
+* **Bluestein** (chirp-z): any length becomes a convolution of length at
+  least 2N - 1, padded to the next 7-smooth length. Used for the other
+  primes.
+
+Every stage works on a whole batch of rows at once, and twiddles, small DFT
+matrices and Rader/Bluestein kernels are cached per size.
+
+``advise_padding`` suggests the next 7-smooth length and times the engine
+and the active library backend (``fourier.backends``) at both lengths.
+Padding changes the result (it samples the spectrum more finely), so it
+only helps where that is acceptable, for example in convolution or
+spectral estimation.
+
+Run ``python -m fourier.fft_engine`` to check the engine against NumPy and
+print timings.
+"""
+
+import functools
+import sys
+
+import numpy as np
+
+# Lengths up to this use a DFT matrix directly; also the largest "small"
+# prime factor Rader is allowed to recurse into
+SMALL_DFT = 16
+FAST_RADICES = (2, 3, 5, 7)
+
+
+def factorize(n):
+    """Prime factors of ``n`` in increasing order."""
+    factors = []
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors.append(d)
+            n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def _radix(n):
+    if n % 4 == 0 and n > 4:
+        return 4
+    return factorize(n)[0]
+
+
+def prime_algorithm(p):
+    """``"rader"`` or ``"bluestein"``: what ``fft`` uses for prime ``p``."""
+    return "rader" if max(factorize(p - 1)) <= SMALL_DFT else "bluestein"
+
+
+def _frozen(a):
+    a.setflags(write=False)
+    return a
+
+
+@functools.lru_cache(maxsize=128)
+def _dft_matrix(n):
+    k = np.arange(n)
+    return _frozen(np.exp(-2j * np.pi * (np.outer(k, k) % n) / n))
+
+
+@functools.lru_cache(maxsize=128)
+def _twiddles(r, m):
+    # W_N^(j k) for subsequence j < r and output bin k < m, N = r * m
+    n = r * m
+    return _frozen(np.exp(-2j * np.pi * (np.outer(np.arange(r), np.arange(m)) % n) / n))
+
+
+@functools.lru_cache(maxsize=64)
+def _primitive_root(p):
+    phi = p - 1
+    primes = set(factorize(phi))
+    for g in range(2, p):
+        if all(pow(g, phi // q, p) != 1 for q in primes):
+            return g
+    raise ValueError(f"{p} is not prime")
+
+
+@functools.lru_cache(maxsize=64)
+def _rader_plan(p):
+    g = _primitive_root(p)
+    g_inv = pow(g, p - 2, p)
+    m = np.arange(p - 1)
+    gather = np.array([pow(g, int(i), p) for i in m])
+    scatter = np.array([pow(g_inv, int(i), p) for i in m])
+    kernel = np.exp(-2j * np.pi * scatter / p)
+    return _frozen(gather), _frozen(scatter), _frozen(fft(kernel))
+
+
+@functools.lru_cache(maxsize=64)
+def _bluestein_plan(n):
+    size = next_fast_len(2 * n - 1)
+    k = np.arange(n)
+    # exp(-iπ k²/N) with k² reduced mod 2N so the phase stays exact
+    chirp = np.exp(-1j * np.pi * ((k * k) % (2 * n)) / n)
+    kernel = np.zeros(size, dtype=complex)
+    kernel[:n] = np.conj(chirp)
+    kernel[size - n + 1:] = np.conj(chirp[1:][::-1])
+    return size, _frozen(chirp), _frozen(fft(kernel))
+
+
+def _ifft_rows(a):
+    return np.conj(_fft_rows(np.conj(a))) / a.shape[-1]
+
+
+def _rader(a):
+    batch, p = a.shape
+    gather, scatter, kernel_hat = _rader_plan(p)
+    conv = _ifft_rows(_fft_rows(a[:, gather]) * kernel_hat)
+    out = np.empty((batch, p), dtype=complex)
+    out[:, 0] = a.sum(axis=1)
+    out[:, scatter] = a[:, :1] + conv
+    return out
+
+
+def _bluestein(a):
+    batch, n = a.shape
+    size, chirp, kernel_hat = _bluestein_plan(n)
+    padded = np.zeros((batch, size), dtype=complex)
+    padded[:, :n] = a * chirp
+    conv = _ifft_rows(_fft_rows(padded) * kernel_hat)
+    return conv[:, :n] * chirp
+
+
+def _fft_rows(a):
+    """FFT along the last axis of a 2D ``(batch, n)`` complex array."""
+    batch, n = a.shape
+    if n <= SMALL_DFT:
+        return a @ _dft_matrix(n).T
+    r = _radix(n)
+    if r == n:
+        return _rader(a) if prime_algorithm(n) == "rader" else _bluestein(a)
+    m = n // r
+    # Subsequence j is a[:, j::r]; transform all r * batch of them at once
+    sub = a.reshape(batch, m, r).transpose(0, 2, 1).reshape(batch * r, m)
+    y = _fft_rows(sub).reshape(batch, r, m) * _twiddles(r, m)
+    # X[q*m + k] = sum_j W_r^(j q) y[j, k]
+    if r <= SMALL_DFT:
+        z = _dft_matrix(r) @ y
+    else:
+        z = _fft_rows(y.transpose(0, 2, 1).reshape(batch * m, r))
+        z = z.reshape(batch, m, r).transpose(0, 2, 1)
+    return z.reshape(batch, n)
+
+
+def fft(x):
+    """Discrete Fourier transform of ``x`` along its last axis, any length."""
+    x = np.asarray(x, dtype=complex)
+    shape = x.shape
+    n = shape[-1]
+    if n == 0:
+        raise ValueError("cannot transform an empty axis")
+    return _fft_rows(x.reshape(-1, n)).reshape(shape)
+
+
+def ifft(X):
+    """Inverse of ``fft``."""
+    X = np.asarray(X, dtype=complex)
+    return np.conj(fft(np.conj(X))) / X.shape[-1]
+
+
+def explain(n):
+    """How ``fft`` computes length ``n``, one line per stage."""
+    lines = []
+    while True:
+        if n <= SMALL_DFT:
+            lines.append(f"N = {n}: direct DFT matrix ({n}×{n})")
+            return lines
+        r = _radix(n)
+        if r != n:
+            lines.append(f"N = {n:,}: mixed radix, {r} × {n // r:,}")
+            n //= r
+            continue
+        if prime_algorithm(n) == "rader":
+            lines.append(f"N = {n:,} (prime): Rader, cyclic convolution of length {n - 1:,} "
+                         f"= {' · '.join(map(str, factorize(n - 1)))}")
+        else:
+            size, _, _ = _bluestein_plan(n)
+            lines.append(f"N = {n:,} (prime): Bluestein, convolution padded to {size:,} "
+                         f"= {' · '.join(map(str, factorize(size)))}")
+        return lines
+
+
+def next_fast_len(n, radices=FAST_RADICES):
+    """Smallest length >= ``n`` whose prime factors are all in ``radices``."""
+    m = n
+    while max(factorize(m), default=1) > max(radices):
+        m += 1
+    return m
+
+
+def advise_padding(n, budget_s=0.1):
+    """Time ``fft`` and the active backend's at ``n`` and ``next_fast_len(n)``.
+
+    Returns a dict with both lengths, their factorizations and the median
+    times in ms; ``speedup`` is engine time at ``n`` over the padded one.
+    """
+    from fourier.backends import active_backend
+    from fourier.timing import measure
+
+    library = active_backend()
+    fast = next_fast_len(n)
+    x = np.random.default_rng(0).standard_normal(fast)
+    timings = {}
+    for label, length in (("direct", n), ("padded", fast)):
+        signal = x[:length]
+        timings[f"engine_{label}_ms"] = measure(fft, signal, budget_s=budget_s, max_total_s=2.0).median_ms
+        timings[f"library_{label}_ms"] = measure(library.fft, signal, budget_s=budget_s).median_ms
+    return {
+        "n": n,
+        "library": library.label,
+        "factors": factorize(n),
+        "fast_len": fast,
+        "fast_factors": factorize(fast),
+        **timings,
+        "speedup": timings["engine_direct_ms"] / timings["engine_padded_ms"],
+        "library_speedup": timings["library_direct_ms"] / timings["library_padded_ms"],
+    }
+
+
+def main(argv=None):
+    sizes = [int(a) for a in (argv if argv is not None else sys.argv[1:])] or [
+        1024, 1000, 1009, 1031, 4096, 4099, 10007, 65536, 65537, 100003]
+    for n in sizes:
+        x = np.random.default_rng(n).standard_normal(n)
+        reference = np.fft.fft(x)
+        error = np.abs(fft(x) - reference).max() / np.abs(reference).max()
+        advice = advise_padding(n)
+        print(f"N={n:<7} error={error:.1e}  engine={advice['engine_direct_ms']:.3f} ms  "
+              f"{advice['library']}={advice['library_direct_ms']:.3f} ms  "
+              f"next fast={advice['fast_len']} ({advice['engine_padded_ms']:.3f} ms, "
+              f"{advice['speedup']:.1f}x)  [{explain(n)[-1]}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
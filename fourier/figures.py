@@ -0,0 +1,132 @@
+"""Figure factory and lifecycle tracking.
+
+``plt.subplots`` registers every figure with pyplot's global figure manager,
+which keeps it alive until ``plt.close`` is called; in a long-running server
+that means figures pile up across reruns and sessions. ``new_figure``
+builds figures directly from ``matplotlib.figure.Figure`` with their own
+Agg canvas, so pyplot never sees them, and ``release_figure`` clears them
+once they are encoded.
+
+Because each figure owns its canvas and nothing goes through pyplot's
+global state, Streamlit's per-session script threads can build and
+rasterize figures in parallel without a lock; ``fourier.plot_stress``
+checks that concurrent output is byte-identical to serial output.
+``figure_stats`` reports how many figures are alive and roughly how much
+memory they hold, to check that usage stays flat over a long soak.
+
+Unless another projection is requested, axes are ``DecimatedAxes`` from
+``fourier.decimate``, which draw long lines at the resolution of the
+pixels they cover.
+
+matplotlib is imported lazily so the app shell can report stats without
+pulling in the plotting stack.
+"""
+
+import sys
+import threading
+import weakref
+
+_live = weakref.WeakSet()
+_lock = threading.Lock()
+_counters = {"created": 0, "released": 0, "peak_live": 0}
+
+_mathtext_lock = threading.Lock()
+_mathtext_guarded = False
+
+
+def _guard_mathtext():
+    """Serialize mathtext parsing, the one shared-state step in rendering.
+
+    All ``MathTextParser`` instances share a single pyparsing grammar, which
+    is not safe to run from two threads at once. matplotlib LRU-caches
+    parses in ``_parse_cached``; the lock goes around the uncached function
+    inside that cache, so only a label's first layout takes it and cache
+    hits stay unlocked. matplotlib versions without that cache get the lock
+    around ``parse`` instead, on every call.
+    """
+    global _mathtext_guarded
+    with _lock:
+        if _mathtext_guarded:
+            return
+        import functools
+
+        from matplotlib.mathtext import MathTextParser
+
+        cached = getattr(MathTextParser, "_parse_cached", None)
+        if cached is not None and hasattr(cached, "__wrapped__"):
+            uncached = cached.__wrapped__
+
+            def locked_parse_cached(self, *args):
+                with _mathtext_lock:
+                    return uncached(self, *args)
+
+            maxsize = cached.cache_info().maxsize
+            MathTextParser._parse_cached = functools.lru_cache(maxsize)(locked_parse_cached)
+        else:
+            parse = MathTextParser.parse
+
+            def locked_parse(self, *args, **kwargs):
+                with _mathtext_lock:
+                    return parse(self, *args, **kwargs)
+
+            MathTextParser.parse = locked_parse
+        _mathtext_guarded = True
+
+
+def new_figure(nrows=1, ncols=1, figsize=None, **subplots_kwargs):
+    """Return ``(fig, axes)`` like ``plt.subplots``, without pyplot."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from fourier.decimate import projection
+
+    _guard_mathtext()
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    subplot_kw = {"projection": projection(), **subplots_kwargs.pop("subplot_kw", {})}
+    axes = fig.subplots(nrows, ncols, subplot_kw=subplot_kw, **subplots_kwargs)
+    with _lock:
+        _live.add(fig)
+        _counters["created"] += 1
+        _counters["peak_live"] = max(_counters["peak_live"], len(_live))
+    return fig, axes
+
+
+def release_figure(fig):
+    """Drop a figure's artists and stop tracking it."""
+    fig.clear()
+    with _lock:
+        if fig in _live:
+            _live.discard(fig)
+            _counters["released"] += 1
+
+
+def _figure_bytes(fig):
+    # An RGBA Agg buffer at the figure's own dpi dominates a figure's footprint
+    width, height = fig.get_size_inches()
+    return int(width * fig.dpi) * int(height * fig.dpi) * 4
+
+
+def _rss_bytes():
+    """Current resident set size, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import resource
+    return pages * resource.getpagesize()
+
+
+def figure_stats():
+    """Snapshot of figure counts and approximate memory use."""
+    with _lock:
+        live = list(_live)
+        stats = dict(_counters)
+    stats["live"] = len(live)
+    stats["live_bytes"] = sum(_figure_bytes(fig) for fig in live)
+    # Figures created through pyplot anywhere in the process (should stay 0)
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    stats["pyplot_open"] = len(pyplot.get_fignums()) if pyplot is not None else 0
+    stats["rss_bytes"] = _rss_bytes()
+    return stats
@@ -0,0 +1,92 @@
+"""Fragment-scoped demo sections with rerun accounting.
+
+By default any widget change reruns the whole page script, so moving one
+demo's slider recomputes and re-renders every other demo on the page.
+``demo_fragment`` runs a demo as a Streamlit fragment: its own widgets
+rerun only that function. Each session keeps per-section counters of
+full-page runs, fragment-only reruns and time spent, and estimates the
+work skipped by not rerunning a page's other sections.
+
+Streamlit added ``st.fragment`` in 1.37 (``st.experimental_fragment`` in
+1.33); on older versions sections simply run as part of the page.
+"""
+
+import functools
+import time
+
+import streamlit as st
+
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+_STATE_KEY = "_fourier_fragment_stats"
+
+
+def _section_stats():
+    return st.session_state.setdefault(_STATE_KEY, {})
+
+
+def _page_of(name):
+    return name.split(".", 1)[0]
+
+
+def demo_fragment(name):
+    """Run the decorated demo as an isolated fragment named ``name``.
+
+    Names are ``"<page>.<demo>"``; sections sharing a page prefix are the
+    ones a fragment rerun avoids re-executing. Pages are re-executed on a
+    full rerun, so decorating happens exactly once per full run, which is
+    what distinguishes a full run from a fragment-only rerun.
+    """
+    def decorator(func):
+        stats = _section_stats().setdefault(name, {
+            "full_runs": 0, "fragment_runs": 0, "total_ms": 0.0,
+            "pending_full": False, "skipped_runs": 0, "skipped_ms": 0.0})
+        stats["pending_full"] = True
+
+        @functools.wraps(func)
+        def run():
+            start = time.perf_counter()
+            try:
+                return func()
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                _record(name, elapsed)
+
+        return _fragment(run) if _fragment is not None else run
+    return decorator
+
+
+def _record(name, elapsed):
+    sections = _section_stats()
+    stats = sections[name]
+    stats["total_ms"] += elapsed
+    if stats["pending_full"]:
+        stats["pending_full"] = False
+        stats["full_runs"] += 1
+        return
+
+    stats["fragment_runs"] += 1
+    # Every other section of the page would have run in a full rerun
+    for other, other_stats in sections.items():
+        if other == name or _page_of(other) != _page_of(name):
+            continue
+        runs = other_stats["full_runs"] + other_stats["fragment_runs"]
+        other_stats["skipped_runs"] += 1
+        if runs:
+            other_stats["skipped_ms"] += other_stats["total_ms"] / runs
+
+
+def fragment_report():
+    """Per-section counters for this session."""
+    report = []
+    for name, s in sorted(_section_stats().items()):
+        runs = s["full_runs"] + s["fragment_runs"]
+        report.append({
+            "section": name,
+            "full_runs": s["full_runs"],
+            "fragment_runs": s["fragment_runs"],
+            "avg_ms": round(s["total_ms"] / runs, 3) if runs else 0.0,
+            "skipped_runs": s["skipped_runs"],
+            "skipped_ms": round(s["skipped_ms"], 3),
+        })
+    return report
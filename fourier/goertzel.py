@@ -0,0 +1,154 @@
+"""Goertzel evaluation of a few chosen frequencies without a full FFT.
+
+Several demos only look at a handful of known tones: the 10 and 30 Hz pair
+on page 04, the 50/200/500/1000 Hz components of the audio demo, or an AM
+carrier and its two sidebands. An FFT computes all N bins in O(N log N);
+the Goertzel algorithm computes one frequency ω in O(N) with the real
+second-order recurrence
+
+    s[n] = x[n] + 2 cos(ω) s[n-1] - s[n-2]
+    X(ω) = exp(-iω(N-1)) (s[N-1] - exp(-iω) s[N-2])
+
+so K frequencies cost O(K N), which wins while K is below about log2 N
+times the FFT's constant factor. ω need not be a bin frequency, so the
+result is the exact DTFT at any frequency (on-bin values equal the FFT's).
+
+``goertzel`` runs the recurrence as an IIR filter (``scipy.signal.lfilter``,
+C speed), along the last axis of a whole batch of signals at once. It
+restarts every ``BLOCK`` samples and adds the blocks' results with a phase
+shift, which keeps memory bounded and stops the recurrence's rounding
+error, worst near 0 Hz and Nyquist, from growing with N.
+``evaluate`` picks Goertzel or an FFT from the cost of each, measured once
+per process and backend: the FFT is only a choice when every frequency
+falls on a bin of the N-point grid.
+
+Run ``python -m fourier.goertzel`` for both timings across K and N.
+"""
+
+import functools
+import math
+import sys
+
+import numpy as np
+
+from fourier.backends import active_backend
+
+METHODS = ("auto", "goertzel", "fft")
+# Samples per recurrence: bounds the temporary output per frequency and the
+# rounding error, which grows with the length of one recurrence
+BLOCK = 1 << 13
+# Length the cost model is calibrated at
+CALIBRATION_N = 1 << 14
+
+
+def goertzel(x, freqs, fs=1.0):
+    """DTFT of ``x`` at each of ``freqs`` Hz: shape ``x.shape[:-1] + (K,)``."""
+    from scipy.signal import lfilter
+
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    omegas = 2 * np.pi * np.asarray(freqs, dtype=float).ravel() / fs
+    out = np.zeros(x.shape[:-1] + (len(omegas),), dtype=complex)
+    for i, w in enumerate(omegas):
+        a = [1.0, -2 * math.cos(w), 1.0]
+        for start in range(0, n, BLOCK):
+            s = lfilter([1.0], a, x[..., start:start + BLOCK], axis=-1)
+            length = s.shape[-1]
+            before = s[..., -2] if length > 1 else 0.0
+            # Each block's DTFT, shifted to where the block starts
+            tail = s[..., -1] - np.exp(-1j * w) * before
+            out[..., i] += np.exp(-1j * w * (start + length - 1)) * tail
+    return out
+
+
+def on_grid(freqs, n, fs=1.0, tol=1e-9):
+    """Whether every frequency is a bin of the ``n``-point one-sided DFT."""
+    k = np.asarray(freqs, dtype=float) * n / fs
+    return bool(np.all((np.abs(k - np.round(k)) <= tol) & (k >= 0) & (k <= n // 2 + tol)))
+
+
+def fft_bins(x, freqs, fs=1.0):
+    """The ``rfft`` bins of ``x`` at ``freqs``, which must lie on the grid."""
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    if not on_grid(freqs, n, fs):
+        raise ValueError("fft_bins needs frequencies on the k * fs / N grid")
+    k = np.round(np.asarray(freqs, dtype=float).ravel() * n / fs).astype(np.intp)
+    return active_backend().rfft(x, axis=-1)[..., k]
+
+
+@functools.lru_cache(maxsize=None)
+def _costs(backend_name):
+    """Seconds per (sample x frequency) for Goertzel and per N log2 N for the FFT."""
+    from fourier.timing import measure
+
+    x = np.random.default_rng(0).standard_normal(CALIBRATION_N)
+    n = CALIBRATION_N
+    per_goertzel = measure(goertzel, x, [0.1], budget_s=0.05).median_s / n
+    per_fft = measure(active_backend().rfft, x, budget_s=0.05).median_s / (n * math.log2(n))
+    return per_goertzel, per_fft
+
+
+def choose(k, n, on_bins=True):
+    """``"goertzel"`` or ``"fft"``: the cheaper way to get ``k`` of ``n`` bins."""
+    if not on_bins:
+        return "goertzel"
+    per_goertzel, per_fft = _costs(active_backend().name)
+    return "goertzel" if per_goertzel * k * n <= per_fft * n * math.log2(max(n, 2)) else "fft"
+
+
+def evaluate(x, freqs, fs=1.0, method="auto"):
+    """Spectrum of ``x`` at ``freqs``, by Goertzel or FFT (see ``choose``)."""
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}; choose from {', '.join(METHODS)}")
+    x = np.asarray(x, dtype=float)
+    freqs = np.asarray(freqs, dtype=float).ravel()
+    if method == "auto":
+        method = choose(len(freqs), x.shape[-1], on_grid(freqs, x.shape[-1], fs))
+    if method == "fft":
+        return fft_bins(x, freqs, fs)
+    return goertzel(x, freqs, fs)
+
+
+def benchmark(sizes=(1 << 10, 1 << 14, 1 << 18), counts=(1, 3, 8, 32), batch=1, budget_s=0.1):
+    """Goertzel vs FFT time for ``counts`` bins of ``sizes``-sample signals.
+
+    Returns one row per (N, K) with both median times in ms, the method
+    ``choose`` picks and the largest difference relative to the largest bin.
+    """
+    from fourier.timing import measure
+
+    rows = []
+    for n in sizes:
+        rng = np.random.default_rng(n)
+        x = rng.standard_normal((batch, n)) if batch > 1 else rng.standard_normal(n)
+        for k in counts:
+            freqs = rng.choice(np.arange(1, n // 2), size=k, replace=False) / n
+            direct = goertzel(x, freqs)
+            reference = fft_bins(x, freqs)
+            g = measure(goertzel, x, freqs, budget_s=budget_s, max_total_s=2.0)
+            f = measure(fft_bins, x, freqs, budget_s=budget_s, max_total_s=2.0)
+            rows.append({"n": n, "k": k, "batch": batch, "goertzel_ms": g.median_ms,
+                         "fft_ms": f.median_ms, "choice": choose(k, n),
+                         "faster": "goertzel" if g.median_s < f.median_s else "fft",
+                         "max_rel_error": float(np.abs(direct - reference).max()
+                                                / np.abs(reference).max())})
+    return rows
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=1, help="signals per call")
+    args = parser.parse_args(argv)
+
+    for row in benchmark(batch=args.batch):
+        print(f"N={row['n']:<7} K={row['k']:<3} batch={row['batch']:<4} "
+              f"goertzel={row['goertzel_ms']:9.3f} ms  fft={row['fft_ms']:9.3f} ms  "
+              f"auto={row['choice']:<8} faster={row['faster']:<8} error={row['max_rel_error']:.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
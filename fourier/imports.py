@@ -0,0 +1,100 @@
+"""Lazy, per-page loading of heavy libraries with an import-time profile.
+
+Pages declare which heavy modules they need (numpy, matplotlib, ...) and
+``ImportProfiler.require`` imports them just before the page runs, so
+text-only pages never pay for the scientific stack. Every import is timed
+and attributed to the page that triggered it, which gives a per-page view
+similar to ``python -X importtime``. ``warm_up`` imports the same modules on
+a background thread at cold start so the first plotting page is usually
+served from ``sys.modules``.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# Modules worth warming up in the background; in rough dependency order
+HEAVY_MODULES = ("numpy", "matplotlib", "matplotlib.figure", "scipy.signal")
+
+WARM_UP = "(background warm-up)"
+
+
+class ImportRecord:
+    """One timed import of ``module`` on behalf of ``page``."""
+
+    def __init__(self, page, module, ms, new_modules, cold):
+        self.page = page
+        self.module = module
+        self.ms = ms
+        self.new_modules = new_modules
+        self.cold = cold
+
+    def as_dict(self):
+        return {
+            "page": self.page,
+            "module": self.module,
+            "ms": round(self.ms, 3),
+            "new_modules": self.new_modules,
+            "cold": self.cold,
+        }
+
+
+class ImportProfiler:
+    """Imports modules on demand and records where the time went."""
+
+    def __init__(self):
+        self._records = []
+        self._seen = set()  # (page, module) pairs already recorded
+        self._lock = threading.Lock()
+        self._warm_thread = None
+
+    def require(self, page, modules):
+        """Import ``modules`` for ``page`` and return them in order.
+
+        Only the first request of a module by each page is recorded; repeat
+        reruns of the same page hit ``sys.modules`` and are not interesting.
+        """
+        loaded = []
+        for name in modules:
+            cold = name not in sys.modules
+            before = len(sys.modules)
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            elapsed = (time.perf_counter() - start) * 1000
+            loaded.append(module)
+
+            key = (page, name)
+            with self._lock:
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                self._records.append(ImportRecord(
+                    page, name, elapsed, max(len(sys.modules) - before, 0), cold))
+        return loaded
+
+    def warm_up(self, modules=HEAVY_MODULES):
+        """Import ``modules`` on a daemon thread; safe to call repeatedly."""
+        with self._lock:
+            if self._warm_thread is not None:
+                return self._warm_thread
+            self._warm_thread = threading.Thread(
+                target=self.require, args=(WARM_UP, modules),
+                name="fourier-import-warm-up", daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def report(self):
+        """Return all import records as dicts, slowest first within a page."""
+        with self._lock:
+            records = list(self._records)
+        records.sort(key=lambda r: (r.page, -r.ms))
+        return [r.as_dict() for r in records]
+
+    def page_totals(self):
+        """Return ``{page: total import ms}`` for first-paint accounting."""
+        totals = {}
+        with self._lock:
+            for r in self._records:
+                totals[r.page] = totals.get(r.page, 0.0) + r.ms
+        return {page: round(ms, 3) for page, ms in sorted(totals.items())}
@@ -0,0 +1,129 @@
+"""Batched widget input for multi-parameter demos.
+
+Every slider change reruns the demo, so dragging through a range of values
+computes and renders every intermediate setting. ``InputBatch`` offers two
+optional ways to collapse a burst of changes into one computation:
+
+* ``Debounce``: compute only once ``debounce_s`` has passed since the last
+  change. A run that sees a change records its time, waits out the window
+  and asks for a rerun of its fragment; that rerun computes if nothing
+  changed in between, or starts a new window if something did.
+* ``Apply``: the widgets live in an ``st.form`` and nothing reruns until
+  the Apply button is pressed.
+
+Debounce does not count on a newer change interrupting the waiting run:
+Streamlit queues widget-triggered fragment reruns until the running one
+finishes, merging the queued changes into one rerun with the latest
+values. That merging is what collapses a drag, so the wait blocks the
+fragment's script thread rather than returning early. Outside a fragment
+rerun (the page's full runs, or Streamlit before 1.37) a fragment cannot
+be rerun on its own, so debounce computes at once there.
+
+``Live`` keeps the default behaviour. Each session counts, per demo and
+mode, the widget changes, the reruns (debounce's own included) and the
+computations that actually run, and reports reruns and computations per
+change. A change is one parameter that differs from the previous run, so
+moving three sliders and pressing Apply counts three changes for one
+rerun. Changes merged into one rerun count once per parameter, and
+widgets in a form cannot have callbacks, so edits undone before a rerun
+or before Apply are not seen.
+"""
+
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+LIVE = "Live"
+DEBOUNCE = "Debounce"
+APPLY = "Apply"
+BATCH_MODES = (LIVE, DEBOUNCE, APPLY)
+
+DEFAULT_DEBOUNCE_S = 0.4
+
+_STATE_KEY = "_fourier_input_stats"
+
+
+def batch_mode_selector(name):
+    """Radio for picking how ``name``'s widgets are batched."""
+    return st.radio("Input mode", BATCH_MODES, horizontal=True, key=f"{name}.input_mode",
+                    help="Debounce waits for the sliders to settle; Apply waits for the button.")
+
+
+class InputBatch:
+    """Context manager around a demo's widgets; see the module docstring."""
+
+    def __init__(self, name, mode=LIVE, debounce_s=DEFAULT_DEBOUNCE_S):
+        self.name = name
+        self.mode = mode
+        self.debounce_s = debounce_s
+        self._form = None
+
+    def __enter__(self):
+        if self.mode == APPLY:
+            self._form = st.form(key=f"{self.name}.form")
+            self._form.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._form is not None:
+            st.form_submit_button("Apply")
+            self._form.__exit__(*exc_info)
+        return False
+
+    def settle(self, params):
+        """Return once ``params`` should be computed, counting the rerun.
+
+        In debounce mode, a fragment rerun within ``debounce_s`` of the
+        last change sleeps out the rest of the window and reruns the
+        fragment instead of returning (``st.rerun`` raises).
+        """
+        stats = _stats(self.name, self.mode)
+        stats["reruns"] += 1
+        seen_key = f"{self.name}.seen_params"
+        changed_key = f"{self.name}.changed_at"
+        seen = st.session_state.get(seen_key)
+        if seen is not None and seen != params:
+            stats["changes"] += sum(old != new for old, new in zip(seen, params))
+            st.session_state[changed_key] = time.monotonic()
+        st.session_state[seen_key] = params
+
+        if self.mode == DEBOUNCE and _in_fragment_rerun():
+            quiet = time.monotonic() - st.session_state.get(changed_key, 0.0)
+            if quiet < self.debounce_s:
+                # Changes made meanwhile queue up and are merged into this rerun
+                time.sleep(self.debounce_s - quiet)
+                st.rerun(scope="fragment")
+        stats["computations"] += 1
+        return params
+
+
+def _in_fragment_rerun():
+    """Whether this is a rerun of fragments only, where ``st.rerun(scope="fragment")`` works."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return bool(ctx is not None and getattr(ctx, "fragment_ids_this_run", None))
+
+
+def _stats(name, mode):
+    demos = st.session_state.setdefault(_STATE_KEY, {})
+    return demos.setdefault((name, mode), {"changes": 0, "reruns": 0, "computations": 0})
+
+
+def _per(count, changes):
+    return round(count / changes, 2) if changes else 0.0
+
+
+def input_report():
+    """Changes, reruns and computations per demo and batching mode for this session."""
+    report = []
+    for (name, mode), s in sorted(st.session_state.get(_STATE_KEY, {}).items()):
+        report.append({
+            "demo": name,
+            "mode": mode,
+            "changes": s["changes"],
+            "reruns": s["reruns"],
+            "computations": s["computations"],
+            "reruns_per_change": _per(s["reruns"], s["changes"]),
+            "computations_per_change": _per(s["computations"], s["changes"]),
+        })
+    return report
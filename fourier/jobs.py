@@ -0,0 +1,204 @@
+"""Background jobs with progress, cancellation and a time budget.
+
+Long benchmarks (the direct DFTs at large N) used to run inside the
+session's script thread, freezing that session's UI and tying up a server
+thread. ``JobPool`` runs them on a small, bounded pool of worker threads
+instead. Work functions receive their ``Job`` and call ``job.report`` to
+publish progress; ``report`` also raises ``JobCancelled`` once the job has
+been cancelled or has exceeded its time budget, so cancellation takes
+effect at the next progress point.
+
+Each session tracks its jobs by slot in ``st.session_state``: submitting a
+new job for a slot cancels the previous one, and jobs started by a page
+are cancelled when the session navigates to another page.
+"""
+
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed out"
+FAILED = "failed"
+FINISHED = (DONE, CANCELLED, TIMED_OUT, FAILED)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 8
+DEFAULT_BUDGET_S = 30.0
+
+_STATE_KEY = "_fourier_jobs"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function to stop it."""
+
+
+class PoolBusy(RuntimeError):
+    """The pool already has its maximum number of pending jobs."""
+
+
+class Job:
+    """State of one background job, shared between worker and session."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, key, page, budget_s):
+        self.id = next(self._ids)
+        self.key = key
+        self.page = page
+        self.budget_s = budget_s
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.partial = []
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def elapsed_s(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def report(self, progress=None, message=None):
+        """Publish progress; raises ``JobCancelled`` if the job must stop."""
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        if self._cancel.is_set():
+            raise JobCancelled("cancelled")
+        if self.budget_s is not None and self.elapsed_s > self.budget_s:
+            raise JobCancelled("time budget exceeded")
+
+
+class JobPool:
+    """A bounded pool of worker threads for ``Job``s."""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="fourier-job")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, work, key=None, page=None, budget_s=DEFAULT_BUDGET_S):
+        """Queue ``work(job)`` and return its ``Job``; raises ``PoolBusy``."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolBusy(f"{self._pending} jobs already pending")
+            self._pending += 1
+        job = Job(key, page, budget_s)
+        self._executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job, work):
+        try:
+            if job.cancelled:
+                job.status = CANCELLED
+                return
+            job.started = time.monotonic()
+            job.status = RUNNING
+            job.result = work(job)
+            job.progress = 1.0
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED if job.cancelled else TIMED_OUT
+        except Exception as exc:  # surfaced on the page, not in the worker
+            job.error = exc
+            job.status = FAILED
+        finally:
+            job.finished = time.monotonic()
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.max_workers, "pending": self._pending,
+                    "max_pending": self.max_pending}
+
+
+job_pool = JobPool(int(os.environ.get("FOURIER_JOB_WORKERS", DEFAULT_WORKERS)))
+
+
+def _session_jobs():
+    return st.session_state.setdefault(_STATE_KEY, {})
+
+
+def session_job(slot, key, page, work, budget_s=DEFAULT_BUDGET_S):
+    """Return this session's job for ``slot``, (re)submitting it if needed.
+
+    A job whose ``key`` differs from the requested one is cancelled and
+    replaced; a job with the same key is returned as is, even if it was
+    cancelled by the user. Returns ``None`` if the pool is busy.
+    """
+    jobs = _session_jobs()
+    job = jobs.get(slot)
+    if job is not None and job.key == key:
+        return job
+    if job is not None:
+        job.cancel()
+    try:
+        job = job_pool.submit(work, key=key, page=page, budget_s=budget_s)
+    except PoolBusy:
+        jobs.pop(slot, None)
+        return None
+    jobs[slot] = job
+    return job
+
+
+def cancel_jobs_except(page):
+    """Cancel and forget this session's jobs that belong to other pages.
+
+    Forgetting them means returning to the page starts a fresh job.
+    """
+    jobs = _session_jobs()
+    for slot, job in list(jobs.items()):
+        if job.page != page:
+            job.cancel()
+            del jobs[slot]
+
+
+def show_job(job, render, interval_s=0.5):
+    """Draw ``render(job)`` and keep redrawing it until the job finishes.
+
+    While the job runs, the view is an ``st.fragment`` polling every
+    ``interval_s``; when the job finishes it triggers one full rerun so the
+    page is redrawn without the poller. On Streamlit versions without
+    fragments the view is drawn once per rerun.
+    """
+    fragment = getattr(st, "fragment", None)
+    if job.done or fragment is None:
+        render(job)
+        return
+
+    @fragment(run_every=interval_s)
+    def poll():
+        if job.done:
+            st.rerun()
+        render(job)
+
+    poll()
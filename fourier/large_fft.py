@@ -0,0 +1,242 @@
+"""Large-N FFT mode: multithreaded four-step transforms up to 2^26 samples.
+
+A single 1D transform runs on one core in pocketfft, and ``scipy.fft``'s
+``workers=`` only parallelizes over batches. ``four_step_fft`` turns one
+length-N transform into batches: with N = N1 * N2 the signal is viewed as an
+N2 x N1 matrix, and
+
+1. N1 column FFTs of length N2 run as one batched ``scipy.fft`` call;
+2. each element is multiplied by the twiddle factor exp(-2πi j1 k2 / N);
+3. N2 row FFTs of length N1 run as a second batched call;
+4. the transpose of the result is the spectrum in natural order.
+
+Steps 1 and 3 use ``workers`` threads; step 2 is split into row blocks
+spread over the same number of threads (NumPy releases the GIL). The
+twiddles of a row block are the product of two small cached tables (about
+2·sqrt(N) rows of N1 entries in total), so no N-sized table is kept and no
+cos/sin runs per element. Transforms run in place in ``complex64`` for
+``float32`` input and ``complex128`` otherwise.
+
+The extra passes over memory only pay off for large transforms on several
+cores; ``MIN_LOG2_N`` is the smallest size the app offers. SciPy is
+imported on the first transform, not with the module.
+
+Memory is bounded in two ways: ``estimate_bytes`` must fit under
+``FOURIER_LARGE_FFT_MB`` (default 2048) before a run starts, and only one
+large transform runs at a time per process.
+"""
+
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+MAX_LOG2_N = 26
+# Below about 2^20 samples one pocketfft call beats the extra passes and
+# thread start-up of the four-step path (2^18 on 2 workers: 0.57x)
+MIN_LOG2_N = 20
+DEFAULT_BUDGET_MB = 2048
+
+_one_at_a_time = threading.Lock()
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """A large transform would not fit the configured memory budget."""
+
+
+def memory_budget():
+    return int(float(os.environ.get("FOURIER_LARGE_FFT_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+
+
+def complex_dtype(dtype):
+    return np.complex64 if np.dtype(dtype) == np.float32 else np.complex128
+
+
+def estimate_bytes(n, dtype=np.float64):
+    """Peak bytes of a ``run`` at size ``n``: input, work array, output.
+
+    The twiddle tables are small next to these and are included loosely.
+    """
+    real = np.dtype(dtype).itemsize
+    cplx = np.dtype(complex_dtype(dtype)).itemsize
+    n1, n2 = split(n)
+    tables = 4 * math.isqrt(n2) * n1 * (cplx + 16)
+    return n * real + 2 * n * cplx + tables
+
+
+def split(n):
+    """Factor a power of two ``n`` as ``(n1, n2)`` with n1 * n2 == n, n1 <= n2."""
+    if n & (n - 1):
+        raise ValueError(f"four-step FFT needs a power-of-two size, got {n}")
+    n1 = 1 << (n.bit_length() - 1) // 2
+    return n1, n // n1
+
+
+@functools.lru_cache(maxsize=4)
+def _twiddle_tables(n, n1, n2, dtype):
+    """Factors of exp(-2πi j1 k2 / n) split as k2 = hi * block + lo.
+
+    ``low[lo, j1]`` and ``high[hi, j1]`` multiply to the twiddle of row
+    ``k2``, so step 2 needs two small tables instead of cos/sin per element.
+    """
+    block = 1 << (n2.bit_length() - 1) // 2
+    j1 = np.arange(n1, dtype=np.int64)
+
+    def table(rows):
+        angle = (rows[:, None] * j1) % n * (-2 * np.pi / n)
+        out = np.empty(angle.shape, dtype=dtype)
+        out.real = np.cos(angle)
+        out.imag = np.sin(angle)
+        out.setflags(write=False)
+        return out
+
+    low = table(np.arange(block, dtype=np.int64))
+    high = table(np.arange(0, n2, block, dtype=np.int64))
+    return block, low, high
+
+
+def _twiddle_block(work, hi, tables):
+    # work[k2, j1] *= exp(-2πi j1 k2 / n) for the rows k2 = hi * block + lo
+    block, low, high = tables
+    rows = work[hi * block:(hi + 1) * block]
+    rows *= low
+    rows *= high[hi]
+
+
+def four_step_fft(x, workers=None):
+    """FFT of a power-of-two length signal using batched, threaded passes.
+
+    Returns a new array of ``complex64`` (``float32``/``complex64`` input)
+    or ``complex128``; ``x`` is not modified.
+    """
+    import scipy.fft
+
+    x = np.asarray(x)
+    n = x.shape[0]
+    workers = workers or os.cpu_count() or 1
+    n1, n2 = split(n)
+    cdtype = complex_dtype(np.float32 if x.dtype in (np.float32, np.complex64) else np.float64)
+
+    # A[j2, j1] = x[j1 + n1 * j2]
+    work = x.astype(cdtype).reshape(n2, n1)
+    work = scipy.fft.fft(work, axis=0, overwrite_x=True, workers=workers)
+
+    tables = _twiddle_tables(n, n1, n2, np.dtype(cdtype))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda hi: _twiddle_block(work, hi, tables), range(len(tables[2]))))
+
+    work = scipy.fft.fft(work, axis=1, overwrite_x=True, workers=workers)
+    # X[k2 + n2 * k1] = C[k2, k1]
+    return np.ascontiguousarray(work.T).reshape(n)
+
+
+def _check_bins(x, X, bins, chunk=1 << 20):
+    """Largest relative error of ``X`` at ``bins`` against direct float64 sums."""
+    n = len(x)
+    scale = np.sqrt(n) * max(float(np.abs(x).max()), 1e-30)
+    worst = 0.0
+    for k in bins:
+        total = 0j
+        for start in range(0, n, chunk):
+            idx = np.arange(start, min(start + chunk, n), dtype=np.int64)
+            phase = (idx * k) % n * (-2 * np.pi / n)
+            total += np.dot(x[start:start + len(idx)].astype(np.float64), np.exp(1j * phase))
+        worst = max(worst, abs(complex(X[k]) - total) / scale)
+    return worst
+
+
+def run(n, dtype=np.float64, workers=None, compare=True, progress=None):
+    """Time a large real-signal transform and return its statistics.
+
+    Raises ``MemoryBudgetExceeded`` if ``estimate_bytes`` is over budget.
+    ``progress(fraction, message)`` is called between stages and may raise
+    to stop the run. With ``compare`` the single-call ``scipy.fft.fft`` is
+    timed too, for the speedup from threading.
+    """
+    import scipy.fft
+
+    from fourier.timing import measure
+
+    if n > 1 << MAX_LOG2_N:
+        raise ValueError(f"large-N mode stops at 2^{MAX_LOG2_N} samples")
+    workers = workers or os.cpu_count() or 1
+    needed = estimate_bytes(n, dtype)
+    if needed > memory_budget():
+        raise MemoryBudgetExceeded(
+            f"N = {n:,} needs about {needed / 2**20:,.0f} MB, over the "
+            f"{memory_budget() / 2**20:,.0f} MB budget (FOURIER_LARGE_FFT_MB)")
+
+    def report(fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    report(0.0, "Waiting for other large transforms to finish...")
+    while not _one_at_a_time.acquire(timeout=0.5):
+        report(0.0, "Waiting for other large transforms to finish...")
+    try:
+        report(0.05, "Generating the test signal")
+        x = np.random.default_rng(0).standard_normal(n, dtype=dtype)
+
+        report(0.1, f"Four-step FFT on {workers} thread(s)")
+        timing = measure(four_step_fft, x, workers, budget_s=1.0, min_samples=3, max_total_s=6.0)
+
+        report(0.6, "Checking bins against direct sums")
+        X = four_step_fft(x, workers)
+        bins = np.random.default_rng(1).integers(0, n, 8)
+        error = _check_bins(x, X, bins)
+        del X
+
+        single = None
+        if compare:
+            report(0.75, "Single-call FFT on one thread")
+            single = measure(scipy.fft.fft, x, budget_s=1.0, min_samples=3, max_total_s=6.0)
+    finally:
+        _one_at_a_time.release()
+
+    flops = 5 * n * math.log2(n)
+    result = {
+        "n": n,
+        "dtype": np.dtype(dtype).name,
+        "workers": workers,
+        "median_ms": timing.median_ms,
+        "iqr_ms": timing.iqr_ms,
+        "samples": len(timing.samples_ns),
+        "msamples_s": n / timing.median_s / 1e6,
+        "gflops": flops / timing.median_s / 1e9,
+        "max_rel_error": error,
+        "estimated_mb": needed / 2**20,
+    }
+    if single is not None:
+        result["single_ms"] = single.median_ms
+        result["speedup"] = single.median_s / timing.median_s
+    return result
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log2-n", type=int, default=24)
+    parser.add_argument("--float32", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    def progress(fraction, message):
+        print(f"[{fraction:4.0%}] {message}", file=sys.stderr)
+
+    start = time.perf_counter()
+    result = run(1 << args.log2_n, np.float32 if args.float32 else np.float64,
+                 args.workers, progress=progress)
+    for key, value in result.items():
+        print(f"{key}: {value:.6g}" if isinstance(value, float) else f"{key}: {value}")
+    print(f"wall: {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
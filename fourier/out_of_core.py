@@ -0,0 +1,308 @@
+"""Out-of-core FFT of signals stored on disk, larger than RAM.
+
+Bailey's six-step FFT splits one transform of N = N1 * N2 points into
+batches of short transforms and transposes, so it can stream
+``numpy.memmap`` files through a fixed amount of memory. With the signal
+read as an N2 x N1 row-major matrix A[j2, j1] = x[j1 + N1 * j2], five
+passes go from ``src`` to ``dst`` through one scratch file:
+
+1. transpose A into ``dst`` (N1 x N2), converting to complex and
+   multiplying by the ``taper``, if any;
+2. FFT each row of ``dst`` (length N2) and multiply by the twiddles
+   exp(-2πi j1 k2 / N), in place;
+3. transpose ``dst`` into the scratch file (N2 x N1);
+4. FFT each row of the scratch file (length N1), in place;
+5. transpose the scratch file into ``dst``, which then holds
+   X[k2 + N2 * k1] at k1 * N2 + k2, i.e. the spectrum in natural order.
+
+The FFT passes read and write blocks of whole rows, which are contiguous
+in the file. The transposes move square-ish tiles: a tile is read as
+rows of at least a few thousand contiguous elements and written as
+equally long runs, so every pass reads and writes each element once,
+in long sequential runs, and no block touches the rest of the file.
+
+Block and tile sizes come from ``ram_bytes`` (``FOURIER_OOC_RAM_MB``,
+default 256 MB) and the temporaries each pass allocates (see
+``_fft_bytes`` and ``_transpose_bytes``). That budget covers the arrays
+the process allocates; the file pages a block touches are page cache,
+mapped only while that block is read or written, and the kernel can
+drop them under memory pressure (they still show up in the process's
+RSS while mapped). N must factor as N1 * N2 with both factors well above
+1; prime lengths should be zero-padded first (see
+``fourier.fft_engine.next_fast_len``).
+
+The output is the full N-point complex spectrum;
+``fourier.spectrum.file_spectrum`` windows the samples and returns the
+one-sided half, like the other spectra there. Run
+``python -m fourier.out_of_core`` to check both against the in-memory
+FFT, or ``--size-mb`` to time a file of that size.
+"""
+
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DEFAULT_RAM_MB = 256
+
+
+def ram_budget():
+    return int(float(os.environ.get("FOURIER_OOC_RAM_MB", DEFAULT_RAM_MB)) * 1024 * 1024)
+
+
+def split(n):
+    """Factor ``n`` as ``(n1, n2)``, n1 <= n2, with n1 as close to sqrt(n) as possible."""
+    for n1 in range(math.isqrt(n), 0, -1):
+        if n % n1 == 0:
+            break
+    if n1 == 1 and n > 3:
+        raise ValueError(f"N = {n} is prime; zero-pad it to a composite length first")
+    return n1, n // n1
+
+
+def _complex_dtype(dtype):
+    dtype = np.dtype(dtype)
+    return np.dtype(np.complex64) if dtype in (np.float32, np.complex64) else np.dtype(np.complex128)
+
+
+def _twiddles(j1, k2, n, dtype):
+    # exp(-2πi j1 k2 / n) with the phase reduced exactly in integers
+    angle = (j1[:, None] * k2[None, :]) % n * (-2 * np.pi / n)
+    out = np.empty(angle.shape, dtype=dtype)
+    out.real = np.cos(angle)
+    out.imag = np.sin(angle)
+    return out
+
+
+def _fft_bytes(cdtype):
+    """Peak bytes per element of an FFT-pass block.
+
+    The block read from the file, the transform's output and the twiddle
+    table (complex each), plus the two 8-byte temporaries (int64 product
+    and its remainder, then the float64 angle and its cosine or sine)
+    alive while the table is built.
+    """
+    return 3 * cdtype.itemsize + 2 * 8
+
+
+def _transpose_bytes(src_dtype, cdtype, taper=False):
+    """Peak bytes per element of a transpose tile: the tile as read, and as complex.
+
+    A taper adds the int64 sample indices and three float64 arrays while
+    its values are computed (phase or ratio, one term, and the sum).
+    """
+    tile = src_dtype.itemsize + (cdtype.itemsize if src_dtype != cdtype else 0)
+    return tile + (4 * 8 if taper else 0)
+
+
+def _tile(rows, cols, per_element, ram_bytes):
+    """Tile shape over a ``rows`` x ``cols`` matrix, as square as the budget allows."""
+    side = max(1, math.isqrt(ram_bytes // per_element))
+    tile_rows = min(rows, side)
+    tile_cols = min(cols, max(1, ram_bytes // (per_element * tile_rows)))
+    return tile_rows, tile_cols
+
+
+def _transpose(src, src_dtype, dst, cdtype, rows, cols, ram_bytes, step, taper=None):
+    """Write the transpose of the ``rows`` x ``cols`` matrix in ``src`` to ``dst``.
+
+    With ``taper`` element (r, c) is multiplied by ``taper(r * cols + c)``.
+    """
+    per_element = _transpose_bytes(src_dtype, cdtype, taper is not None)
+    tile_rows, tile_cols = _tile(rows, cols, per_element, ram_bytes)
+    for r0 in range(0, rows, tile_rows):
+        r1 = min(r0 + tile_rows, rows)
+        for c0 in range(0, cols, tile_cols):
+            c1 = min(c0 + tile_cols, cols)
+            step(f"rows {r0:,}-{r1:,}, columns {c0:,}-{c1:,}")
+            a = np.memmap(src, dtype=src_dtype, mode="r", shape=(rows, cols))
+            tile = np.asarray(np.array(a[r0:r1, c0:c1]), dtype=cdtype)
+            del a
+            if taper is not None:
+                tile *= taper(np.arange(r0, r1)[:, None] * cols + np.arange(c0, c1)[None, :])
+            b = np.memmap(dst, dtype=cdtype, mode="r+", shape=(cols, rows))
+            # Runs of r1 - r0 contiguous elements, one per column of the tile
+            b[c0:c1, r0:r1] = tile.T
+            b.flush()
+            del b
+
+
+def _row_ffts(path, cdtype, rows, cols, ram_bytes, workers, step, twiddle_n=None):
+    """FFT each row of the ``rows`` x ``cols`` matrix in ``path``, in place.
+
+    With ``twiddle_n`` row j is also multiplied by exp(-2πi j k / twiddle_n).
+    """
+    import scipy.fft
+
+    block = max(1, min(rows, ram_bytes // (_fft_bytes(cdtype) * cols)))
+    k = np.arange(cols, dtype=np.int64)
+    for r0 in range(0, rows, block):
+        r1 = min(r0 + block, rows)
+        step(f"rows {r0:,}-{r1:,} of {rows:,}")
+        m = np.memmap(path, dtype=cdtype, mode="r", shape=(rows, cols))
+        data = scipy.fft.fft(np.array(m[r0:r1]), axis=1, overwrite_x=True, workers=workers)
+        del m
+        if twiddle_n is not None:
+            data *= _twiddles(np.arange(r0, r1, dtype=np.int64), k, twiddle_n, cdtype)
+        m = np.memmap(path, dtype=cdtype, mode="r+", shape=(rows, cols))
+        m[r0:r1] = data
+        m.flush()
+        del m
+
+
+def _passes(rows, cols, per_element, ram_bytes):
+    tile_rows, tile_cols = _tile(rows, cols, per_element, ram_bytes)
+    return math.ceil(rows / tile_rows) * math.ceil(cols / tile_cols)
+
+
+def fft_file(src, dst, dtype=np.float64, n=None, ram_bytes=None, workers=None,
+             scratch_dir=None, taper=None, progress=None):
+    """FFT of the raw ``dtype`` samples in file ``src``, written to ``dst``.
+
+    ``dst`` receives N complex values (``complex64`` for ``float32`` or
+    ``complex64`` input, ``complex128`` otherwise) and is returned as a
+    read-only ``np.memmap``. ``n`` defaults to the whole file. A scratch
+    file of the same size is created in ``scratch_dir`` (default: next to
+    ``dst``) and removed afterwards. ``taper(indices)``, if given, returns
+    the factors for the samples at ``indices`` (an integer array of any
+    shape), such as a window from ``fourier.windows.window_values``; the
+    samples are multiplied by them on the first pass. ``progress(fraction,
+    message)`` is called once per block or tile and may raise to stop the
+    run.
+    """
+    dtype = np.dtype(dtype)
+    cdtype = _complex_dtype(dtype)
+    if n is None:
+        n = os.path.getsize(src) // dtype.itemsize
+    n1, n2 = split(n)
+    ram_bytes = ram_bytes or ram_budget()
+    workers = workers or os.cpu_count() or 1
+
+    longest = max(n1, n2) * _fft_bytes(cdtype)
+    if longest > ram_bytes:
+        raise ValueError(f"a {max(n1, n2):,}-point row needs {longest / 2**20:.1f} MB, "
+                         f"over the {ram_bytes / 2**20:.1f} MB budget")
+
+    fft_blocks = [math.ceil(rows / max(1, ram_bytes // (_fft_bytes(cdtype) * cols)))
+                  for rows, cols in ((n1, n2), (n2, n1))]
+    steps = (_passes(n2, n1, _transpose_bytes(dtype, cdtype, taper is not None), ram_bytes)
+             + 2 * _passes(n1, n2, _transpose_bytes(cdtype, cdtype), ram_bytes)
+             + sum(fft_blocks))
+    done = 0
+
+    def step_reporter(name):
+        def step(message):
+            nonlocal done
+            if progress is not None:
+                progress(done / steps, f"{name}: {message}")
+            done += 1
+        return step
+
+    scratch_fd, scratch_path = tempfile.mkstemp(
+        suffix=".fft-scratch", dir=scratch_dir or os.path.dirname(os.path.abspath(dst)))
+    os.close(scratch_fd)
+    # Files are mapped per block and unmapped right after, so pages touched
+    # by one block do not stay resident in this process
+    try:
+        np.memmap(dst, dtype=cdtype, mode="w+", shape=(n,)).flush()
+        np.memmap(scratch_path, dtype=cdtype, mode="w+", shape=(n,)).flush()
+        _transpose(src, dtype, dst, cdtype, n2, n1, ram_bytes, step_reporter("1/5 transpose"),
+                   taper=taper)
+        _row_ffts(dst, cdtype, n1, n2, ram_bytes, workers, step_reporter("2/5 FFTs and twiddles"),
+                  twiddle_n=n)
+        _transpose(dst, cdtype, scratch_path, cdtype, n1, n2, ram_bytes,
+                   step_reporter("3/5 transpose"))
+        _row_ffts(scratch_path, cdtype, n2, n1, ram_bytes, workers, step_reporter("4/5 FFTs"))
+        _transpose(scratch_path, cdtype, dst, cdtype, n2, n1, ram_bytes,
+                   step_reporter("5/5 transpose"))
+    finally:
+        os.remove(scratch_path)
+    if progress is not None:
+        progress(1.0, "Done")
+    return np.memmap(dst, dtype=cdtype, mode="r", shape=(n,))
+
+
+def _write_signal(path, n, dtype, chunk=1 << 22):
+    rng = np.random.default_rng(0)
+    with open(path, "wb") as f:
+        for start in range(0, n, chunk):
+            rng.standard_normal(min(chunk, n - start)).astype(dtype).tofile(f)
+
+
+def check(sizes=(1024, 3 * 4096, 100_000, 1 << 20), ram_bytes=1 << 20):
+    """Compare ``fft_file`` with ``np.fft.fft`` for ``sizes``; return rows.
+
+    The small RAM budget forces many blocks even at these sizes.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            for dtype in (np.float64, np.float32):
+                src, dst = os.path.join(tmp, "x.bin"), os.path.join(tmp, "X.bin")
+                _write_signal(src, n, dtype)
+                X = fft_file(src, dst, dtype, ram_bytes=ram_bytes)
+                reference = np.fft.fft(np.fromfile(src, dtype=dtype).astype(np.float64))
+                error = float(np.abs(X - reference).max() / np.abs(reference).max())
+                rows.append({"n": n, "dtype": np.dtype(dtype).name, "split": split(n),
+                             "max_rel_error": error,
+                             "ok": error < (1e-5 if dtype == np.float32 else 1e-12)})
+                del X
+    return rows
+
+
+def check_spectrum(n=3 * 4096, windows=("rectangular", "hann", "kaiser"), ram_bytes=1 << 18):
+    """Compare ``spectrum.file_spectrum`` with ``spectrum.one_sided_spectrum``; return rows."""
+    from fourier.spectrum import file_spectrum, one_sided_spectrum
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "x.bin")
+        for dtype in (np.float64, np.float32):
+            _write_signal(src, n, dtype)
+            x = np.fromfile(src, dtype=dtype).astype(np.float64)
+            for window in windows:
+                freqs, X = file_spectrum(src, dtype, d=1e-3, window=window, ram_bytes=ram_bytes)
+                ref_freqs, reference = one_sided_spectrum(x, 1e-3, window)
+                error = float(np.abs(X - reference).max() / np.abs(reference).max())
+                rows.append({"n": n, "dtype": np.dtype(dtype).name, "window": window,
+                             "writeable": X.flags.writeable, "max_rel_error": error,
+                             "ok": (np.array_equal(freqs, ref_freqs) and not X.flags.writeable
+                                    and error < (1e-5 if dtype == np.float32 else 1e-12))})
+                del X
+    return rows
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, help="time a random float32 file of this size")
+    parser.add_argument("--ram-mb", type=float, default=None)
+    parser.add_argument("--dir", default=None, help="where to put the files (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    if args.size_mb is None:
+        rows = check() + check_spectrum()
+        for row in rows:
+            print("  ".join(f"{k}={v}" for k, v in row.items()))
+        return 0 if all(row["ok"] for row in rows) else 1
+
+    ram_bytes = int(args.ram_mb * 2**20) if args.ram_mb else None
+    n = 1 << int(math.log2(args.size_mb * 2**20 / 4))
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        src, dst = os.path.join(tmp, "x.bin"), os.path.join(tmp, "X.bin")
+        _write_signal(src, n, np.float32)
+        start = time.perf_counter()
+        fft_file(src, dst, np.float32, ram_bytes=ram_bytes,
+                 progress=lambda f, m: print(f"[{f:4.0%}] {m}", file=sys.stderr))
+        elapsed = time.perf_counter() - start
+        print(f"N = {n:,} float32 ({n * 4 / 2**20:,.0f} MB in, {n * 8 / 2**20:,.0f} MB out): "
+              f"{elapsed:.2f} s, {n / elapsed / 1e6:.1f} Msamples/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Concurrent rendering stress check for the figure path.
+
+Renders a set of scenes shaped like the pages' figures (line plots with
+mathtext titles and legends, polar axes, images, log axes) once serially to
+get reference bytes, then renders them again from many threads at once and
+checks every image is byte-identical to its reference.
+
+Run headless with::
+
+    python -m fourier.plot_stress --sessions 32 --rounds 4
+
+The exit status is non-zero if any image differs.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from fourier.figures import figure_stats, new_figure
+from fourier.plotting import encode_figure
+
+
+def _spectrum_scene(seed):
+    t = np.linspace(0, 2, 1000)
+    f1, f2 = 1 + seed % 10, 2 + (seed * 3) % 10
+    signal = np.sin(2 * np.pi * f1 * t) + 0.5 * np.sin(2 * np.pi * f2 * t)
+    freqs = np.fft.rfftfreq(len(t), t[1] - t[0])
+    magnitude = np.abs(np.fft.rfft(signal))
+
+    fig, axes = new_figure(2, 1, figsize=(10, 8))
+    axes[0].plot(t, signal, 'b-', linewidth=2, label='signal')
+    axes[0].set_title(f'$f(t) = \\sin(2\\pi \\cdot {f1}t) + 0.5\\sin(2\\pi \\cdot {f2}t)$',
+                      fontsize=12, fontweight='bold')
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+    axes[1].plot(freqs, magnitude, 'r-', linewidth=2)
+    axes[1].set_xlim(0, 15)
+    axes[1].grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def _polar_scene(seed):
+    theta = np.linspace(0, 2 * np.pi, 100)
+    angle = np.pi / (2 + seed % 6)
+    fig, ax = new_figure(figsize=(8, 8), subplot_kw={'projection': 'polar'})
+    ax.plot(theta, np.ones_like(theta), 'b-', linewidth=2, label='Unit Circle')
+    ax.plot([0, angle], [0, 1], 'r-', linewidth=2, label='Complex Exponential')
+    ax.set_title("Euler's Formula: $e^{i\\theta}$", fontsize=14, fontweight='bold', pad=20)
+    ax.legend()
+    return fig
+
+
+def _image_scene(seed):
+    size = 64
+    x = np.linspace(0, 4 * np.pi, size)
+    X, Y = np.meshgrid(x, x)
+    image = np.sin(X * (1 + seed % 3)) + 0.5 * np.sin(2 * Y)
+    magnitude = np.abs(np.fft.fftshift(np.fft.fft2(image)))
+    fig, axes = new_figure(1, 2, figsize=(10, 5))
+    axes[0].imshow(image, cmap='gray')
+    axes[0].axis('off')
+    axes[1].imshow(np.log(magnitude + 1), cmap='hot')
+    axes[1].axis('off')
+    fig.tight_layout()
+    return fig
+
+
+def _bode_scene(seed):
+    freq_range = np.logspace(0, 3, 1000)
+    cutoff = 50 + 10 * (seed % 10)
+    H = 1 / (1 + 1j * freq_range / cutoff)
+    fig, axes = new_figure(2, 1, figsize=(10, 8))
+    axes[0].semilogx(freq_range, 20 * np.log10(np.abs(H)), 'b-', linewidth=2)
+    axes[0].axvline(cutoff, color='r', linestyle='--', label=f'Cutoff: {cutoff} Hz')
+    axes[0].legend()
+    axes[1].semilogx(freq_range, np.angle(H) * 180 / np.pi, 'r-', linewidth=2)
+    fig.tight_layout()
+    return fig
+
+
+SCENES = (_spectrum_scene, _polar_scene, _image_scene, _bode_scene)
+
+
+def _jobs(variants):
+    return [(scene, seed) for scene in SCENES for seed in range(variants)]
+
+
+def _render(job):
+    scene, seed = job
+    return encode_figure(scene(seed))
+
+
+def run_stress(sessions=8, rounds=2, variants=2):
+    """Compare concurrent renders against serial ones.
+
+    Returns a dict with timings and the number of mismatching images.
+    """
+    jobs = _jobs(variants)
+
+    start = time.perf_counter()
+    reference = {job: _render(job) for job in jobs}
+    serial_s = time.perf_counter() - start
+
+    work = [jobs[i % len(jobs)] for i in range(sessions * rounds)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(_render, work))
+    concurrent_s = time.perf_counter() - start
+
+    mismatches = sum(1 for job, data in zip(work, results) if data != reference[job])
+    return {
+        "sessions": sessions,
+        "images": len(work),
+        "mismatches": mismatches,
+        "serial_ms_per_image": round(serial_s * 1000 / len(jobs), 3),
+        "concurrent_ms_per_image": round(concurrent_s * 1000 / len(work), 3),
+        "live_figures_after": figure_stats()["live"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--variants", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    result = run_stress(args.sessions, args.rounds, args.variants)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    return 1 if result["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Rendered-figure cache keyed by plot inputs.
+
+Building and rasterizing a matplotlib figure is the bulk of a rerun's
+cost, even when the plotted data is identical to a previous run. Pages
+pass a drawing function together with its arguments, which must be
+everything that determines the picture (arrays, labels, slider values);
+the arguments are hashed and the encoded PNG/SVG bytes are kept in
+``figure_cache``, so a repeat request never touches matplotlib.
+"""
+
+import hashlib
+import io
+
+import streamlit as st
+
+from fourier.cache import figure_cache
+from fourier.figures import release_figure
+
+# Matches what st.pyplot uses for its own rendering
+SAVEFIG_KWARGS = {"dpi": 200, "bbox_inches": "tight"}
+
+
+def _feed(h, value):
+    """Feed ``value`` into hash ``h`` in a type-aware, unambiguous way."""
+    if hasattr(value, "dtype") and hasattr(value, "tobytes"):
+        h.update(b"array")
+        h.update(str(value.dtype).encode())
+        h.update(repr(value.shape).encode())
+        h.update(value.tobytes())
+    elif isinstance(value, (tuple, list)):
+        h.update(b"seq%d" % len(value))
+        for v in value:
+            _feed(h, v)
+    elif isinstance(value, dict):
+        h.update(b"map%d" % len(value))
+        for k in sorted(value):
+            _feed(h, k)
+            _feed(h, value[k])
+    else:
+        h.update(type(value).__name__.encode())
+        h.update(repr(value).encode())
+    h.update(b"|")
+
+
+def figure_key(name, inputs, fmt):
+    """Digest identifying one rendered figure."""
+    h = hashlib.blake2b(digest_size=20)
+    _feed(h, (name, fmt))
+    _feed(h, inputs)
+    return h.hexdigest()
+
+
+def encode_figure(fig, fmt="png"):
+    """Encode ``fig`` to image bytes through its own canvas and release it.
+
+    No lock is held while rendering: the figure cache only locks around
+    its dictionary updates, so sessions rasterize in parallel.
+    """
+    buf = io.BytesIO()
+    try:
+        fig.canvas.print_figure(buf, format=fmt, **SAVEFIG_KWARGS)
+    finally:
+        release_figure(fig)
+    return buf.getvalue()
+
+
+def render_figure(name, draw, *inputs, fmt="png"):
+    """Return encoded bytes for the figure ``draw(*inputs)`` would produce.
+
+    ``name`` identifies the drawing code and ``inputs`` must cover
+    everything the figure depends on; ``draw`` is only called on a miss.
+    """
+    key = figure_key(name, inputs, fmt)
+    data = figure_cache.get(key)
+    if data is None:
+        data = figure_cache.put(key, encode_figure(draw(*inputs), fmt))
+    return data
+
+
+def show_figure(name, draw, *inputs, fmt="png"):
+    """Render through the figure cache and display the image in Streamlit."""
+    data = render_figure(name, draw, *inputs, fmt=fmt)
+    if fmt == "svg":
+        st.image(data.decode("utf-8"))
+    else:
+        st.image(data)
@@ -0,0 +1,180 @@
+"""Multi-resolution pyramid of a magnitude spectrum for zooming and panning.
+
+Plotting a band of a million-bin spectrum means slicing, converting and
+drawing every bin in it, although the plot is only a couple of thousand
+pixels wide. ``SpectrumPyramid`` precomputes levels of the magnitude: level
+0 holds every bin and each further level max-pools ``factor`` neighbouring
+bins of the one below, down to a level of at most one tile. Max-pooling
+keeps every peak visible at every level.
+
+Each level is split into tiles of ``tile`` bins. ``view(fmin, fmax, width)``
+picks the coarsest level that still has at least ``width`` bins inside the
+band, reads only the tiles covering it (through a small LRU of tiles) and
+returns between ``width`` and ``factor * width`` points, so the cost of a
+zoom or pan depends on the plot width rather than the FFT length.
+
+With ``directory`` the levels are written as ``.npy`` files and opened as
+read-only memmaps, so only the tiles a view touches are paged in; that
+works with spectra from ``fourier.spectrum.file_spectrum``.
+
+Run ``python -m fourier.pyramid`` to compare view times with slicing the
+full spectrum at several FFT lengths.
+"""
+
+import collections
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_TILE = 4096
+DEFAULT_FACTOR = 4
+
+
+class SpectrumPyramid:
+    """Max-pooled levels of ``|X|`` over the uniform axis ``f0 + k * df``."""
+
+    def __init__(self, magnitude, df, f0=0.0, tile=DEFAULT_TILE, factor=DEFAULT_FACTOR,
+                 directory=None, cached_tiles=64):
+        self.df = float(df)
+        self.f0 = float(f0)
+        self.tile = tile
+        self.factor = factor
+        self.bins = len(magnitude)
+        self.levels = self._build(magnitude, directory)
+        self._tiles = collections.OrderedDict()
+        self._cached_tiles = cached_tiles
+        self._lock = threading.Lock()
+        self.tile_reads = 0
+
+    @classmethod
+    def from_spectrum(cls, X, df, chunk=1 << 20, **kwargs):
+        """Pyramid of ``|X|`` for a complex spectrum, taken ``chunk`` bins at a time."""
+        magnitude = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), chunk):
+            magnitude[start:start + chunk] = np.abs(X[start:start + chunk])
+        return cls(magnitude, df, **kwargs)
+
+    def _build(self, magnitude, directory):
+        levels = [self._store(np.asarray(magnitude, dtype=np.float32), directory, 0)]
+        while len(levels[-1]) > self.tile:
+            below = levels[-1]
+            pooled = len(below) // self.factor * self.factor
+            level = below[:pooled].reshape(-1, self.factor).max(axis=1)
+            if pooled < len(below):
+                level = np.append(level, below[pooled:].max())
+            levels.append(self._store(level, directory, len(levels)))
+        return levels
+
+    @staticmethod
+    def _store(level, directory, index):
+        if directory is None:
+            level = np.ascontiguousarray(level)
+            level.setflags(write=False)
+            return level
+        path = os.path.join(directory, f"level{index}.npy")
+        np.save(path, level)
+        return np.load(path, mmap_mode="r")
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def _read_tile(self, level, index):
+        # Pyramids are shared between sessions through the compute cache
+        key = (level, index)
+        with self._lock:
+            data = self._tiles.get(key)
+            if data is not None:
+                self._tiles.move_to_end(key)
+                return data
+        data = np.array(self.levels[level][index * self.tile:(index + 1) * self.tile])
+        data.setflags(write=False)
+        with self._lock:
+            self.tile_reads += 1
+            self._tiles[key] = data
+            if len(self._tiles) > self._cached_tiles:
+                self._tiles.popitem(last=False)
+        return data
+
+    def level_for(self, first, last, width):
+        """Coarsest level with at least ``width`` bins between level-0 bins ``first`` and ``last``."""
+        span = max(last - first, 1)
+        level = int(math.log(span / max(width, 1), self.factor)) if span > width else 0
+        return min(max(level, 0), len(self.levels) - 1)
+
+    def view(self, fmin, fmax, width=2000):
+        """``(freqs, magnitude, level)`` for the band [fmin, fmax].
+
+        Each returned point is the maximum of the level-0 bins it covers,
+        placed at the centre of those bins.
+        """
+        first = max(int(math.floor((fmin - self.f0) / self.df)), 0)
+        last = min(int(math.ceil((fmax - self.f0) / self.df)) + 1, self.bins)
+        level = self.level_for(first, last, width)
+        scale = self.factor ** level
+        lo, hi = first // scale, min(-(-last // scale), len(self.levels[level]))
+        if hi <= lo:
+            return np.empty(0), np.empty(0, dtype=np.float32), level
+        tiles = [self._read_tile(level, i) for i in range(lo // self.tile, (hi - 1) // self.tile + 1)]
+        data = np.concatenate(tiles)[lo - lo // self.tile * self.tile:][:hi - lo]
+        freqs = self.f0 + (np.arange(lo, hi) * scale + (scale - 1) / 2) * self.df
+        return freqs, data, level
+
+    def stats(self):
+        return {"bins": self.bins, "levels": len(self.levels), "tile": self.tile,
+                "factor": self.factor, "tile_reads": self.tile_reads, "bytes": self.nbytes}
+
+
+def benchmark(log2_sizes=(16, 18, 20, 22), width=2000, views=20):
+    """Median time of a zoom/pan view: pyramid vs slicing the full spectrum.
+
+    Each size gets ``views`` random bands from 0.1% to 100% of the axis;
+    returns one row per size with both times in ms and the points returned.
+    """
+    rows = []
+    for log2_n in log2_sizes:
+        n = 1 << log2_n
+        rng = np.random.default_rng(log2_n)
+        X = np.fft.rfft(rng.standard_normal(n))
+        df = 1.0 / n
+        pyramid = SpectrumPyramid.from_spectrum(X, df)
+        magnitude = np.abs(X)
+        freqs = np.fft.rfftfreq(n)
+        bands = []
+        for _ in range(views):
+            span = 0.5 * 10 ** rng.uniform(-3, 0)
+            start = rng.uniform(0, 0.5 - span)
+            bands.append((start, start + span))
+
+        pyramid_s, full_s, points = [], [], []
+        for fmin, fmax in bands:
+            t0 = time.perf_counter()
+            _, data, _ = pyramid.view(fmin, fmax, width)
+            pyramid_s.append(time.perf_counter() - t0)
+            points.append(len(data))
+            t0 = time.perf_counter()
+            mask = (freqs >= fmin) & (freqs <= fmax)
+            freqs[mask], magnitude[mask]
+            full_s.append(time.perf_counter() - t0)
+        rows.append({"n": n, "bins": len(X), "levels": len(pyramid.levels),
+                     "pyramid_ms": float(np.median(pyramid_s)) * 1e3,
+                     "full_ms": float(np.median(full_s)) * 1e3,
+                     "max_points": max(points)})
+    return rows
+
+
+def main(argv=None):
+    sizes = [int(a) for a in (argv if argv is not None else sys.argv[1:])] or [16, 18, 20, 22]
+    for row in benchmark(sizes):
+        print(f"N=2^{int(math.log2(row['n']))}  bins={row['bins']:<9,} levels={row['levels']}  "
+              f"pyramid view={row['pyramid_ms']:.3f} ms  full slice={row['full_ms']:.3f} ms  "
+              f"points <= {row['max_points']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
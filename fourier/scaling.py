@@ -0,0 +1,268 @@
+"""Empirical complexity-scaling suite for the FFT and the direct DFT.
+
+The FFT page states O(N log N) vs O(N^2); this suite measures it. It times
+``np.fft.fft`` over three families of sizes up to millions of samples:
+
+* powers of two, the FFT's best case;
+* primes just above each power of two, which need Bluestein/Rader-style
+  algorithms;
+* highly composite numbers, which factor into many small radices;
+
+and the direct DFT (``fourier.dft.dft_twiddle``) over the smaller sizes. A
+least-squares line through log(time) vs log(N) gives the empirical exponent
+of each (method, family) series, and the constant in front of the model
+cost (N log2 N or N^2) is reported in nanoseconds.
+
+Measurements are slow to repeat at large N, so every point is stored in a
+JSON file per machine (keyed by host, CPU, Python and NumPy versions) under
+``FOURIER_SCALING_DIR`` (default ``~/.cache/fourier``) and reused until
+``refresh`` is requested.
+
+Run headless with::
+
+    python -m fourier.scaling --max-n 4194304 --plot scaling.png
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import sys
+import threading
+
+import numpy as np
+
+from fourier.dft import dft_twiddle
+from fourier.timing import measure
+
+DEFAULT_MAX_N = 1 << 20
+DEFAULT_DFT_MAX_N = 2048
+# Smaller sizes are dominated by call overhead and are left out of the fits
+FIT_MIN_N = 256
+
+# Highly composite numbers, roughly log-spaced
+HIGHLY_COMPOSITE = (24, 48, 120, 240, 720, 1680, 5040, 10080, 27720, 55440,
+                    166320, 332640, 720720, 1441440, 4324320, 8648640)
+
+FFT = "FFT"
+DFT = "Direct DFT"
+
+_lock = threading.Lock()
+
+
+def _is_prime(n):
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for d in range(3, math.isqrt(n) + 1, 2):
+        if n % d == 0:
+            return False
+    return True
+
+
+def _next_prime(n):
+    while not _is_prime(n):
+        n += 1
+    return n
+
+
+def size_families(max_n):
+    """Sizes to sweep, as ``{family: [N, ...]}``, all at most ``max_n``."""
+    powers = [1 << k for k in range(4, max_n.bit_length()) if 1 << k <= max_n]
+    primes = [p for p in (_next_prime(n + 1) for n in powers) if p <= max_n]
+    composite = [n for n in HIGHLY_COMPOSITE if n <= max_n]
+    return {"power of two": powers, "prime": primes, "highly composite": composite}
+
+
+def _model(method, n):
+    return n * n if method == DFT else n * math.log2(n)
+
+
+def machine_info():
+    """What the stored timings depend on."""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def cache_path(cache_dir=None):
+    """JSON file holding this machine's measurements."""
+    if cache_dir is None:
+        cache_dir = os.environ.get("FOURIER_SCALING_DIR",
+                                   os.path.join(os.path.expanduser("~"), ".cache", "fourier"))
+    info = json.dumps(machine_info(), sort_keys=True).encode()
+    return os.path.join(cache_dir, f"scaling-{hashlib.blake2b(info, digest_size=8).hexdigest()}.json")
+
+
+def load_points(path=None):
+    """Stored ``{"method/N": timing dict}`` for this machine (empty if none)."""
+    path = path or cache_path()
+    try:
+        with open(path) as f:
+            return json.load(f)["points"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _save_points(points, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"machine": machine_info(), "points": points}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _plan(max_n, dft_max_n):
+    families = size_families(max_n)
+    sizes = sorted({n for ns in families.values() for n in ns})
+    plan = [(FFT, n) for n in sizes]
+    plan += [(DFT, n) for n in sizes if n <= dft_max_n]
+    return families, plan
+
+
+def _measure_point(method, n):
+    # Not ``test_signal``: its cache would pin every multi-megabyte input
+    x = np.random.default_rng(0).standard_normal(n)
+    if method == FFT:
+        timing = measure(np.fft.fft, x, budget_s=0.05, max_total_s=1.0)
+    else:
+        timing = measure(dft_twiddle, x, budget_s=0.05, min_samples=3, max_total_s=2.0)
+    return {"median_ns": timing.median_ns, "iqr_ns": timing.iqr_ns,
+            "samples": len(timing.samples_ns), "loops": timing.loops}
+
+
+def run_suite(max_n=DEFAULT_MAX_N, dft_max_n=DEFAULT_DFT_MAX_N, refresh=False,
+              path=None, progress=None):
+    """Measure every missing point of the sweep and return the result.
+
+    Points already stored for this machine are reused unless ``refresh``.
+    ``progress(fraction, message)`` is called before each point and may
+    raise to stop the run; each point is written to disk as soon as it is
+    measured, so a stopped run keeps its points and readers see them early.
+    Returns ``{"points": [...], "fits": [...]}`` (see ``collect``).
+    """
+    path = path or cache_path()
+    families, plan = _plan(max_n, dft_max_n)
+    stored = {} if refresh else load_points(path)
+    for i, (method, n) in enumerate(plan):
+        key = f"{method}/{n}"
+        if key in stored:
+            continue
+        if progress is not None:
+            progress(i / len(plan), f"{method}, N = {n:,}")
+        timing = _measure_point(method, n)
+        with _lock:
+            points = load_points(path)
+            points[key] = timing
+            _save_points(points, path)
+    return collect(max_n, dft_max_n, path)
+
+
+def collect(max_n=DEFAULT_MAX_N, dft_max_n=DEFAULT_DFT_MAX_N, path=None):
+    """Stored points of the sweep, with a fit per (method, family).
+
+    Each point is ``{"method", "family", "n", "median_ms", "iqr_ms"}``;
+    each fit is ``{"method", "family", "exponent", "constant_ns",
+    "points"}``, where ``constant_ns`` is the median of time / model cost.
+    Sizes not measured yet are skipped.
+    """
+    stored = load_points(path)
+    families, plan = _plan(max_n, dft_max_n)
+    planned = set(plan)
+    points, fits = [], []
+    for method in (FFT, DFT):
+        for family, sizes in families.items():
+            series = [(n, stored[f"{method}/{n}"]) for n in sizes
+                      if (method, n) in planned and f"{method}/{n}" in stored]
+            for n, t in series:
+                points.append({"method": method, "family": family, "n": n,
+                               "median_ms": t["median_ns"] / 1e6, "iqr_ms": t["iqr_ns"] / 1e6})
+            fit = [(n, t["median_ns"]) for n, t in series if n >= FIT_MIN_N]
+            if len(fit) >= 3:
+                slope, _ = np.polyfit(np.log([n for n, _ in fit]), np.log([t for _, t in fit]), 1)
+                constant = float(np.median([t / _model(method, n) for n, t in fit]))
+                fits.append({"method": method, "family": family, "exponent": round(float(slope), 3),
+                             "constant_ns": round(constant, 4), "points": len(fit)})
+    return {"points": points, "fits": fits}
+
+
+def draw_scaling(points, fits):
+    """Log-log plot of time vs N, one series per (method, family)."""
+    from fourier.figures import new_figure
+
+    fig, ax = new_figure(figsize=(10, 6))
+    markers = {"power of two": "o", "prime": "^", "highly composite": "s"}
+    colors = {FFT: "#667eea", DFT: "#e74c3c"}
+    exponents = {(f["method"], f["family"]): f["exponent"] for f in fits}
+    for method in (FFT, DFT):
+        for family, marker in markers.items():
+            series = [p for p in points if p["method"] == method and p["family"] == family]
+            if not series:
+                continue
+            label = f"{method}, {family}"
+            if (method, family) in exponents:
+                label += f" (slope {exponents[method, family]:.2f})"
+            ax.loglog([p["n"] for p in series], [p["median_ms"] for p in series],
+                      marker=marker, linestyle="-" if family == "power of two" else ":",
+                      color=colors[method], label=label, markersize=5)
+
+    # Reference N log N and N^2 curves through the largest FFT / DFT point
+    for method, style in ((FFT, "--"), (DFT, "-.")):
+        series = sorted((p for p in points if p["method"] == method and p["family"] == "power of two"),
+                        key=lambda p: p["n"])
+        if len(series) >= 2:
+            n = np.array([p["n"] for p in series], dtype=float)
+            ref = series[-1]["median_ms"] * np.array([_model(method, v) for v in n]) / _model(method, n[-1])
+            ax.loglog(n, ref, style, color="gray", alpha=0.6,
+                      label="N log N reference" if method == FFT else "N² reference")
+
+    ax.set_xlabel("N (samples)")
+    ax.set_ylabel("Median time (ms)")
+    ax.set_title("Empirical Scaling: FFT vs Direct DFT", fontweight="bold")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    return fig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-n", type=int, default=DEFAULT_MAX_N)
+    parser.add_argument("--dft-max-n", type=int, default=DEFAULT_DFT_MAX_N)
+    parser.add_argument("--refresh", action="store_true", help="ignore stored measurements")
+    parser.add_argument("--cache-dir", help="directory for the per-machine results file")
+    parser.add_argument("--json", help="also write points and fits to this file")
+    parser.add_argument("--plot", help="write the log-log plot to this PNG file")
+    args = parser.parse_args(argv)
+
+    path = cache_path(args.cache_dir)
+
+    def progress(fraction, message):
+        print(f"[{fraction:4.0%}] {message}", file=sys.stderr)
+
+    result = run_suite(args.max_n, args.dft_max_n, args.refresh, path, progress)
+    for fit in result["fits"]:
+        print(f"{fit['method']:<11} {fit['family']:<17} exponent={fit['exponent']:.3f} "
+              f"constant={fit['constant_ns']:.4g} ns  ({fit['points']} points)")
+    print(f"results: {path}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=1)
+    if args.plot:
+        from fourier.plotting import encode_figure
+
+        with open(args.plot, "wb") as f:
+            f.write(encode_figure(draw_scaling(result["points"], result["fits"])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""One-sided spectrum engine built on real-input FFTs.
+
+Every demo transforms a real signal, yet used to compute a full complex
+``np.fft.fft`` plus ``np.fft.fftfreq`` and then discard the negative half
+with a ``freqs >= 0`` mask. ``np.fft.rfft`` computes only the N//2 + 1
+non-negative bins directly, which is roughly half the work and memory, and
+the matching frequency axis is cached per (N, sample spacing).
+
+Note that the one-sided axis includes the Nyquist bin for even N, which the
+old ``fftfreq(...) >= 0`` mask dropped (it is labelled -fs/2 there).
+
+Transforms go through the active FFT backend (see ``fourier.backends``).
+Spectra are tapered with the active window from ``fourier.windows`` (a
+cached array, so reruns do not rebuild it) and scaled by its coherent gain,
+so a tone on a bin keeps the height it has without a window. Filters use
+no window, since tapering before the inverse transform would change the
+filtered signal.
+``band_spectrum`` evaluates only a band [f1, f2], at any resolution, with
+the zoom FFT in ``fourier.zoom_fft``, and ``tone_spectrum`` a few single
+frequencies with ``fourier.goertzel``. ``file_spectrum`` handles raw sample
+files too large for memory with the out-of-core FFT in
+``fourier.out_of_core``, tapering the samples block by block as they are
+read (``dpss`` has no closed form, so it is refused there).
+
+Run ``python -m fourier.spectrum`` for a full-vs-real FFT benchmark.
+"""
+
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+
+from fourier.backends import active_backend
+from fourier.windows import active_window, get_window
+
+
+@functools.lru_cache(maxsize=64)
+def rfft_axis(n, d=1.0):
+    """Read-only one-sided frequency axis for ``n`` samples spaced ``d``."""
+    freqs = np.fft.rfftfreq(n, d)
+    freqs.setflags(write=False)
+    return freqs
+
+
+def sample_spacing(t):
+    """Sample spacing of an evenly spaced time vector."""
+    return float(t[1] - t[0])
+
+
+def one_sided_spectrum(signal, d=1.0, window=None):
+    """Return ``(freqs, X)``: the non-negative bins of a real signal's DFT.
+
+    ``window`` names a ``fourier.windows`` window (default: the active one);
+    the windowed spectrum is divided by the window's coherent gain.
+    """
+    signal = np.asarray(signal)
+    n = signal.shape[-1]
+    taper = get_window(window or active_window(), n)
+    if taper.name != "rectangular":
+        signal = signal * taper.values
+    X = active_backend().rfft(signal)
+    if taper.name != "rectangular":
+        X *= taper.amplitude_correction
+    return rfft_axis(n, d), X
+
+
+def band_spectrum(signal, d, f1, f2, m, window=None):
+    """Return ``(freqs, X)`` at ``m`` frequencies from ``f1`` to ``f2``.
+
+    Scaled and windowed like ``one_sided_spectrum``, whose bins it matches
+    where the frequencies coincide; the grid step can be much finer than
+    1 / (N d) without zero-padding the signal.
+    """
+    from fourier.zoom_fft import zoom_fft
+
+    signal = np.asarray(signal)
+    taper = get_window(window or active_window(), signal.shape[-1])
+    if taper.name != "rectangular":
+        signal = signal * taper.values
+    freqs, X = zoom_fft(signal, f1, f2, m, 1 / d)
+    if taper.name != "rectangular":
+        X *= taper.amplitude_correction
+    return freqs, X
+
+
+def tone_spectrum(signal, d, freqs, window=None, method="auto"):
+    """Return ``X`` at each of ``freqs``, scaled like ``one_sided_spectrum``.
+
+    Uses Goertzel or an FFT, whichever ``fourier.goertzel.choose`` expects
+    to be cheaper; ``2 |X| / N`` is the amplitude of a tone at that frequency.
+    """
+    from fourier.goertzel import evaluate
+
+    signal = np.asarray(signal)
+    taper = get_window(window or active_window(), signal.shape[-1])
+    if taper.name != "rectangular":
+        signal = signal * taper.values
+    X = evaluate(signal, freqs, 1 / d, method)
+    if taper.name != "rectangular":
+        X *= taper.amplitude_correction
+    return X
+
+
+def magnitude_spectrum(signal, d=1.0, window=None):
+    """Return ``(freqs, |X|)`` over the non-negative frequencies."""
+    freqs, X = one_sided_spectrum(signal, d, window)
+    return freqs, np.abs(X)
+
+
+def band_filter(signal, d, keep):
+    """Zero the bins where ``keep(freqs)`` is False and transform back.
+
+    ``keep`` receives the one-sided (non-negative) frequency axis, which is
+    equivalent to masking ``np.abs(fftfreq)`` on the full spectrum. Returns
+    ``(freqs, X, X_filtered, filtered_signal)``.
+    """
+    n = np.asarray(signal).shape[-1]
+    freqs, X = one_sided_spectrum(signal, d, window="rectangular")
+    X_filtered = np.where(keep(freqs), X, 0)
+    return freqs, X, X_filtered, active_backend().irfft(X_filtered, n)
+
+
+def file_spectrum(path, dtype=np.float64, d=1.0, window=None, out_path=None, ram_bytes=None,
+                  progress=None):
+    """Return ``(freqs, X)`` for the raw real samples in the file ``path``.
+
+    Windowed and scaled like ``one_sided_spectrum``, whose result it
+    matches. The transform streams through ``ram_bytes`` of memory (default
+    ``FOURIER_OOC_RAM_MB``) and ``X`` is a read-only memmap of the
+    non-negative bins, so neither the signal nor the spectrum has to fit in
+    RAM. The full spectrum is written to ``out_path`` (default: ``path``
+    with ``.fft`` appended).
+    """
+    from fourier.out_of_core import fft_file
+    from fourier.windows import coherent_gain, window_values
+
+    dtype = np.dtype(dtype)
+    n = os.path.getsize(path) // dtype.itemsize
+    window = window or active_window()
+    taper = None
+    if window != "rectangular":
+        # Scale by the coherent gain on the way in, since the output is
+        # read-only; raises ValueError for windows that must be built whole
+        correction = 1 / coherent_gain(window, n)
+
+        def taper(indices):
+            return window_values(window, n, indices) * correction
+
+    X = fft_file(path, out_path or f"{path}.fft", dtype, n=n, ram_bytes=ram_bytes, taper=taper,
+                 progress=progress)
+    return rfft_axis(n, d), X[: n // 2 + 1]
+
+
+def centered_magnitude_2d(half_spectrum, shape):
+    """``|fftshift(fft2(image))|`` from ``rfft2(image)`` of a real image.
+
+    The half-plane that ``rfft2`` omits follows from Hermitian symmetry:
+    ``|X[k0, -k1]| == |X[-k0, k1]|``.
+    """
+    rows, cols = shape
+    half = np.abs(half_spectrum)
+    full = np.empty((rows, cols), dtype=half.dtype)
+    n_half = half.shape[1]
+    full[:, :n_half] = half
+    # Columns k1 = n_half..cols-1 are -k1' with k1' = cols-k1 in 1..cols-n_half
+    mirrored_rows = (-np.arange(rows)) % rows
+    full[:, n_half:] = half[mirrored_rows][:, cols - np.arange(n_half, cols)]
+    return np.fft.fftshift(full)
+
+
+def benchmark(sizes=(1024, 4096, 16384, 65536, 262144, 1048576), repeats=20):
+    """Time full vs real FFT (plus the positive-frequency extraction).
+
+    Returns one dict per size with best-of-``repeats`` times in ms and the
+    bytes of the spectrum each approach keeps.
+    """
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in sizes:
+        x = rng.standard_normal(n)
+
+        def full():
+            X = np.fft.fft(x)
+            freqs = np.fft.fftfreq(n)
+            pos = freqs >= 0
+            return freqs[pos], np.abs(X[pos])
+
+        def real():
+            return magnitude_spectrum(x, window="rectangular")
+
+        timings = {}
+        for label, func in (("fft", full), ("rfft", real)):
+            func()
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best * 1000
+        rows.append({
+            "n": n,
+            "fft_ms": round(timings["fft"], 4),
+            "rfft_ms": round(timings["rfft"], 4),
+            "speedup": round(timings["fft"] / timings["rfft"], 2),
+            "fft_bytes": np.fft.fft(x).nbytes,
+            "rfft_bytes": np.fft.rfft(x).nbytes,
+        })
+    return rows
+
+
+def main(argv=None):
+    for row in benchmark():
+        print("  ".join(f"{k}={v}" for k, v in row.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
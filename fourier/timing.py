@@ -0,0 +1,102 @@
+"""Benchmark timing harness.
+
+A single ``time.time()`` around one call has coarse resolution, includes
+first-call costs (page faults, cache misses, FFT planning) and is noisy
+from run to run. ``measure`` uses ``perf_counter_ns``, warms the function
+up, batches fast calls into loops long enough to time accurately, picks the
+number of samples to fit a time budget and reports the median with the
+interquartile range.
+
+``test_signal`` hands out seeded, cached random signals so that reruns time
+the same input instead of a fresh ``np.random.randn`` draw.
+"""
+
+import functools
+import math
+import statistics
+import time
+
+# Each timed sample runs long enough that timer resolution is negligible
+MIN_SAMPLE_NS = 200_000
+
+
+class Timing:
+    """Per-call statistics for one ``measure`` run, in nanoseconds."""
+
+    def __init__(self, samples_ns, loops):
+        self.samples_ns = sorted(samples_ns)
+        self.loops = loops
+        self.median_ns = statistics.median(self.samples_ns)
+        if len(self.samples_ns) >= 2:
+            q1, _, q3 = statistics.quantiles(self.samples_ns, n=4, method="inclusive")
+        else:
+            q1 = q3 = self.median_ns
+        self.q1_ns = q1
+        self.q3_ns = q3
+
+    @property
+    def iqr_ns(self):
+        return self.q3_ns - self.q1_ns
+
+    @property
+    def median_ms(self):
+        return self.median_ns / 1e6
+
+    @property
+    def iqr_ms(self):
+        return self.iqr_ns / 1e6
+
+    @property
+    def median_s(self):
+        return self.median_ns / 1e9
+
+    def __str__(self):
+        return f"{self.median_ms:.4f} ms (IQR {self.iqr_ms:.4f} ms, {len(self.samples_ns)}×{self.loops})"
+
+    def as_dict(self):
+        return {
+            "median_ms": round(self.median_ms, 6),
+            "iqr_ms": round(self.iqr_ms, 6),
+            "samples": len(self.samples_ns),
+            "loops": self.loops,
+        }
+
+
+def measure(func, *args, budget_s=0.2, min_samples=5, max_samples=200,
+            max_total_s=5.0, warmup=1):
+    """Time ``func(*args)`` and return a ``Timing`` of per-call times.
+
+    The first warm-up call also estimates the cost, from which the loop
+    count per sample and the number of samples (to fill ``budget_s``) are
+    chosen. Very slow functions get fewer than ``min_samples`` samples so
+    the total stays under ``max_total_s``.
+    """
+    start = time.perf_counter_ns()
+    func(*args)
+    estimate = max(time.perf_counter_ns() - start, 1)
+    for _ in range(warmup - 1):
+        func(*args)
+
+    loops = max(1, math.ceil(MIN_SAMPLE_NS / estimate))
+    per_sample = estimate * loops
+    samples = int(budget_s * 1e9 // per_sample)
+    samples = max(min_samples, min(samples, max_samples))
+    samples = max(1, min(samples, int(max_total_s * 1e9 // per_sample)))
+
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func(*args)
+        timings.append((time.perf_counter_ns() - start) / loops)
+    return Timing(timings, loops)
+
+
+@functools.lru_cache(maxsize=32)
+def test_signal(n, seed=0):
+    """Read-only standard-normal test signal, identical on every rerun."""
+    import numpy as np
+
+    signal = np.random.default_rng(seed).standard_normal(n)
+    signal.setflags(write=False)
+    return signal
@@ -0,0 +1,243 @@
+"""Window functions for spectrum estimation, cached with correction factors.
+
+Transforming a finite record treats it as one period of a periodic signal,
+so a tone that does not complete a whole number of cycles leaks into every
+bin. Tapering the record with a window trades a wider main lobe for much
+lower leakage. The library offers
+
+* ``rectangular``: no taper (what an unwindowed FFT does);
+* ``hann``, ``hamming``: raised cosines, the everyday choices;
+* ``blackman``: 3-term, about -58 dB sidelobes;
+* ``blackmanharris``: 4-term, about -92 dB sidelobes;
+* ``kaiser``: tunable by ``beta`` (default 8.6, close to Blackman);
+* ``flattop``: flat main lobe for accurate amplitudes between bins;
+* ``dpss``: the first Slepian sequence, with time-bandwidth ``NW`` (default 3).
+
+Windows are periodic (DFT-even), the right form for spectral analysis.
+``get_window`` returns a read-only ``Window`` from an LRU cache keyed by
+(name, N, params), so a rerun never rebuilds the array, and each
+``Window`` carries its correction factors:
+
+* coherent gain ``sum(w) / N``: divide by it to restore tone amplitudes;
+* ENBW ``N sum(w²) / sum(w)²`` in bins: the noise bandwidth of one bin;
+* scalloping loss: the amplitude drop for a tone halfway between bins.
+
+The active window follows ``use_window``, the session's sidebar choice under
+``SESSION_KEY``, then ``FOURIER_WINDOW`` (default ``hann``), the same
+order as ``fourier.backends``. NumPy is only imported when a window is
+built, so the sidebar can list windows without it. All windows but
+``dpss`` are computed with NumPy (cosine sums and ``np.kaiser``), so
+spectra do not pull in ``scipy.signal``, which takes most of a second to
+import cold. The same formulas give ``window_values``, the window at any
+sample indices without building it, for files longer than memory.
+
+Run ``python -m fourier.windows`` for the correction factors and the cost
+of a cached lookup versus building the window.
+"""
+
+import contextlib
+import contextvars
+import functools
+import os
+import sys
+
+DEFAULT_WINDOW = "hann"
+SESSION_KEY = "fourier_window"
+
+# name -> (label, scipy.signal.windows function, default parameters)
+WINDOWS = {
+    "rectangular": ("Rectangular (none)", "boxcar", {}),
+    "hann": ("Hann", "hann", {}),
+    "hamming": ("Hamming", "hamming", {}),
+    "blackman": ("Blackman", "blackman", {}),
+    "blackmanharris": ("Blackman-Harris", "blackmanharris", {}),
+    "kaiser": ("Kaiser", "kaiser", {"beta": 8.6}),
+    "flattop": ("Flat-top", "flattop", {}),
+    "dpss": ("DPSS (Slepian)", "dpss", {"NW": 3.0}),
+}
+
+# Cosine-sum coefficients a_k of w[n] = sum (-1)^k a_k cos(2πkn / N), as in SciPy
+COSINE_SUMS = {
+    "hann": (0.5, 0.5),
+    "hamming": (0.54, 0.46),
+    "blackman": (0.42, 0.50, 0.08),
+    "blackmanharris": (0.35875, 0.48829, 0.14128, 0.01168),
+    "flattop": (0.21557895, 0.41663158, 0.277263158, 0.083578947, 0.006947368),
+}
+
+_active = contextvars.ContextVar("fourier_window", default=None)
+
+
+class Window:
+    """A read-only window array and its spectral correction factors."""
+
+    def __init__(self, name, values, params):
+        import numpy as np
+
+        self.name = name
+        self.label = WINDOWS[name][0]
+        self.params = params
+        self.values = values
+        n = len(values)
+        total = values.sum()
+        self.coherent_gain = float(total / n)
+        self.enbw_bins = float(n * np.dot(values, values) / total**2)
+        half_bin = np.exp(-1j * np.pi * np.arange(n) / n)
+        self.scalloping_loss_db = float(-20 * np.log10(abs(np.dot(values, half_bin)) / total))
+
+    @property
+    def amplitude_correction(self):
+        return 1 / self.coherent_gain
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        params = "".join(f", {k}={v}" for k, v in self.params)
+        return f"Window({self.name!r}, N={len(self)}{params})"
+
+    def as_dict(self):
+        return {"window": self.label, "n": len(self), "coherent_gain": self.coherent_gain,
+                "enbw_bins": self.enbw_bins, "scalloping_loss_db": self.scalloping_loss_db}
+
+
+def window_names():
+    return tuple(WINDOWS)
+
+
+def window_label(name):
+    return WINDOWS[name][0]
+
+
+def _values_at(name, n, indices, params):
+    """Values at ``indices`` of the periodic window; ``None`` for windows that need SciPy."""
+    import numpy as np
+
+    if name == "rectangular" or n <= 1:
+        return np.ones(np.shape(indices))
+    if name in COSINE_SUMS:
+        phase = (2 * np.pi / n) * indices
+        values = np.full(np.shape(indices), COSINE_SUMS[name][0])
+        for k, a in enumerate(COSINE_SUMS[name][1:], start=1):
+            values += (-1) ** k * a * np.cos(k * phase)
+        return values
+    if name == "kaiser":
+        # The periodic window is the symmetric one of length n + 1, minus its last sample
+        beta = params["beta"]
+        return np.i0(beta * np.sqrt(1 - (2 * indices / n - 1) ** 2)) / np.i0(beta)
+    return None
+
+
+def _periodic(name, n, params):
+    """Periodic window values with NumPy; ``None`` for windows that need SciPy."""
+    import numpy as np
+
+    return _values_at(name, n, np.arange(n), params)
+
+
+@functools.lru_cache(maxsize=128)
+def _cached(name, n, params):
+    import numpy as np
+
+    values = _periodic(name, n, dict(params))
+    if values is None:
+        from scipy.signal import windows
+
+        _, function, _ = WINDOWS[name]
+        values = getattr(windows, function)(n, **dict(params), sym=False)
+    values = np.asarray(values, dtype=float)
+    values.setflags(write=False)
+    return Window(name, values, params)
+
+
+def get_window(name, n, **params):
+    """The cached ``Window`` ``name`` of length ``n``; ``params`` override defaults."""
+    if name not in WINDOWS:
+        raise ValueError(f"unknown window {name!r}; choose from {', '.join(WINDOWS)}")
+    merged = {**WINDOWS[name][2], **params}
+    return _cached(name, int(n), tuple(sorted(merged.items())))
+
+
+def window_values(name, n, indices, **params):
+    """Values at ``indices`` of the length-``n`` window, without building it.
+
+    For signals too long to hold the window in memory, such as the files
+    of ``fourier.out_of_core``. ``dpss`` has no closed form and raises
+    ``ValueError``.
+    """
+    import numpy as np
+
+    if name not in WINDOWS:
+        raise ValueError(f"unknown window {name!r}; choose from {', '.join(WINDOWS)}")
+    values = _values_at(name, int(n), np.asarray(indices), {**WINDOWS[name][2], **params})
+    if values is None:
+        raise ValueError(f"the {window_label(name)} window has to be built whole; "
+                         f"it cannot be evaluated in pieces")
+    return values
+
+
+def coherent_gain(name, n, chunk=1 << 20, **params):
+    """``sum(w) / n`` of the length-``n`` window, summed ``chunk`` samples at a time."""
+    import numpy as np
+
+    total = sum(float(window_values(name, n, np.arange(start, min(start + chunk, n)), **params).sum())
+                for start in range(0, n, chunk))
+    return total / n
+
+
+def cache_info():
+    return _cached.cache_info()
+
+
+def _session_choice():
+    """The sidebar choice when called from a Streamlit script thread."""
+    if "streamlit" not in sys.modules:
+        return None
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(SESSION_KEY)
+
+
+def active_window():
+    """Name of the window spectra should be computed with."""
+    return _active.get() or _session_choice() or os.environ.get("FOURIER_WINDOW", DEFAULT_WINDOW)
+
+
+@contextlib.contextmanager
+def use_window(name):
+    """Make ``name`` the active window inside the ``with`` block."""
+    token = _active.set(name)
+    try:
+        yield name
+    finally:
+        _active.reset(token)
+
+
+def main(argv=None):
+    import time
+
+    args = argv if argv is not None else sys.argv[1:]
+    n = int(args[0]) if args else 4096
+    for name in WINDOWS:
+        window = get_window(name, n)
+        print("  ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}"
+                        for k, v in window.as_dict().items()))
+
+    for name in ("hann", "kaiser", "dpss"):
+        _cached.cache_clear()
+        start = time.perf_counter_ns()
+        get_window(name, n)
+        built = time.perf_counter_ns() - start
+        start = time.perf_counter_ns()
+        for _ in range(1000):
+            get_window(name, n)
+        cached = (time.perf_counter_ns() - start) / 1000
+        print(f"{name}: build {built / 1e3:.1f} µs, cached lookup {cached / 1e3:.2f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
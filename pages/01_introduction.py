@@ -1,6 +1,8 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+from fourier.figures import new_figure
+from fourier.plotting import show_figure
 
 st.title("📚 Introduction & Origin of Fourier Transform")
 st.markdown("---")
@@ -76,29 +78,33 @@ separates complex signals into their frequency components.
 st.header("🎨 Visual Introduction")
 
 # Create a simple visualization
-fig, axes = plt.subplots(2, 1, figsize=(10, 6))
-
-# Time domain signal
-t = np.linspace(0, 2*np.pi, 1000)
-signal = np.sin(2*t) + 0.5*np.sin(5*t) + 0.3*np.sin(10*t)
-
-axes[0].plot(t, signal, 'b-', linewidth=2)
-axes[0].set_title('Time Domain: Complex Signal', fontsize=14, fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Time')
-axes[0].set_ylabel('Amplitude')
-axes[0].grid(True, alpha=0.3)
-
-# Frequency domain (simplified)
-frequencies = [1, 2, 5, 10]
-amplitudes = [0, 1, 0.5, 0.3]
-axes[1].stem(frequencies, amplitudes, basefmt=" ")
-axes[1].set_title('Frequency Domain: Component Frequencies', fontsize=14, fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Frequency (Hz)')
-axes[1].set_ylabel('Amplitude')
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-st.pyplot(fig)
+def draw_visual_introduction():
+    fig, axes = new_figure(2, 1, figsize=(10, 6))
+
+    # Time domain signal
+    t = np.linspace(0, 2*np.pi, 1000)
+    signal = np.sin(2*t) + 0.5*np.sin(5*t) + 0.3*np.sin(10*t)
+
+    axes[0].plot(t, signal, 'b-', linewidth=2)
+    axes[0].set_title('Time Domain: Complex Signal', fontsize=14, fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Time')
+    axes[0].set_ylabel('Amplitude')
+    axes[0].grid(True, alpha=0.3)
+
+    # Frequency domain (simplified)
+    frequencies = [1, 2, 5, 10]
+    amplitudes = [0, 1, 0.5, 0.3]
+    axes[1].stem(frequencies, amplitudes, basefmt=" ")
+    axes[1].set_title('Frequency Domain: Component Frequencies', fontsize=14, fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Frequency (Hz)')
+    axes[1].set_ylabel('Amplitude')
+    axes[1].grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+show_figure("01.visual_introduction", draw_visual_introduction)
 
 st.markdown("""
 <div class='info-box'>
@@ -1,6 +1,13 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+from fourier.cache import memoize
+from fourier.figures import new_figure
+from fourier.fragments import demo_fragment
+from fourier.inputs import InputBatch, batch_mode_selector
+from fourier.plotting import show_figure
+from fourier.spectrum import magnitude_spectrum, sample_spacing
+from fourier.windows import active_window
 
 st.title("🔢 Mathematical Foundation of Fourier Transform")
 st.markdown("---")
@@ -126,21 +133,24 @@ sine and cosine waves as rotating vectors in the complex plane.
 """)
 
 # Visualization of Euler's formula
-fig, ax = plt.subplots(figsize=(8, 8), subplot_kw={'projection': 'polar'})
+def draw_euler_formula():
+    fig, ax = new_figure(figsize=(8, 8), subplot_kw={'projection': 'polar'})
+
+    theta = np.linspace(0, 2*np.pi, 100)
+    r = np.ones_like(theta)
+    ax.plot(theta, r, 'b-', linewidth=2, label='Unit Circle')
+    ax.plot([0, np.pi/4], [0, 1], 'r-', linewidth=2, label='Complex Exponential')
+    ax.plot([0], [0], 'ro', markersize=10)
+    ax.plot([np.pi/4], [1], 'go', markersize=10)
 
-theta = np.linspace(0, 2*np.pi, 100)
-r = np.ones_like(theta)
-ax.plot(theta, r, 'b-', linewidth=2, label='Unit Circle')
-ax.plot([0, np.pi/4], [0, 1], 'r-', linewidth=2, label='Complex Exponential')
-ax.plot([0], [0], 'ro', markersize=10)
-ax.plot([np.pi/4], [1], 'go', markersize=10)
+    ax.set_title("Euler's Formula: $e^{i\\theta}$ (e^(iθ)) on Complex Plane", 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.legend()
+    ax.grid(True)
+    return fig
 
-ax.set_title("Euler's Formula: $e^{i\\theta}$ (e^(iθ)) on Complex Plane", 
-             fontsize=14, fontweight='bold', pad=20)
-ax.legend()
-ax.grid(True)
 
-st.pyplot(fig)
+show_figure("02.euler_formula", draw_euler_formula)
 
 st.header("5️⃣ Frequency Domain Interpretation")
 
@@ -173,39 +183,55 @@ st.header("7️⃣ Interactive Mathematical Visualization")
 # Interactive example
 st.subheader("Explore: Sum of Sinusoids")
 
-freq1 = st.slider("Frequency 1 (Hz)", 1, 10, 2)
-amp1 = st.slider("Amplitude 1", 0.0, 2.0, 1.0)
-freq2 = st.slider("Frequency 2 (Hz)", 1, 10, 5)
-amp2 = st.slider("Amplitude 2", 0.0, 2.0, 0.5)
-
-t = np.linspace(0, 2, 1000)
-signal = amp1 * np.sin(2 * np.pi * freq1 * t) + amp2 * np.sin(2 * np.pi * freq2 * t)
-
-fig, axes = plt.subplots(2, 1, figsize=(10, 8))
-
-axes[0].plot(t, signal, 'b-', linewidth=2)
-axes[0].set_title(f'Time Domain: $f(t) = {amp1}\\sin(2\\pi \\cdot {freq1}t) + {amp2}\\sin(2\\pi \\cdot {freq2}t)$', 
-                  fontsize=12, fontweight='bold')
-axes[0].set_xlabel('Time (s)')
-axes[0].set_ylabel('Amplitude')
-axes[0].grid(True, alpha=0.3)
-
-# Frequency domain
-freqs = np.fft.fftfreq(len(t), t[1] - t[0])
-fft_vals = np.fft.fft(signal)
-magnitude = np.abs(fft_vals)
-
-# Plot only positive frequencies
-positive_freq_idx = freqs >= 0
-axes[1].plot(freqs[positive_freq_idx], magnitude[positive_freq_idx], 'r-', linewidth=2)
-axes[1].set_title('Frequency Domain: Fourier Transform', fontsize=12, fontweight='bold')
-axes[1].set_xlabel('Frequency (Hz)')
-axes[1].set_ylabel('Magnitude')
-axes[1].grid(True, alpha=0.3)
-axes[1].set_xlim(0, 15)
-
-plt.tight_layout()
-st.pyplot(fig)
+@memoize("02.sum_of_sinusoids")
+def sum_of_sinusoids(freq1, amp1, freq2, amp2, window):
+    t = np.linspace(0, 2, 1000)
+    signal = amp1 * np.sin(2 * np.pi * freq1 * t) + amp2 * np.sin(2 * np.pi * freq2 * t)
+
+    # Frequency domain (non-negative frequencies only)
+    pos_freqs, pos_magnitude = magnitude_spectrum(signal, sample_spacing(t), window)
+    return t, signal, pos_freqs, pos_magnitude
+
+
+def draw_sum_of_sinusoids(t, signal, pos_freqs, pos_magnitude, amp1, freq1, amp2, freq2):
+    fig, axes = new_figure(2, 1, figsize=(10, 8))
+
+    axes[0].plot(t, signal, 'b-', linewidth=2)
+    axes[0].set_title(f'Time Domain: $f(t) = {amp1}\\sin(2\\pi \\cdot {freq1}t) + {amp2}\\sin(2\\pi \\cdot {freq2}t)$', 
+                      fontsize=12, fontweight='bold')
+    axes[0].set_xlabel('Time (s)')
+    axes[0].set_ylabel('Amplitude')
+    axes[0].grid(True, alpha=0.3)
+
+    axes[1].plot(pos_freqs, pos_magnitude, 'r-', linewidth=2)
+    axes[1].set_title('Frequency Domain: Fourier Transform', fontsize=12, fontweight='bold')
+    axes[1].set_xlabel('Frequency (Hz)')
+    axes[1].set_ylabel('Magnitude')
+    axes[1].grid(True, alpha=0.3)
+    axes[1].set_xlim(0, 15)
+
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("02.sum_of_sinusoids")
+def sum_of_sinusoids_demo():
+    mode = batch_mode_selector("02.sum_of_sinusoids")
+    with InputBatch("02.sum_of_sinusoids", mode) as batch:
+        freq1 = st.slider("Frequency 1 (Hz)", 1, 10, 2)
+        amp1 = st.slider("Amplitude 1", 0.0, 2.0, 1.0)
+        freq2 = st.slider("Frequency 2 (Hz)", 1, 10, 5)
+        amp2 = st.slider("Amplitude 2", 0.0, 2.0, 0.5)
+    batch.settle((freq1, amp1, freq2, amp2))
+
+    t, signal, pos_freqs, pos_magnitude = sum_of_sinusoids(
+        freq1, amp1, freq2, amp2, active_window())
+
+    show_figure("02.sum_of_sinusoids", draw_sum_of_sinusoids,
+                t, signal, pos_freqs, pos_magnitude, amp1, freq1, amp2, freq2)
+
+
+sum_of_sinusoids_demo()
 
 st.markdown("""
 <div class='info-box'>
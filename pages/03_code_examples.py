@@ -1,7 +1,16 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import signal
+
+from fourier.backends import active_backend
+from fourier.cache import memoize
+from fourier.figures import new_figure
+from fourier.fragments import demo_fragment
+from fourier.inputs import InputBatch, batch_mode_selector
+from fourier.plotting import encode_figure, show_figure
+from fourier.spectrum import band_filter, magnitude_spectrum, sample_spacing
+from fourier.stft import StreamingSTFT, draw_spectrogram, plot_spectrogram, stft, to_db
+from fourier.stft import throughput as stft_throughput
+from fourier.windows import active_window, window_label, window_names
 
 st.title("💻 Code Examples: Fourier Transform in Python")
 st.markdown("---")
@@ -60,41 +69,56 @@ st.code(code1, language='python')
 
 st.subheader("🎨 Interactive Demo")
 
-col1, col2 = st.columns(2)
-with col1:
-    freq1 = st.slider("Frequency 1 (Hz)", 1, 50, 5)
-    amp1 = st.slider("Amplitude 1", 0.0, 2.0, 1.0)
-with col2:
-    freq2 = st.slider("Frequency 2 (Hz)", 1, 50, 20)
-    amp2 = st.slider("Amplitude 2", 0.0, 2.0, 0.5)
+@memoize("03.basic_fft")
+def basic_fft(freq1, amp1, freq2, amp2, window):
+    # Generate signal
+    t = np.linspace(0, 1, 1000)
+    sig = amp1 * np.sin(2 * np.pi * freq1 * t) + amp2 * np.sin(2 * np.pi * freq2 * t)
 
-# Generate signal
-t = np.linspace(0, 1, 1000)
-sig = amp1 * np.sin(2 * np.pi * freq1 * t) + amp2 * np.sin(2 * np.pi * freq2 * t)
+    # Compute FFT (non-negative frequencies only)
+    pos_freqs, pos_magnitude = magnitude_spectrum(sig, sample_spacing(t), window)
+    return t, sig, pos_freqs, pos_magnitude
 
-# Compute FFT
-fft_vals = np.fft.fft(sig)
-freqs = np.fft.fftfreq(len(sig), t[1] - t[0])
-magnitude = np.abs(fft_vals)
 
 # Plot
-fig, axes = plt.subplots(2, 1, figsize=(10, 6))
-axes[0].plot(t, sig, 'b-', linewidth=2)
-axes[0].set_title('Time Domain Signal', fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Time (s)')
-axes[0].set_ylabel('Amplitude')
-axes[0].grid(True, alpha=0.3)
+def draw_basic_fft(t, sig, pos_freqs, pos_magnitude):
+    fig, axes = new_figure(2, 1, figsize=(10, 6))
+    axes[0].plot(t, sig, 'b-', linewidth=2)
+    axes[0].set_title('Time Domain Signal', fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Time (s)')
+    axes[0].set_ylabel('Amplitude')
+    axes[0].grid(True, alpha=0.3)
 
-pos_idx = freqs >= 0
-axes[1].plot(freqs[pos_idx], magnitude[pos_idx], 'r-', linewidth=2)
-axes[1].set_title('Frequency Domain (Fourier Transform)', fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Frequency (Hz)')
-axes[1].set_ylabel('Magnitude')
-axes[1].grid(True, alpha=0.3)
-axes[1].set_xlim(0, 60)
+    axes[1].plot(pos_freqs, pos_magnitude, 'r-', linewidth=2)
+    axes[1].set_title('Frequency Domain (Fourier Transform)', fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Frequency (Hz)')
+    axes[1].set_ylabel('Magnitude')
+    axes[1].grid(True, alpha=0.3)
+    axes[1].set_xlim(0, 60)
 
-plt.tight_layout()
-st.pyplot(fig)
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("03.basic_fft")
+def basic_fft_demo():
+    mode = batch_mode_selector("03.basic_fft")
+    with InputBatch("03.basic_fft", mode) as batch:
+        col1, col2 = st.columns(2)
+        with col1:
+            freq1 = st.slider("Frequency 1 (Hz)", 1, 50, 5)
+            amp1 = st.slider("Amplitude 1", 0.0, 2.0, 1.0)
+        with col2:
+            freq2 = st.slider("Frequency 2 (Hz)", 1, 50, 20)
+            amp2 = st.slider("Amplitude 2", 0.0, 2.0, 0.5)
+    batch.settle((freq1, amp1, freq2, amp2))
+
+    t, sig, pos_freqs, pos_magnitude = basic_fft(freq1, amp1, freq2, amp2, active_window())
+
+    show_figure("03.basic_fft", draw_basic_fft, t, sig, pos_freqs, pos_magnitude)
+
+
+basic_fft_demo()
 
 st.markdown("---")
 
@@ -153,50 +177,67 @@ st.code(code2, language='python')
 
 st.subheader("🎨 Interactive Demo")
 
-cutoff_freq = st.slider("Low-pass Filter Cutoff (Hz)", 5, 50, 20)
-noise_level = st.slider("Noise Level", 0.0, 1.0, 0.5)
+@memoize("03.lowpass_filter")
+def lowpass_filter(cutoff_freq, noise_level):
+    # Generate signal
+    t = np.linspace(0, 1, 1000)
+    signal_clean = np.sin(2 * np.pi * 10 * t)
+    rng = np.random.RandomState(42)
+    noise = noise_level * rng.randn(len(t))
+    signal_noisy = signal_clean + noise
 
-# Generate signal
-t = np.linspace(0, 1, 1000)
-signal_clean = np.sin(2 * np.pi * 10 * t)
-np.random.seed(42)
-noise = noise_level * np.random.randn(len(t))
-signal_noisy = signal_clean + noise
+    # FFT, low-pass filter and inverse FFT
+    pos_freqs, fft_noisy, _, signal_filtered = band_filter(
+        signal_noisy, sample_spacing(t), lambda freqs: freqs <= cutoff_freq)
 
-# FFT
-fft_noisy = np.fft.fft(signal_noisy)
-freqs = np.fft.fftfreq(len(signal_noisy), t[1] - t[0])
+    return (t, signal_clean, signal_noisy, signal_filtered,
+            pos_freqs, np.abs(fft_noisy))
 
-# Filter
-fft_filtered = fft_noisy.copy()
-fft_filtered[np.abs(freqs) > cutoff_freq] = 0
-signal_filtered = np.real(np.fft.ifft(fft_filtered))
 
 # Plot
-fig, axes = plt.subplots(3, 1, figsize=(10, 9))
-axes[0].plot(t, signal_noisy, 'b-', alpha=0.7, label='Noisy Signal', linewidth=1)
-axes[0].plot(t, signal_clean, 'r--', label='Original Clean Signal', linewidth=2)
-axes[0].set_title('Noisy Signal', fontweight='bold', color='#667eea')
-axes[0].legend()
-axes[0].grid(True, alpha=0.3)
-
-pos_idx = freqs >= 0
-axes[1].plot(freqs[pos_idx], np.abs(fft_noisy[pos_idx]), 'b-', linewidth=2)
-axes[1].axvline(cutoff_freq, color='r', linestyle='--', linewidth=2, 
-                label=f'Cutoff: {cutoff_freq} Hz')
-axes[1].set_title('Frequency Domain', fontweight='bold', color='#764ba2')
-axes[1].set_xlim(0, 50)
-axes[1].legend()
-axes[1].grid(True, alpha=0.3)
-
-axes[2].plot(t, signal_filtered, 'g-', linewidth=2, label='Filtered Signal')
-axes[2].plot(t, signal_clean, 'r--', linewidth=2, label='Original Clean Signal')
-axes[2].set_title('Filtered Signal (Low-pass)', fontweight='bold', color='#667eea')
-axes[2].legend()
-axes[2].grid(True, alpha=0.3)
-
-plt.tight_layout()
-st.pyplot(fig)
+def draw_lowpass_filter(t, signal_clean, signal_noisy, signal_filtered,
+                        pos_freqs, pos_magnitude, cutoff_freq):
+    fig, axes = new_figure(3, 1, figsize=(10, 9))
+    axes[0].plot(t, signal_noisy, 'b-', alpha=0.7, label='Noisy Signal', linewidth=1)
+    axes[0].plot(t, signal_clean, 'r--', label='Original Clean Signal', linewidth=2)
+    axes[0].set_title('Noisy Signal', fontweight='bold', color='#667eea')
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+
+    axes[1].plot(pos_freqs, pos_magnitude, 'b-', linewidth=2)
+    axes[1].axvline(cutoff_freq, color='r', linestyle='--', linewidth=2, 
+                    label=f'Cutoff: {cutoff_freq} Hz')
+    axes[1].set_title('Frequency Domain', fontweight='bold', color='#764ba2')
+    axes[1].set_xlim(0, 50)
+    axes[1].legend()
+    axes[1].grid(True, alpha=0.3)
+
+    axes[2].plot(t, signal_filtered, 'g-', linewidth=2, label='Filtered Signal')
+    axes[2].plot(t, signal_clean, 'r--', linewidth=2, label='Original Clean Signal')
+    axes[2].set_title('Filtered Signal (Low-pass)', fontweight='bold', color='#667eea')
+    axes[2].legend()
+    axes[2].grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("03.lowpass_filter")
+def lowpass_filter_demo():
+    mode = batch_mode_selector("03.lowpass_filter")
+    with InputBatch("03.lowpass_filter", mode) as batch:
+        cutoff_freq = st.slider("Low-pass Filter Cutoff (Hz)", 5, 50, 20)
+        noise_level = st.slider("Noise Level", 0.0, 1.0, 0.5)
+    batch.settle((cutoff_freq, noise_level))
+
+    (t, signal_clean, signal_noisy, signal_filtered,
+     pos_freqs, pos_magnitude) = lowpass_filter(cutoff_freq, noise_level)
+
+    show_figure("03.lowpass_filter", draw_lowpass_filter, t, signal_clean, signal_noisy,
+                signal_filtered, pos_freqs, pos_magnitude, cutoff_freq)
+
+
+lowpass_filter_demo()
 
 st.markdown("---")
 
@@ -207,20 +248,28 @@ st.subheader("📝 Code")
 code3 = """
 import numpy as np
 import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
 
 # Create a complex signal: chirp (frequency increases over time)
 t = np.linspace(0, 2, 2000)
+fs = 1 / (t[1] - t[0])
 f0, f1 = 5, 50  # Start and end frequencies
 chirp_signal = np.sin(2 * np.pi * (f0 + (f1 - f0) * t / 2) * t)
 
 # Add some harmonics
 signal = chirp_signal + 0.3 * np.sin(2 * np.pi * 30 * t)
 
-# Compute FFT
-fft_vals = np.fft.fft(signal)
-frequencies = np.fft.fftfreq(len(signal), t[1] - t[0])
-magnitude = np.abs(fft_vals)
-phase = np.angle(fft_vals)
+# One FFT of the whole signal: which frequencies, but not when
+frequencies = np.fft.rfftfreq(len(signal), 1 / fs)
+magnitude = np.abs(np.fft.rfft(signal))
+
+# Short-time Fourier transform: window overlapping frames, FFT them all at once
+nperseg, hop, nfft = 256, 32, 512
+frames = sliding_window_view(signal, nperseg)[::hop]
+S = np.fft.rfft(frames * np.hanning(nperseg), n=nfft, axis=-1)
+S_db = 20 * np.log10(np.abs(S) / np.abs(S).max() + 1e-12)
+frame_times = (np.arange(len(frames)) * hop + nperseg / 2) / fs
+frame_freqs = np.fft.rfftfreq(nfft, 1 / fs)
 
 # Plot
 fig, axes = plt.subplots(3, 1, figsize=(10, 10))
@@ -232,20 +281,19 @@ axes[0].set_xlabel('Time (s)')
 axes[0].set_ylabel('Amplitude')
 axes[0].grid(True)
 
-# Magnitude spectrum
-positive_idx = frequencies >= 0
-axes[1].plot(frequencies[positive_idx], magnitude[positive_idx])
+# Magnitude spectrum of the whole signal
+axes[1].plot(frequencies, magnitude)
 axes[1].set_title('Magnitude Spectrum')
 axes[1].set_xlabel('Frequency (Hz)')
 axes[1].set_ylabel('Magnitude')
 axes[1].grid(True)
 
-# Phase spectrum
-axes[2].plot(frequencies[positive_idx], phase[positive_idx])
-axes[2].set_title('Phase Spectrum')
-axes[2].set_xlabel('Frequency (Hz)')
-axes[2].set_ylabel('Phase (radians)')
-axes[2].grid(True)
+# Spectrogram: frequency content over time
+axes[2].pcolormesh(frame_times, frame_freqs, S_db.T, vmin=-80, shading='nearest')
+axes[2].set_title('Spectrogram (STFT)')
+axes[2].set_xlabel('Time (s)')
+axes[2].set_ylabel('Frequency (Hz)')
+axes[2].set_ylim(0, 100)
 
 plt.tight_layout()
 plt.show()
@@ -255,45 +303,127 @@ st.code(code3, language='python')
 
 st.subheader("🎨 Interactive Demo")
 
-chirp_f0 = st.slider("Chirp Start Frequency (Hz)", 1, 20, 5)
-chirp_f1 = st.slider("Chirp End Frequency (Hz)", 30, 100, 50)
+st.markdown("""
+The spectrum of the whole chirp spreads its energy across every frequency it sweeps 
+through. The spectrogram below is computed by a streaming STFT engine: samples are pushed 
+in as they arrive, every complete frame is windowed and all of them are transformed 
+together in one batched FFT. The window length sets the trade-off between time and 
+frequency resolution; the hop sets how many frames there are.
+""")
 
-# Generate chirp
-t = np.linspace(0, 2, 2000)
-chirp = np.sin(2 * np.pi * (chirp_f0 + (chirp_f1 - chirp_f0) * t / 2) * t)
-sig = chirp + 0.3 * np.sin(2 * np.pi * 30 * t)
+CHIRP_STREAM_CHUNK = 100  # samples per push when timing the streaming engine
 
-# FFT
-fft_vals = np.fft.fft(sig)
-freqs = np.fft.fftfreq(len(sig), t[1] - t[0])
-magnitude = np.abs(fft_vals)
-phase = np.angle(fft_vals)
 
-# Plot
-fig, axes = plt.subplots(3, 1, figsize=(10, 10))
-axes[0].plot(t, sig, 'b-', linewidth=1.5)
-axes[0].set_title('Time Domain: Chirp Signal', fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Time (s)')
-axes[0].set_ylabel('Amplitude')
-axes[0].grid(True, alpha=0.3)
+def chirp_signal(chirp_f0, chirp_f1):
+    t = np.linspace(0, 2, 2000)
+    chirp = np.sin(2 * np.pi * (chirp_f0 + (chirp_f1 - chirp_f0) * t / 2) * t)
+    return t, chirp + 0.3 * np.sin(2 * np.pi * 30 * t)
 
-pos_idx = freqs >= 0
-axes[1].plot(freqs[pos_idx], magnitude[pos_idx], 'r-', linewidth=2)
-axes[1].set_title('Magnitude Spectrum', fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Frequency (Hz)')
-axes[1].set_ylabel('Magnitude')
-axes[1].grid(True, alpha=0.3)
-axes[1].set_xlim(0, 100)
 
-axes[2].plot(freqs[pos_idx], phase[pos_idx], 'g-', linewidth=1.5)
-axes[2].set_title('Phase Spectrum', fontweight='bold', color='#667eea')
-axes[2].set_xlabel('Frequency (Hz)')
-axes[2].set_ylabel('Phase (radians)')
-axes[2].grid(True, alpha=0.3)
-axes[2].set_xlim(0, 100)
+@memoize("03.chirp_spectrum")
+def chirp_spectrum(chirp_f0, chirp_f1, window, nperseg, hop, nfft):
+    t, sig = chirp_signal(chirp_f0, chirp_f1)
 
-plt.tight_layout()
-st.pyplot(fig)
+    # Whole-signal spectrum (non-negative frequencies only) and the STFT
+    pos_freqs, pos_magnitude = magnitude_spectrum(sig, sample_spacing(t), window)
+    times, freqs, S = stft(sig, 1 / sample_spacing(t), nperseg, hop, nfft, window)
+    return t, sig, pos_freqs, pos_magnitude, times, freqs, to_db(S)
+
+
+@memoize("03.chirp_stft_rate")
+def chirp_stft_rate(chirp_f0, chirp_f1, window, nperseg, hop, nfft, backend_name):
+    t, sig = chirp_signal(chirp_f0, chirp_f1)
+    fs = 1 / sample_spacing(t)
+    return (stft_throughput(sig, fs, nperseg, hop, nfft, window, chunk=CHIRP_STREAM_CHUNK),
+            stft_throughput(sig, fs, nperseg, hop, nfft, window))
+
+
+# Plot
+def draw_chirp_spectrum(t, sig, pos_freqs, pos_magnitude, times, freqs, S_db):
+    fig, axes = new_figure(3, 1, figsize=(10, 10))
+    axes[0].plot(t, sig, 'b-', linewidth=1.5)
+    axes[0].set_title('Time Domain: Chirp Signal', fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Time (s)')
+    axes[0].set_ylabel('Amplitude')
+    axes[0].grid(True, alpha=0.3)
+
+    axes[1].plot(pos_freqs, pos_magnitude, 'r-', linewidth=2)
+    axes[1].set_title('Magnitude Spectrum (whole signal)', fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Frequency (Hz)')
+    axes[1].set_ylabel('Magnitude')
+    axes[1].grid(True, alpha=0.3)
+    axes[1].set_xlim(0, 100)
+
+    image = plot_spectrogram(axes[2], times, freqs, S_db, duration=t[-1], fmax=100)
+    if image is not None:
+        fig.colorbar(image, ax=axes[2], label='dB', orientation='horizontal',
+                     fraction=0.05, pad=0.25)
+    axes[2].set_title('Spectrogram (STFT)', fontweight='bold', color='#667eea')
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_chirp_stream(times, freqs, S_db, duration):
+    return draw_spectrogram(times, freqs, S_db, duration=duration, fmax=100,
+                            title=f"Live spectrogram: {times[-1] if len(times) else 0:.2f} s received")
+
+
+@demo_fragment("03.chirp_spectrum")
+def chirp_spectrum_demo():
+    mode = batch_mode_selector("03.chirp_spectrum")
+    with InputBatch("03.chirp_spectrum", mode) as batch:
+        chirp_f0 = st.slider("Chirp Start Frequency (Hz)", 1, 20, 5)
+        chirp_f1 = st.slider("Chirp End Frequency (Hz)", 30, 100, 50)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            names = window_names()
+            window = st.selectbox("Window", names, index=names.index(active_window()),
+                                  format_func=window_label)
+        with col2:
+            nperseg = st.select_slider("Window length", [32, 64, 128, 256, 512], value=256)
+        with col3:
+            overlap = st.select_slider("Overlap", [0, 50, 75, 87.5], value=87.5,
+                                       format_func=lambda p: f"{p:g}%")
+        with col4:
+            zero_pad = st.selectbox("FFT size", [1, 2, 4], index=1,
+                                    format_func=lambda k: f"{k}× window")
+    batch.settle((chirp_f0, chirp_f1, window, nperseg, overlap, zero_pad))
+
+    hop = max(1, round(nperseg * (1 - overlap / 100)))
+    nfft = nperseg * zero_pad
+    t, sig, pos_freqs, pos_magnitude, times, freqs, S_db = chirp_spectrum(
+        chirp_f0, chirp_f1, window, nperseg, hop, nfft)
+
+    show_figure("03.chirp_spectrum", draw_chirp_spectrum,
+                t, sig, pos_freqs, pos_magnitude, times, freqs, S_db)
+
+    streamed, batched = chirp_stft_rate(chirp_f0, chirp_f1, window, nperseg, hop, nfft,
+                                        active_backend().name)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Frames", f"{streamed['frames']}",
+                  help=f"hop {hop} samples, {nfft // 2 + 1} frequency bins per frame")
+    with col2:
+        st.metric("Streaming throughput", f"{streamed['frames_s']:,.0f} frames/s",
+                  help=f"Samples pushed {CHIRP_STREAM_CHUNK} at a time")
+    with col3:
+        st.metric("Whole-signal throughput", f"{batched['frames_s']:,.0f} frames/s",
+                  help="All samples pushed at once: one batched FFT")
+
+    if st.button("▶ Replay as a live stream"):
+        # Feed the chirp in chunks and redraw as frames complete; every frame
+        # is different, so they are encoded directly instead of filling the figure cache
+        engine = StreamingSTFT(1 / sample_spacing(t), nperseg, hop, nfft, window)
+        placeholder = st.empty()
+        for start in range(0, len(sig), 250):
+            engine.push(sig[start:start + 250])
+            times_so_far, freqs, S = engine.spectrogram()
+            placeholder.image(encode_figure(
+                draw_chirp_stream(times_so_far, freqs, to_db(S), float(t[-1]))))
+
+
+chirp_spectrum_demo()
 
 st.markdown("---")
 
@@ -304,6 +434,7 @@ st.markdown("""
   - `np.fft.fft()`: Forward FFT
   - `np.fft.ifft()`: Inverse FFT
   - `np.fft.fftfreq()`: Frequency bins
+  - `np.fft.rfft()` / `np.fft.rfftfreq()`: Real-input FFT, non-negative frequencies only
   
 - **scipy.fft**: Enhanced FFT functions with more options
 
@@ -1,8 +1,30 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import os
 import time
 
+from fourier.backends import active_backend, backend_names, draw_benchmark
+from fourier.backends import benchmark as backend_benchmark
+from fourier.cache import compute_cache, memoize
+from fourier.dft import DFT_METHODS
+from fourier.fft_engine import advise_padding, explain
+from fourier.fft_engine import fft as engine_fft
+from fourier.fft_variants import benchmark as variant_benchmark
+from fourier.figures import new_figure
+from fourier.fragments import demo_fragment
+from fourier.jobs import DONE, FAILED, session_job, show_job
+from fourier.large_fft import MAX_LOG2_N, MIN_LOG2_N, estimate_bytes, memory_budget
+from fourier.large_fft import run as run_large_fft
+from fourier.plotting import encode_figure, show_figure
+from fourier.pyramid import SpectrumPyramid
+from fourier.scaling import DEFAULT_DFT_MAX_N, collect, draw_scaling, run_suite
+from fourier.sliding_dft import SlidingDFT, recompute_rate
+from fourier.spectrum import (band_spectrum, magnitude_spectrum, one_sided_spectrum, sample_spacing,
+                              tone_spectrum)
+from fourier.timing import measure, test_signal
+from fourier.windows import active_window
+from fourier.zoom_fft import padded_fft_band, zoom_fft
+
 st.title("⚡ Fast Fourier Transform (FFT)")
 st.markdown("---")
 
@@ -75,6 +97,86 @@ Where:
 This recursive decomposition continues until we reach base cases of size 1 or 2.
 """)
 
+st.subheader("Cooley-Tukey in Action")
+
+st.markdown("""
+The same idea, run for real. Each variant below is written in NumPy with every stage (or 
+recursion level) vectorized, so the comparison shows the algorithms rather than Python 
+loop overhead:
+
+- **Recursive radix-2**: the $E[k] + W^k O[k]$ split above, level by level
+- **Iterative radix-2**: bit-reversal permutation, then $\\log_2 N$ in-place butterfly passes
+- **Radix-4**: four interleaved sub-transforms per level, half as many stages
+- **Split-radix**: one $N/2$ and two $N/4$ sub-transforms, the fewest operations
+- **Two real signals, one FFT**: transform $x + iy$ once and separate the spectra by symmetry
+
+The operation counts tally complex multiplications by non-trivial twiddle factors 
+(6 real flops each) and complex additions (2 flops each).
+""")
+
+
+def render_variant_rows(rows):
+    st.table([{"Variant": row["variant"],
+               "Median (ms)": f"{row['median_ms']:.4f}",
+               "Time vs. np.fft.fft": f"{row['vs_numpy']:.1f}x",
+               "Real flops": "-" if row["real_flops"] is None else f"{row['real_flops']:,}",
+               "Flops / (N log₂ N)": "-" if row["flops_per_nlogn"] is None else f"{row['flops_per_nlogn']:.2f}",
+               "Stages": "-" if row["stages"] is None else str(row["stages"]),
+               "Max error": f"{row['max_error']:.1e}"} for row in rows])
+    st.caption("The two-real row is compared with two separate np.fft.fft calls, and its flops "
+               "are per signal. np.fft.fft uses optimized C (pocketfft) with larger radices, "
+               "which is why even the best NumPy-level variant stays a few times slower.")
+
+
+def render_fft_variants(job):
+    if not job.done:
+        st.progress(job.progress, text=job.message or "Waiting for a worker...")
+        if st.button("Cancel variant benchmark"):
+            job.cancel()
+        return
+    if job.status == FAILED:
+        st.error(f"Variant benchmark failed: {job.error}")
+        return
+    if job.status != DONE:
+        st.warning(f"Variant benchmark {job.status} after {job.elapsed_s:.1f} s.")
+        return
+    render_variant_rows(job.result)
+
+
+@demo_fragment("04.fft_variants")
+def fft_variants_demo():
+    variant_n = st.select_slider(
+        "Transform length",
+        options=[1 << k for k in range(6, 19)],
+        value=4096,
+        format_func=lambda n: f"{n:,}"
+    )
+    # Finished rows are shared by every session; they depend on N only, since the
+    # variants and the np.fft.fft reference are NumPy code whatever the backend
+    cache_key = ("04.fft_variants", variant_n)
+    rows = compute_cache.get(cache_key)
+    if rows is not None:
+        render_variant_rows(rows)
+        return
+
+    if st.button("Time the variants"):
+        st.session_state["04.variant_n"] = variant_n
+    if st.session_state.get("04.variant_n") != variant_n:
+        st.info("Timing every variant takes a few seconds at the larger sizes; "
+                "press the button to run it for this length.")
+        return
+
+    variant_job = session_job(
+        "04.fft_variants", (variant_n,), __file__,
+        lambda job: compute_cache.put(cache_key, variant_benchmark(variant_n, progress=job.report)))
+    if variant_job is None:
+        st.warning("The benchmark workers are busy right now; please try again in a moment.")
+    else:
+        show_job(variant_job, render_fft_variants)
+
+
+fft_variants_demo()
+
 st.header("⚡ Performance Comparison")
 
 st.subheader("Speed Comparison: Naive DFT vs FFT")
@@ -85,57 +187,293 @@ n_values = st.select_slider(
     value=1024
 )
 
-# Naive DFT implementation (simplified for demo)
-def naive_dft(x):
-    N = len(x)
-    X = np.zeros(N, dtype=complex)
-    for k in range(N):
-        for n in range(N):
-            X[k] += x[n] * np.exp(-2j * np.pi * k * n / N)
-    return X
-
-# Generate test signal
-test_signal = np.random.randn(n_values)
-
-# Time FFT
-start_fft = time.time()
-fft_result = np.fft.fft(test_signal)
-time_fft = time.time() - start_fft
-
-# Time naive DFT (only for small N to avoid long waits)
-if n_values <= 256:
-    start_naive = time.time()
-    naive_result = naive_dft(test_signal)
-    time_naive = time.time() - start_naive
-    speedup = time_naive / time_fft if time_fft > 0 else 0
+dft_methods = st.multiselect(
+    "Direct DFT implementations",
+    list(DFT_METHODS),
+    default=list(DFT_METHODS)
+)
+
+# Seeded test signal: every rerun times the same input
+signal_in = test_signal(n_values)
+
+# Time FFT (warm-up, adaptive repeats, median of samples) with the selected backend
+fft = active_backend().fft
+fft_timing = measure(fft, signal_in)
+fft_result = fft(signal_in)
+time_fft = fft_timing.median_s
+
+# Time each direct DFT in a background job (each has a size cap to avoid long waits)
+def run_dft_benchmark(job, signal_in, dft_methods, fft_result, time_fft):
+    dft_rows = []
+    for i, name in enumerate(dft_methods):
+        dft, max_n = DFT_METHODS[name]
+        if len(signal_in) > max_n:
+            dft_rows.append({"Implementation": name, "Median (ms)": "Too slow!", "IQR (ms)": "-",
+                             "Samples": "-", "Slower than FFT": "N/A", "Matches FFT": "-"})
+            job.partial = list(dft_rows)
+            continue
+
+        def progress(fraction, i=i, name=name):
+            job.report((i + fraction) / len(dft_methods), f"{name}: {fraction:.0%}")
+
+        last = {}
+
+        def run_dft(dft=dft, progress=progress):
+            last["result"] = dft(signal_in, progress=progress)
+
+        dft_timing = measure(run_dft, budget_s=0.5, max_total_s=3.0)
+        time_dft = dft_timing.median_s
+        dft_rows.append({"Implementation": name,
+                         "Median (ms)": f"{dft_timing.median_ms:.3f}",
+                         "IQR (ms)": f"{dft_timing.iqr_ms:.3f}",
+                         "Samples": str(len(dft_timing.samples_ns)),
+                         "Slower than FFT": f"{time_dft / time_fft:.1f}x",
+                         "Matches FFT": "✅" if np.allclose(last["result"], fft_result) else "❌",
+                         "_seconds": time_dft})
+        job.partial = list(dft_rows)
+    return dft_rows
+
+
+def render_dft_benchmark(job):
+    if not job.done:
+        st.progress(job.progress, text=job.message or "Waiting for a worker...")
+        if st.button("Cancel benchmark"):
+            job.cancel()
+    elif job.status == FAILED:
+        st.error(f"Benchmark failed: {job.error}")
+    elif job.status != DONE:
+        st.warning(f"Benchmark {job.status} after {job.elapsed_s:.1f} s; showing completed rows.")
+
+    dft_rows = job.result if job.status == DONE else job.partial
+    timed = [row for row in dft_rows if "_seconds" in row]
+    time_naive = min(row["_seconds"] for row in timed) if timed else None
+    speedup = time_naive / time_fft if time_naive is not None and time_fft > 0 else None
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("FFT Time (median)", f"{time_fft*1000:.4f} ms",
+                  help=f"IQR {fft_timing.iqr_ms:.4f} ms over {len(fft_timing.samples_ns)} samples "
+                       f"of {fft_timing.loops} calls")
+
+    with col2:
+        if time_naive is not None:
+            st.metric("Fastest Direct DFT (median)", f"{time_naive*1000:.3f} ms")
+        else:
+            st.metric("Fastest Direct DFT", "Too slow!")
+
+    with col3:
+        if speedup is not None:
+            st.metric("Speedup", f"{speedup:.1f}x")
+        else:
+            st.metric("Speedup", "N/A")
+
+    if dft_rows:
+        st.table([{k: v for k, v in row.items() if k != "_seconds"} for row in dft_rows])
+
+
+# Changing N or the implementations cancels the running job and starts a new one
+dft_job = session_job(
+    "04.dft_benchmark", (n_values, tuple(dft_methods)), __file__,
+    lambda job: run_dft_benchmark(job, signal_in, dft_methods, fft_result, time_fft))
+
+if dft_job is None:
+    st.warning("The benchmark workers are busy right now; please try again in a moment.")
 else:
-    time_naive = None
-    speedup = None
+    show_job(dft_job, render_dft_benchmark)
 
-col1, col2, col3 = st.columns(3)
+st.markdown("""
+<div class='info-box'>
+    <h4>💡 Note</h4>
+    <p>The Python loop mostly measures interpreter overhead. The vectorized and blocked 
+    direct DFTs remove that overhead, so their gap to the FFT is the genuine 
+    O(N²) vs O(N log N) difference, and it keeps growing with N.</p>
+</div>
+""", unsafe_allow_html=True)
 
-with col1:
-    st.metric("FFT Time", f"{time_fft*1000:.3f} ms")
+st.subheader("Empirical Scaling Across N")
 
-with col2:
-    if time_naive is not None:
-        st.metric("Naive DFT Time", f"{time_naive*1000:.3f} ms")
+st.markdown("""
+A single N cannot show a growth rate. The scaling suite times the FFT over powers of two, 
+primes and highly composite sizes (up to millions of samples) and the direct DFT over the 
+smaller sizes, then fits the slope of each series on a log-log plot: close to 1 means 
+O(N log N), close to 2 means O(N²). Results are stored per machine and reused, so only 
+new sizes are measured. The same suite runs headless with `python -m fourier.scaling`.
+""")
+
+scaling_max_n = st.select_slider(
+    "Largest N in the sweep",
+    options=[1 << 16, 1 << 18, 1 << 20, 1 << 22],
+    value=1 << 20,
+    format_func=lambda n: f"{n:,}"
+)
+
+if st.button("Run scaling suite"):
+    st.session_state["04.scaling_max_n"] = scaling_max_n
+
+scaling_requested = st.session_state.get("04.scaling_max_n")
+
+
+def render_scaling(job=None):
+    if job is not None and not job.done:
+        st.progress(job.progress, text=job.message or "Waiting for a worker...")
+        if st.button("Cancel scaling suite"):
+            job.cancel()
+    elif job is not None and job.status == FAILED:
+        st.error(f"Scaling suite failed: {job.error}")
+    elif job is not None and job.status != DONE:
+        st.warning(f"Scaling suite {job.status}; showing the sizes measured so far.")
+
+    # The range being measured, not the slider, which may have moved since
+    scaling = collect(scaling_requested or scaling_max_n, DEFAULT_DFT_MAX_N)
+    if not scaling["points"]:
+        st.info("No measurements stored for this machine yet; run the suite to collect them.")
+        return
+    show_figure("04.scaling", draw_scaling, scaling["points"], scaling["fits"])
+    if scaling["fits"]:
+        st.table([{"Method": fit["method"], "Sizes": fit["family"],
+                   "Fitted exponent": f"{fit['exponent']:.2f}",
+                   "Constant (ns)": f"{fit['constant_ns']:.3g}",
+                   "Points": str(fit["points"])} for fit in scaling["fits"]])
+
+
+if scaling_requested is None:
+    render_scaling()
+else:
+    scaling_job = session_job(
+        "04.scaling", (scaling_requested,), __file__,
+        lambda job: run_suite(scaling_requested, progress=job.report), budget_s=300)
+    if scaling_job is None:
+        st.warning("The benchmark workers are busy right now; please try again in a moment.")
     else:
-        st.metric("Naive DFT Time", "Too slow!")
+        show_job(scaling_job, render_scaling)
 
-with col3:
-    if speedup is not None:
-        st.metric("Speedup", f"{speedup:.1f}x")
+st.subheader("FFT Backends Side by Side")
+
+st.markdown(f"""
+Every page transforms through the FFT backend chosen in the sidebar (currently 
+**{active_backend().label}**). This benchmark times 1D, 2D and batched complex transforms 
+with each installed backend and reports throughput in GFLOP/s, using the conventional 
+5 N log₂ N operation count. Installed backends: {", ".join(f"`{name}`" for name in backend_names())}.
+""")
+
+
+def render_backend_benchmark(job):
+    if not job.done:
+        st.progress(job.progress, text=job.message or "Waiting for a worker...")
+        if st.button("Cancel backend benchmark"):
+            job.cancel()
+    elif job.status == FAILED:
+        st.error(f"Backend benchmark failed: {job.error}")
+    elif job.status != DONE:
+        st.warning(f"Backend benchmark {job.status} after {job.elapsed_s:.1f} s.")
+    else:
+        show_figure("04.backend_benchmark", draw_benchmark, job.result)
+        st.table([{"Backend": row["backend"], "Workers": str(row["workers"]),
+                   "Transform": row["transform"], "Shape": row["shape"],
+                   "Median (ms)": f"{row['median_ms']:.3f}",
+                   "Msamples/s": f"{row['msamples_s']:.1f}",
+                   "GFLOP/s": f"{row['gflops']:.2f}"} for row in job.result])
+
+
+# Each click is a new run; the count is part of the job key
+if st.button("Compare FFT backends"):
+    st.session_state["04.backend_runs"] = st.session_state.get("04.backend_runs", 0) + 1
+
+backend_runs = st.session_state.get("04.backend_runs", 0)
+if backend_runs:
+    backend_job = session_job("04.backend_benchmark", (backend_runs, backend_names()), __file__,
+                              lambda job: backend_benchmark(progress=job.report))
+    if backend_job is None:
+        st.warning("The benchmark workers are busy right now; please try again in a moment.")
     else:
-        st.metric("Speedup", "N/A")
+        show_job(backend_job, render_backend_benchmark)
+
+st.subheader("🚀 Large-N Mode")
 
 st.markdown("""
-<div class='info-box'>
-    <h4>💡 Note</h4>
-    <p>For larger values of N, the naive DFT becomes prohibitively slow. The FFT maintains 
-    excellent performance even for millions of samples!</p>
-</div>
-""", unsafe_allow_html=True)
+Real workloads transform millions of samples. Large-N mode runs one transform of up to 
+2²⁶ (67 million) samples as a *four-step FFT*: the signal is viewed as a matrix, and its 
+column FFTs, twiddle multiplication and row FFTs are spread over several threads. 
+`float32` input halves the memory and uses `complex64` throughout. The run is refused 
+if its estimated memory exceeds the server's budget, and only one large transform runs 
+at a time. The four-step path does more passes over memory than a single optimized call, 
+so it only pays off for large N on several cores: below 2²⁰ samples one call is faster, 
+so smaller sizes are not offered. The comparison below shows the net effect here. 
+Signals too large for memory can be transformed from disk with the six-step variant, which 
+adds transposes so every pass reads and writes the files sequentially 
+(`python -m fourier.out_of_core`).
+""")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    large_log2_n = st.select_slider(
+        "Samples",
+        options=list(range(MIN_LOG2_N, MAX_LOG2_N + 1)),
+        value=22,
+        format_func=lambda k: f"2^{k} = {1 << k:,}"
+    )
+with col2:
+    large_dtype = st.radio("Precision", ["float64", "float32"], horizontal=True)
+with col3:
+    cpus = os.cpu_count() or 1
+    large_workers = int(st.number_input("Threads", min_value=1, max_value=cpus, value=cpus))
+
+large_n = 1 << large_log2_n
+large_bytes = estimate_bytes(large_n, np.dtype(large_dtype))
+st.caption(f"Estimated peak memory: {large_bytes / 2**20:,.0f} MB "
+           f"(budget {memory_budget() / 2**20:,.0f} MB)")
+
+
+def render_large_fft(job):
+    if not job.done:
+        st.progress(job.progress, text=job.message or "Waiting for a worker...")
+        if st.button("Cancel large transform"):
+            job.cancel()
+        return
+    if job.status == FAILED:
+        st.error(f"Large transform failed: {job.error}")
+        return
+    if job.status != DONE:
+        st.warning(f"Large transform {job.status} after {job.elapsed_s:.1f} s.")
+        return
+
+    result = job.result
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Four-step FFT (median)", f"{result['median_ms']:.1f} ms",
+                  help=f"IQR {result['iqr_ms']:.1f} ms over {result['samples']} runs")
+    with col2:
+        st.metric("Throughput", f"{result['msamples_s']:.1f} Msamples/s")
+    with col3:
+        st.metric("GFLOP/s (5 N log₂ N)", f"{result['gflops']:.2f}")
+    with col4:
+        if "speedup" in result:
+            st.metric("vs. single-threaded call", f"{result['speedup']:.2f}x",
+                      help=f"scipy.fft.fft in one call: {result['single_ms']:.1f} ms")
+    st.caption(f"N = {result['n']:,} {result['dtype']} samples on {result['workers']} thread(s); "
+               f"largest relative error on 8 checked bins: {result['max_rel_error']:.1e}")
+    if result.get("speedup", 1.0) < 1.0:
+        st.info(f"Here the single call was faster: with {result['workers']} thread(s), the extra "
+                "passes over memory cost more than threading gains. Try more threads or a larger N.")
+
+
+# Runs only start on a click, with the settings at that moment
+if st.button("Run large transform", disabled=large_bytes > memory_budget()):
+    runs = st.session_state.get("04.large_fft", (0,))[0] + 1
+    st.session_state["04.large_fft"] = (runs, large_n, large_dtype, large_workers)
+
+if "04.large_fft" in st.session_state:
+    large_key = st.session_state["04.large_fft"]
+    _, run_n, run_dtype, run_workers = large_key
+    large_job = session_job(
+        "04.large_fft", large_key, __file__,
+        lambda job: run_large_fft(run_n, np.dtype(run_dtype), run_workers, progress=job.report),
+        budget_s=120)
+    if large_job is None:
+        st.warning("The benchmark workers are busy right now; please try again in a moment.")
+    else:
+        show_job(large_job, render_large_fft)
 
 st.header("🎯 FFT Algorithm Types")
 
@@ -166,6 +504,58 @@ with col2:
     - More complex but necessary for some applications
     """)
 
+st.subheader("Try It: Any Signal Length")
+
+st.markdown("""
+The app includes a from-scratch, NumPy-vectorized FFT engine that handles every length: 
+**mixed radix** for composite N, **Rader's algorithm** for primes whose N − 1 has only 
+small factors, and **Bluestein's chirp-z** algorithm for the other primes. Enter a length 
+to see the plan it uses, check it against the library FFT and see what padding to the 
+next fast length would save.
+""")
+
+
+@memoize("04.fft_engine")
+def fft_engine_report(n, backend_name):
+    x = test_signal(n)
+    reference = active_backend().fft(x)
+    error = float(np.abs(engine_fft(x) - reference).max() / np.abs(reference).max())
+    return explain(n), error, advise_padding(n)
+
+
+@demo_fragment("04.fft_engine")
+def fft_engine_demo():
+    engine_n = int(st.number_input("Signal length N", min_value=2, max_value=200_000, value=1009))
+    plan, error, advice = fft_engine_report(engine_n, active_backend().name)
+
+    def factors(values):
+        return " · ".join(str(f) for f in values)
+
+    st.markdown(f"**N = {engine_n:,} = {factors(advice['factors'])}**")
+    st.code("\n".join(plan), language="text")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Engine", f"{advice['engine_direct_ms']:.3f} ms",
+                  help=f"Largest error relative to the library FFT: {error:.1e}")
+    with col2:
+        st.metric(f"Library ({advice['library']})", f"{advice['library_direct_ms']:.3f} ms")
+    with col3:
+        st.metric("Engine / library time", f"{advice['engine_direct_ms'] / advice['library_direct_ms']:.1f}x")
+
+    if advice["fast_len"] == engine_n:
+        st.success(f"N = {engine_n:,} is already a fast length (only factors 2, 3, 5 and 7).")
+    else:
+        st.info(f"**Padding advisor:** zero-pad to N = {advice['fast_len']:,} = "
+                f"{factors(advice['fast_factors'])}. The engine then takes "
+                f"{advice['engine_padded_ms']:.3f} ms ({advice['speedup']:.1f}x faster) and the "
+                f"library {advice['library_padded_ms']:.3f} ms ({advice['library_speedup']:.1f}x). "
+                f"Padding samples the spectrum more finely, so use it where the exact "
+                f"N-point bins are not required.")
+
+
+fft_engine_demo()
+
 st.header("💻 Using FFT in Python")
 
 st.subheader("Basic Usage")
@@ -216,46 +606,327 @@ t = np.linspace(0, 1, signal_length)
 freq1, freq2 = 10, 30
 sig = np.sin(2 * np.pi * freq1 * t) + 0.5 * np.sin(2 * np.pi * freq2 * t)
 
-# Compute FFT
-fft_vals = np.fft.fft(sig)
-freqs = np.fft.fftfreq(len(sig), t[1] - t[0])
-magnitude = np.abs(fft_vals)
+# Compute FFT (non-negative frequencies only)
+pos_freqs, pos_magnitude = magnitude_spectrum(sig, sample_spacing(t))
 
 # Measure computation time
-start = time.time()
-_ = np.fft.fft(sig)
-fft_time = (time.time() - start) * 1000  # in milliseconds
-
-fig, axes = plt.subplots(2, 1, figsize=(10, 6))
-
-axes[0].plot(t, sig, 'b-', linewidth=2)
-axes[0].set_title(f'Time Domain Signal (N={signal_length})', 
-                  fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Time (s)')
-axes[0].set_ylabel('Amplitude')
-axes[0].grid(True, alpha=0.3)
-
-pos_idx = freqs >= 0
-axes[1].plot(freqs[pos_idx], magnitude[pos_idx], 'r-', linewidth=2)
-axes[1].set_title(f'FFT Result (Computed in {fft_time:.3f} ms)', 
-                  fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Frequency (Hz)')
-axes[1].set_ylabel('Magnitude')
-axes[1].grid(True, alpha=0.3)
-axes[1].set_xlim(0, 50)
-
-plt.tight_layout()
-st.pyplot(fig)
+fft_timing = measure(active_backend().rfft, sig)
+fft_time = fft_timing.median_ms
+
+def draw_fft_demo(t, sig, pos_freqs, pos_magnitude, signal_length):
+    fig, axes = new_figure(2, 1, figsize=(10, 6))
+
+    axes[0].plot(t, sig, 'b-', linewidth=2)
+    axes[0].set_title(f'Time Domain Signal (N={signal_length})', 
+                      fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Time (s)')
+    axes[0].set_ylabel('Amplitude')
+    axes[0].grid(True, alpha=0.3)
+
+    axes[1].plot(pos_freqs, pos_magnitude, 'r-', linewidth=2)
+    axes[1].set_title(f'FFT Result ({len(pos_freqs)} one-sided bins)', 
+                      fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Frequency (Hz)')
+    axes[1].set_ylabel('Magnitude')
+    axes[1].grid(True, alpha=0.3)
+    axes[1].set_xlim(0, 50)
+
+    fig.tight_layout()
+    return fig
+
+
+show_figure("04.fft_demo", draw_fft_demo,
+            t, sig, pos_freqs, pos_magnitude, signal_length)
 
 st.markdown(f"""
 <div class='info-box'>
     <h4>⚡ Performance</h4>
-    <p>FFT computed {signal_length} samples in {fft_time:.3f} milliseconds. 
+    <p>FFT computed {signal_length} samples in {fft_time:.4f} milliseconds 
+    (median of {len(fft_timing.samples_ns)} samples, IQR {fft_timing.iqr_ms:.4f} ms). 
     The complexity is O(N log N) = O({signal_length} × {np.log2(signal_length):.1f}) 
     ≈ O({int(signal_length * np.log2(signal_length))}) operations.</p>
 </div>
 """, unsafe_allow_html=True)
 
+# Only the two known tones: Goertzel gets them in O(N) each, no full FFT needed
+tone_freqs = [freq1, freq2]
+tone_amplitudes = 2 * np.abs(tone_spectrum(sig, sample_spacing(t), tone_freqs)) / signal_length
+tone_timing = measure(tone_spectrum, sig, sample_spacing(t), tone_freqs, budget_s=0.05)
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"{freq1} Hz amplitude", f"{tone_amplitudes[0]:.3f}", help="True amplitude 1.0")
+with col2:
+    st.metric(f"{freq2} Hz amplitude", f"{tone_amplitudes[1]:.3f}", help="True amplitude 0.5")
+with col3:
+    st.metric("Both tones (Goertzel)", f"{tone_timing.median_ms:.4f} ms",
+              help="Evaluates just these two frequencies instead of every bin")
+
+st.subheader("Sliding DFT: Updating Bins Sample by Sample")
+
+st.markdown("""
+The FFT above transforms the whole buffer every time. A live monitor that wants the 
+spectrum of the last N samples after *every* new sample can update a few bins instead: 
+when the window slides by one sample, bin k becomes 
+X<sub>k</sub> ← e<sup>2πik/N</sup>(X<sub>k</sub> + x<sub>new</sub> − x<sub>oldest</sub>), 
+O(1) per bin per sample, whatever N is. Rounding errors accumulate in that recurrence, so 
+the bins are recomputed exactly from the ring buffer every 16 windows.
+
+Below, a 1 kHz stream plays 10 Hz for 2 s, then 30 Hz, then both; three bins track it.
+""", unsafe_allow_html=True)
+
+SDFT_FS = 1000
+SDFT_SECONDS = 6
+SDFT_TONES = (10, 30, 50)  # Hz; nothing plays at 50 Hz
+SDFT_CHUNK = 100  # samples per push
+
+
+def sliding_dft_stream():
+    t = np.arange(SDFT_FS * SDFT_SECONDS) / SDFT_FS
+    sig = np.where(t < 2, np.sin(2 * np.pi * 10 * t), 0.0)
+    sig += np.where(t >= 2, 0.5 * np.sin(2 * np.pi * 30 * t), 0.0)
+    sig += np.where(t >= 4, np.sin(2 * np.pi * 10 * t), 0.0)
+    sig += 0.2 * np.random.default_rng(0).standard_normal(len(t))
+    return t, sig
+
+
+@memoize("04.sliding_dft")
+def sliding_dft_demo_data(n, backend_name):
+    t, sig = sliding_dft_stream()
+    bins = [f * n // SDFT_FS for f in SDFT_TONES]
+    engine = SlidingDFT(n, bins, SDFT_FS)
+    amplitudes = np.concatenate([2 * np.abs(engine.push(sig[i:i + SDFT_CHUNK])) / n
+                                 for i in range(0, len(sig), SDFT_CHUNK)])
+
+    def stream():
+        streamed = SlidingDFT(n, bins, SDFT_FS)
+        for i in range(0, len(sig), SDFT_CHUNK):
+            streamed.push(sig[i:i + SDFT_CHUNK])
+
+    timing = measure(stream, budget_s=0.1)
+    stats = {"sliding_per_s": len(sig) / timing.median_s,
+             "recompute_per_s": recompute_rate(n, bins, budget_s=0.05),
+             "resyncs": engine.resyncs, "drift": float(np.abs(engine.X - engine.exact()).max())}
+    return t, amplitudes, stats
+
+
+def draw_sliding_dft(t, amplitudes, n):
+    fig, ax = new_figure(figsize=(10, 4))
+    for column, freq, color in zip(amplitudes.T, SDFT_TONES, ('b', 'r', 'g')):
+        ax.plot(t[:len(column)], column, color=color, linewidth=1.5, label=f'{freq} Hz bin')
+    ax.set_xlim(0, SDFT_SECONDS)
+    ax.set_ylim(0, 1.3)
+    ax.set_title(f'Sliding DFT Bins (N={n}, window {1000 * n / SDFT_FS:.0f} ms)',
+                 fontweight='bold', color='#764ba2')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Amplitude')
+    ax.legend(loc='upper left')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("04.sliding_dft")
+def sliding_dft_demo():
+    sdft_n = st.select_slider("Window (samples)", options=[100, 200, 500, 1000], value=500,
+                              help="Bin spacing is 1000/N Hz; longer windows react more slowly")
+    t, amplitudes, stats = sliding_dft_demo_data(sdft_n, active_backend().name)
+    placeholder = st.empty()
+    with placeholder.container():
+        show_figure("04.sliding_dft", draw_sliding_dft, t, amplitudes, sdft_n)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Sliding DFT", f"{stats['sliding_per_s']:,.0f} updates/s",
+                  help=f"{len(SDFT_TONES)} bins, {SDFT_CHUNK} samples per push")
+    with col2:
+        st.metric("FFT per sample", f"{stats['recompute_per_s']:,.0f} updates/s",
+                  help=f"A {sdft_n}-point FFT for every new sample")
+    with col3:
+        st.metric("Speedup", f"{stats['sliding_per_s'] / stats['recompute_per_s']:,.0f}x")
+    with col4:
+        st.metric("Drift from exact DFT", f"{stats['drift']:.1e}",
+                  help=f"At the end of the stream; {stats['resyncs']} exact recomputations "
+                       f"in {len(t):,} samples")
+
+    if st.button("▶ Replay as a live stream", key="sliding_dft_replay"):
+        # Push the stream in chunks and redraw the bins tracked so far; frames are
+        # one-offs, so they bypass the figure cache
+        _, sig = sliding_dft_stream()
+        engine = SlidingDFT(sdft_n, [f * sdft_n // SDFT_FS for f in SDFT_TONES], SDFT_FS)
+        history = []
+        for start in range(0, len(sig), 250):
+            history.append(2 * np.abs(engine.push(sig[start:start + 250])) / sdft_n)
+            placeholder.image(encode_figure(draw_sliding_dft(t, np.concatenate(history), sdft_n)))
+
+
+sliding_dft_demo()
+
+st.subheader("Zoom FFT: A Fine Grid Over One Band")
+
+st.markdown("""
+The plot above only shows 0–50 Hz, yet the FFT computes every bin up to the Nyquist 
+frequency, and its grid is fixed at 1/T (1 Hz for a 1-second signal). The *chirp-z 
+transform* (zoom FFT) evaluates the spectrum only at the frequencies you ask for, at any 
+spacing, for the cost of a few FFTs about the length of the signal. Zero-padding gives 
+the same values but needs an FFT of fs/Δf points. A finer grid shows the true peak 
+positions and shapes more clearly; it does not separate tones closer than about 1/T.
+""")
+
+
+ZOOM_TONES = ((10.3, 1.0), (31.6, 0.5), (33.4, 0.3))  # (Hz, amplitude)
+
+
+@memoize("04.zoom_fft")
+def zoom_fft_demo_data(n, f1, f2, step, window, backend_name):
+    t = np.linspace(0, 1, n, endpoint=False)
+    fs = 1 / sample_spacing(t)
+    sig = sum(amp * np.sin(2 * np.pi * f * t) for f, amp in ZOOM_TONES)
+    m = int(round((f2 - f1) / step)) + 1
+    freqs, X = band_spectrum(sig, 1 / fs, f1, f2, m, window)
+    fft_freqs, fft_X = one_sided_spectrum(sig, 1 / fs, window)
+    in_band = (fft_freqs >= f1) & (fft_freqs <= f2)
+
+    # The same grid from a zero-padded FFT, for speed and accuracy
+    nfft = int(round(fs / step))
+    zoom_timing = measure(zoom_fft, sig, f1, f2, m, fs, budget_s=0.1)
+    padded_timing = measure(padded_fft_band, sig, f1, f2, nfft, fs, budget_s=0.1, max_total_s=2.0)
+    _, padded = padded_fft_band(sig, f1, f2, nfft, fs)
+    _, zoomed = zoom_fft(sig, f1, f2, m, fs)
+    stats = {"bins": m, "nfft": nfft, "zoom_ms": zoom_timing.median_ms,
+             "padded_ms": padded_timing.median_ms,
+             "error": float(np.abs(zoomed - padded[:m]).max() / np.abs(padded).max())}
+    return freqs, np.abs(X), fft_freqs[in_band], np.abs(fft_X[in_band]), stats
+
+
+def draw_zoom_fft(freqs, magnitude, fft_freqs, fft_magnitude, step):
+    fig, ax = new_figure(figsize=(10, 4))
+    ax.plot(freqs, magnitude, 'r-', linewidth=1.5, label=f'Zoom FFT (Δf = {step:g} Hz)')
+    ax.plot(fft_freqs, fft_magnitude, 'bo', markersize=4, label='FFT bins (Δf = 1 Hz)')
+    for f, _ in ZOOM_TONES:
+        ax.axvline(f, color='gray', linestyle=':', linewidth=1)
+    ax.set_xlim(freqs[0], freqs[-1])
+    ax.set_title('Band-Limited Spectrum', fontweight='bold', color='#764ba2')
+    ax.set_xlabel('Frequency (Hz)')
+    ax.set_ylabel('Magnitude')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("04.zoom_fft")
+def zoom_fft_demo():
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        zoom_n = st.select_slider("Samples (1 s)", options=[256, 1024, 4096, 16384], value=1024)
+    with col2:
+        zoom_band = st.slider("Band (Hz)", 0, 120, (0, 50))
+    with col3:
+        zoom_step = st.select_slider("Grid step (Hz)", options=[0.5, 0.1, 0.01, 0.001], value=0.01)
+    if zoom_band[1] <= zoom_band[0]:
+        st.warning("Choose a band wider than 0 Hz.")
+        return
+
+    freqs, magnitude, fft_freqs, fft_magnitude, stats = zoom_fft_demo_data(
+        zoom_n, float(zoom_band[0]), float(zoom_band[1]), zoom_step, active_window(),
+        active_backend().name)
+    show_figure("04.zoom_fft", draw_zoom_fft, freqs, magnitude, fft_freqs, fft_magnitude, zoom_step)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Zoom FFT", f"{stats['zoom_ms']:.3f} ms", help=f"{stats['bins']:,} bins")
+    with col2:
+        st.metric("Zero-padded FFT", f"{stats['padded_ms']:.3f} ms",
+                  help=f"{stats['nfft']:,}-point FFT for the same grid")
+    with col3:
+        st.metric("Speedup", f"{stats['padded_ms'] / stats['zoom_ms']:.1f}x")
+    with col4:
+        st.metric("Max difference", f"{stats['error']:.1e}", help="Relative to the largest bin")
+
+
+zoom_fft_demo()
+
+st.subheader("Zoom Into a Million-Bin Spectrum")
+
+st.markdown("""
+Long recordings give spectra with millions of bins, far more than a plot has pixels. The 
+spectrum below is stored as a *pyramid*: every level keeps the maximum of 4 neighbouring 
+bins of the level below, and each level is split into tiles. A zoom or pan reads only the 
+tiles covering the visible band, at the coarsest level that still has one bin per pixel, 
+so the cost of a view depends on the plot width rather than the FFT length, and no peak 
+is lost at any zoom.
+""")
+
+PYRAMID_FS = 44_100
+PYRAMID_WIDTH = 1800  # points per plot, about the rendered axes width in pixels
+
+
+@memoize("04.spectrum_pyramid")
+def spectrum_pyramid(log2_n, window):
+    n = 1 << log2_n
+    t = np.arange(n) / PYRAMID_FS
+    rng = np.random.default_rng(0)
+    sig = (np.sin(2 * np.pi * 440 * t) + 0.5 * np.sin(2 * np.pi * 1000.5 * t)
+           + 0.1 * np.sin(2 * np.pi * 5_000 * t) + 0.01 * np.sin(2 * np.pi * 12_345.6 * t)
+           + 0.001 * np.sin(2 * np.pi * 15_000 * t) + 0.01 * rng.standard_normal(n))
+    _, X = one_sided_spectrum(sig, 1 / PYRAMID_FS, window)
+    return SpectrumPyramid.from_spectrum(X, PYRAMID_FS / n)
+
+
+def draw_pyramid_view(freqs, magnitude, fmin, fmax, level, log2_n):
+    fig, ax = new_figure(figsize=(10, 4))
+    ax.semilogy(freqs, np.maximum(magnitude, 1e-3), 'r-', linewidth=1)
+    ax.set_xlim(fmin, fmax)
+    ax.set_title(f'{(1 << log2_n) // 2 + 1:,}-bin spectrum, {fmin:,.1f}–{fmax:,.1f} Hz '
+                 f'(pyramid level {level})', fontweight='bold', color='#764ba2')
+    ax.set_xlabel('Frequency (Hz)')
+    ax.set_ylabel('Magnitude (max per point)')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("04.spectrum_pyramid")
+def spectrum_pyramid_demo():
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        log2_n = st.select_slider("FFT length", options=list(range(16, 23)), value=21,
+                                  format_func=lambda k: f"2^{k} = {1 << k:,}")
+    with col2:
+        centre = st.slider("Centre (Hz)", 0.0, PYRAMID_FS / 2, 1000.0, step=0.5)
+    with col3:
+        zoom = st.select_slider("Zoom", options=[4 ** k for k in range(8)], value=16,
+                                format_func=lambda z: f"{z:,}×")
+
+    pyramid = spectrum_pyramid(log2_n, active_window())
+    span = PYRAMID_FS / 2 / zoom
+    fmin = min(max(centre - span / 2, 0.0), PYRAMID_FS / 2 - span)
+    fmax = fmin + span
+
+    reads_before = pyramid.tile_reads
+    start = time.perf_counter()
+    freqs, magnitude, level = pyramid.view(fmin, fmax, PYRAMID_WIDTH)
+    view_ms = (time.perf_counter() - start) * 1e3
+
+    show_figure("04.spectrum_pyramid", draw_pyramid_view,
+                freqs, magnitude, fmin, fmax, level, log2_n)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Bins in view", f"{int(span / pyramid.df) + 1:,}")
+    with col2:
+        st.metric("Points plotted", f"{len(magnitude):,}",
+                  help=f"Level {level}: each point is the max of {4 ** level:,} bins")
+    with col3:
+        st.metric("Tiles read", f"{pyramid.tile_reads - reads_before}",
+                  help=f"{pyramid.tile:,} bins per tile; tiles already in the cache are not re-read")
+    with col4:
+        st.metric("View time", f"{view_ms:.2f} ms")
+
+
+spectrum_pyramid_demo()
+
 st.header("🔍 FFT vs DFT: Key Differences")
 
 st.markdown("""
@@ -1,6 +1,14 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+from fourier.backends import active_backend
+from fourier.cache import memoize
+from fourier.figures import new_figure
+from fourier.fragments import demo_fragment
+from fourier.plotting import show_figure
+from fourier.spectrum import (band_filter, centered_magnitude_2d, magnitude_spectrum, sample_spacing,
+                              tone_spectrum)
+from fourier.windows import active_window
 
 st.title("🔧 Engineering Applications of Fourier Transform")
 st.markdown("---")
@@ -32,50 +40,71 @@ st.markdown("""
 
 st.subheader("🎨 Interactive Demo: Signal Modulation")
 
-modulation_type = st.selectbox("Modulation Type", ["AM (Amplitude Modulation)", "FM (Frequency Modulation)"])
+@memoize("05.modulation")
+def modulation(modulation_type, window, carrier_freq=50, message_freq=5):
+    t = np.linspace(0, 1, 1000)
+    message = np.sin(2 * np.pi * message_freq * t)
+    if modulation_type == "AM (Amplitude Modulation)":
+        modulated = (1 + 0.5 * message) * np.sin(2 * np.pi * carrier_freq * t)
+    else:
+        modulated = np.sin(2 * np.pi * (carrier_freq + 10 * message) * t)
 
-t = np.linspace(0, 1, 1000)
-carrier_freq = 50
-message_freq = 5
+    # FFT (non-negative frequencies only)
+    pos_freqs, pos_magnitude = magnitude_spectrum(modulated, sample_spacing(t), window)
+    # Carrier and first sidebands only
+    tones = [carrier_freq - message_freq, carrier_freq, carrier_freq + message_freq]
+    tone_amplitudes = 2 * np.abs(tone_spectrum(modulated, sample_spacing(t), tones, window)) / len(t)
+    return t, message, modulated, pos_freqs, pos_magnitude, dict(zip(tones, tone_amplitudes))
 
-if modulation_type == "AM (Amplitude Modulation)":
-    message = np.sin(2 * np.pi * message_freq * t)
-    modulated = (1 + 0.5 * message) * np.sin(2 * np.pi * carrier_freq * t)
-    title = "Amplitude Modulation"
-else:
-    message = np.sin(2 * np.pi * message_freq * t)
-    modulated = np.sin(2 * np.pi * (carrier_freq + 10 * message) * t)
-    title = "Frequency Modulation"
-
-# FFT
-fft_mod = np.fft.fft(modulated)
-freqs = np.fft.fftfreq(len(modulated), t[1] - t[0])
-magnitude = np.abs(fft_mod)
-
-fig, axes = plt.subplots(3, 1, figsize=(10, 9))
-axes[0].plot(t[:200], message[:200], 'b-', linewidth=2)
-axes[0].set_title('Message Signal', fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Time (s)')
-axes[0].set_ylabel('Amplitude')
-axes[0].grid(True, alpha=0.3)
-
-axes[1].plot(t[:200], modulated[:200], 'r-', linewidth=2)
-axes[1].set_title(f'{title}: Modulated Signal', fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Time (s)')
-axes[1].set_ylabel('Amplitude')
-axes[1].grid(True, alpha=0.3)
-
-pos_idx = freqs >= 0
-axes[2].plot(freqs[pos_idx], magnitude[pos_idx], 'g-', linewidth=2)
-axes[2].set_title('Frequency Domain: Shows Carrier and Sidebands', 
-                  fontweight='bold', color='#667eea')
-axes[2].set_xlabel('Frequency (Hz)')
-axes[2].set_ylabel('Magnitude')
-axes[2].grid(True, alpha=0.3)
-axes[2].set_xlim(0, 100)
-
-plt.tight_layout()
-st.pyplot(fig)
+
+def draw_modulation(t, message, modulated, pos_freqs, pos_magnitude, title):
+    fig, axes = new_figure(3, 1, figsize=(10, 9))
+    axes[0].plot(t[:200], message[:200], 'b-', linewidth=2)
+    axes[0].set_title('Message Signal', fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Time (s)')
+    axes[0].set_ylabel('Amplitude')
+    axes[0].grid(True, alpha=0.3)
+
+    axes[1].plot(t[:200], modulated[:200], 'r-', linewidth=2)
+    axes[1].set_title(f'{title}: Modulated Signal', fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Time (s)')
+    axes[1].set_ylabel('Amplitude')
+    axes[1].grid(True, alpha=0.3)
+
+    axes[2].plot(pos_freqs, pos_magnitude, 'g-', linewidth=2)
+    axes[2].set_title('Frequency Domain: Shows Carrier and Sidebands', 
+                      fontweight='bold', color='#667eea')
+    axes[2].set_xlabel('Frequency (Hz)')
+    axes[2].set_ylabel('Magnitude')
+    axes[2].grid(True, alpha=0.3)
+    axes[2].set_xlim(0, 100)
+
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("05.modulation")
+def modulation_demo():
+    modulation_type = st.selectbox("Modulation Type",
+                                   ["AM (Amplitude Modulation)", "FM (Frequency Modulation)"])
+
+    if modulation_type == "AM (Amplitude Modulation)":
+        title = "Amplitude Modulation"
+    else:
+        title = "Frequency Modulation"
+
+    t, message, modulated, pos_freqs, pos_magnitude, tones = modulation(modulation_type, active_window())
+
+    show_figure("05.modulation", draw_modulation,
+                t, message, modulated, pos_freqs, pos_magnitude, title)
+
+    labels = ["Lower sideband", "Carrier", "Upper sideband"]
+    for col, label, (freq, amplitude) in zip(st.columns(3), labels, tones.items()):
+        with col:
+            st.metric(f"{label} ({freq:g} Hz)", f"{amplitude:.3f}")
+
+
+modulation_demo()
 
 st.markdown("---")
 
@@ -94,59 +123,90 @@ st.markdown("""
 
 st.subheader("🎨 Interactive Demo: Audio Filtering")
 
-filter_type = st.selectbox("Filter Type", ["Low-pass", "High-pass", "Band-pass"])
-
-# Generate audio-like signal (multiple frequencies)
-t = np.linspace(0, 1, 2000)
-audio_signal = (np.sin(2 * np.pi * 50 * t) + 
-                0.5 * np.sin(2 * np.pi * 200 * t) + 
-                0.3 * np.sin(2 * np.pi * 500 * t) + 
-                0.2 * np.sin(2 * np.pi * 1000 * t))
-
-# FFT
-fft_audio = np.fft.fft(audio_signal)
-freqs = np.fft.fftfreq(len(audio_signal), t[1] - t[0])
-
-# Apply filter
-fft_filtered = fft_audio.copy()
-if filter_type == "Low-pass":
-    fft_filtered[np.abs(freqs) > 300] = 0
-    filter_name = "Low-pass (< 300 Hz)"
-elif filter_type == "High-pass":
-    fft_filtered[np.abs(freqs) < 300] = 0
-    filter_name = "High-pass (> 300 Hz)"
-else:  # Band-pass
-    fft_filtered[(np.abs(freqs) < 200) | (np.abs(freqs) > 500)] = 0
-    filter_name = "Band-pass (200-500 Hz)"
-
-filtered_signal = np.real(np.fft.ifft(fft_filtered))
-
-fig, axes = plt.subplots(2, 1, figsize=(10, 6))
-pos_idx = freqs >= 0
-
-axes[0].plot(freqs[pos_idx], np.abs(fft_audio[pos_idx]), 'b-', 
-             linewidth=2, label='Original Spectrum', alpha=0.7)
-axes[0].plot(freqs[pos_idx], np.abs(fft_filtered[pos_idx]), 'r-', 
-             linewidth=2, label=f'{filter_name}')
-axes[0].set_title('Frequency Domain: Audio Spectrum', fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Frequency (Hz)')
-axes[0].set_ylabel('Magnitude')
-axes[0].legend()
-axes[0].grid(True, alpha=0.3)
-axes[0].set_xlim(0, 1200)
-
-axes[1].plot(t[:500], audio_signal[:500], 'b-', linewidth=1.5, 
-             label='Original Signal', alpha=0.7)
-axes[1].plot(t[:500], filtered_signal[:500], 'r-', linewidth=2, 
-             label='Filtered Signal')
-axes[1].set_title('Time Domain: Audio Signal', fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Time (s)')
-axes[1].set_ylabel('Amplitude')
-axes[1].legend()
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-st.pyplot(fig)
+AUDIO_TONES = [50, 200, 500, 1000]  # Hz
+
+
+@memoize("05.audio_filter")
+def audio_filter(filter_type, window):
+    # Generate audio-like signal (multiple frequencies)
+    t = np.linspace(0, 1, 2000)
+    audio_signal = (np.sin(2 * np.pi * 50 * t) + 
+                    0.5 * np.sin(2 * np.pi * 200 * t) + 
+                    0.3 * np.sin(2 * np.pi * 500 * t) + 
+                    0.2 * np.sin(2 * np.pi * 1000 * t))
+
+    # Filter in the frequency domain
+    if filter_type == "Low-pass":
+        keep = lambda freqs: freqs <= 300
+    elif filter_type == "High-pass":
+        keep = lambda freqs: freqs >= 300
+    else:  # Band-pass
+        keep = lambda freqs: (freqs >= 200) & (freqs <= 500)
+
+    pos_freqs, fft_audio, fft_filtered, filtered_signal = band_filter(
+        audio_signal, sample_spacing(t), keep)
+
+    # Level of each component before and after, both signals in one batch
+    levels = 2 * np.abs(tone_spectrum(np.stack([audio_signal, filtered_signal]),
+                                      sample_spacing(t), AUDIO_TONES, window)) / len(t)
+
+    return (t, audio_signal, filtered_signal, pos_freqs,
+            np.abs(fft_audio), np.abs(fft_filtered), levels)
+
+
+def draw_audio_filter(t, audio_signal, filtered_signal, pos_freqs,
+                      original_magnitude, filtered_magnitude, filter_name):
+    fig, axes = new_figure(2, 1, figsize=(10, 6))
+
+    axes[0].plot(pos_freqs, original_magnitude, 'b-', 
+                 linewidth=2, label='Original Spectrum', alpha=0.7)
+    axes[0].plot(pos_freqs, filtered_magnitude, 'r-', 
+                 linewidth=2, label=f'{filter_name}')
+    axes[0].set_title('Frequency Domain: Audio Spectrum', fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Frequency (Hz)')
+    axes[0].set_ylabel('Magnitude')
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+    axes[0].set_xlim(0, 1200)
+
+    axes[1].plot(t[:500], audio_signal[:500], 'b-', linewidth=1.5, 
+                 label='Original Signal', alpha=0.7)
+    axes[1].plot(t[:500], filtered_signal[:500], 'r-', linewidth=2, 
+                 label='Filtered Signal')
+    axes[1].set_title('Time Domain: Audio Signal', fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Time (s)')
+    axes[1].set_ylabel('Amplitude')
+    axes[1].legend()
+    axes[1].grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+@demo_fragment("05.audio_filter")
+def audio_filter_demo():
+    filter_type = st.selectbox("Filter Type", ["Low-pass", "High-pass", "Band-pass"])
+
+    if filter_type == "Low-pass":
+        filter_name = "Low-pass (< 300 Hz)"
+    elif filter_type == "High-pass":
+        filter_name = "High-pass (> 300 Hz)"
+    else:  # Band-pass
+        filter_name = "Band-pass (200-500 Hz)"
+
+    (t, audio_signal, filtered_signal, pos_freqs,
+     original_magnitude, filtered_magnitude, levels) = audio_filter(filter_type, active_window())
+
+    show_figure("05.audio_filter", draw_audio_filter, t, audio_signal, filtered_signal,
+                pos_freqs, original_magnitude, filtered_magnitude, filter_name)
+
+    for col, freq, before, after in zip(st.columns(len(AUDIO_TONES)), AUDIO_TONES, *levels):
+        with col:
+            st.metric(f"{freq} Hz level", f"{after:.2f}", f"{round(after - before, 2) + 0:+.2f}",
+                      help=f"Amplitude after filtering; {before:.2f} before")
+
+
+audio_filter_demo()
 
 st.markdown("---")
 
@@ -164,42 +224,48 @@ st.markdown("""
 
 st.subheader("🎨 Demo: 2D FFT Concept")
 
-# Create a simple 2D pattern
-size = 128
-x = np.linspace(0, 4*np.pi, size)
-y = np.linspace(0, 4*np.pi, size)
-X, Y = np.meshgrid(x, y)
-image = np.sin(X) + 0.5 * np.sin(2*Y)
+@memoize("05.fft_2d_demo")
+def fft_2d_demo(size=128, cutoff=20):
+    # Create a simple 2D pattern
+    x = np.linspace(0, 4*np.pi, size)
+    y = np.linspace(0, 4*np.pi, size)
+    X, Y = np.meshgrid(x, y)
+    image = np.sin(X) + 0.5 * np.sin(2*Y)
+
+    # 2D FFT of a real image: only the non-negative column frequencies
+    fft_2d = active_backend().rfft2(image)
+    magnitude_2d = centered_magnitude_2d(fft_2d, image.shape)
+
+    # Reconstruct with the low frequencies (|k| < cutoff on both axes) removed
+    fft_high = fft_2d.copy()
+    fft_high[:cutoff, :cutoff] = 0
+    fft_high[-(cutoff - 1):, :cutoff] = 0
+    reconstructed = active_backend().irfft2(fft_high, image.shape)
+    return image, magnitude_2d, reconstructed
+
+
+image, magnitude_2d, reconstructed = fft_2d_demo()
 
-# 2D FFT
-fft_2d = np.fft.fft2(image)
-fft_shifted = np.fft.fftshift(fft_2d)
-magnitude_2d = np.abs(fft_shifted)
+def draw_fft_2d(image, magnitude_2d, reconstructed):
+    fig, axes = new_figure(1, 3, figsize=(15, 5))
 
-fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    axes[0].imshow(image, cmap='gray')
+    axes[0].set_title('Original Image', fontweight='bold', color='#667eea')
+    axes[0].axis('off')
 
-axes[0].imshow(image, cmap='gray')
-axes[0].set_title('Original Image', fontweight='bold', color='#667eea')
-axes[0].axis('off')
+    axes[1].imshow(np.log(magnitude_2d + 1), cmap='hot')
+    axes[1].set_title('2D FFT Magnitude (log scale)', fontweight='bold', color='#764ba2')
+    axes[1].axis('off')
 
-axes[1].imshow(np.log(magnitude_2d + 1), cmap='hot')
-axes[1].set_title('2D FFT Magnitude (log scale)', fontweight='bold', color='#764ba2')
-axes[1].axis('off')
+    axes[2].imshow(reconstructed, cmap='gray')
+    axes[2].set_title('High-Pass Filtered', fontweight='bold', color='#667eea')
+    axes[2].axis('off')
 
-# Reconstruct from low frequencies only
-fft_low = fft_shifted.copy()
-center = size // 2
-cutoff = 20
-fft_low[center-cutoff:center+cutoff, center-cutoff:center+cutoff] = 0
-fft_low = np.fft.ifftshift(fft_low)
-reconstructed = np.real(np.fft.ifft2(fft_low))
+    fig.tight_layout()
+    return fig
 
-axes[2].imshow(reconstructed, cmap='gray')
-axes[2].set_title('High-Pass Filtered', fontweight='bold', color='#667eea')
-axes[2].axis('off')
 
-plt.tight_layout()
-st.pyplot(fig)
+show_figure("05.fft_2d", draw_fft_2d, image, magnitude_2d, reconstructed)
 
 st.markdown("---")
 
@@ -225,26 +291,31 @@ H = 1 / (1 + 1j * freq_range / cutoff_freq)
 magnitude_response = np.abs(H)
 phase_response = np.angle(H) * 180 / np.pi
 
-fig, axes = plt.subplots(2, 1, figsize=(10, 8))
-
-axes[0].semilogx(freq_range, 20 * np.log10(magnitude_response), 'b-', linewidth=2)
-axes[0].axvline(cutoff_freq, color='r', linestyle='--', label=f'Cutoff: {cutoff_freq} Hz')
-axes[0].set_title('Magnitude Response (Bode Plot)', fontweight='bold', color='#667eea')
-axes[0].set_xlabel('Frequency (Hz)')
-axes[0].set_ylabel('Magnitude (dB)')
-axes[0].grid(True, alpha=0.3)
-axes[0].legend()
-
-axes[1].semilogx(freq_range, phase_response, 'r-', linewidth=2)
-axes[1].axvline(cutoff_freq, color='r', linestyle='--', label=f'Cutoff: {cutoff_freq} Hz')
-axes[1].set_title('Phase Response', fontweight='bold', color='#764ba2')
-axes[1].set_xlabel('Frequency (Hz)')
-axes[1].set_ylabel('Phase (degrees)')
-axes[1].grid(True, alpha=0.3)
-axes[1].legend()
-
-plt.tight_layout()
-st.pyplot(fig)
+def draw_bode_plot(freq_range, magnitude_response, phase_response, cutoff_freq):
+    fig, axes = new_figure(2, 1, figsize=(10, 8))
+
+    axes[0].semilogx(freq_range, 20 * np.log10(magnitude_response), 'b-', linewidth=2)
+    axes[0].axvline(cutoff_freq, color='r', linestyle='--', label=f'Cutoff: {cutoff_freq} Hz')
+    axes[0].set_title('Magnitude Response (Bode Plot)', fontweight='bold', color='#667eea')
+    axes[0].set_xlabel('Frequency (Hz)')
+    axes[0].set_ylabel('Magnitude (dB)')
+    axes[0].grid(True, alpha=0.3)
+    axes[0].legend()
+
+    axes[1].semilogx(freq_range, phase_response, 'r-', linewidth=2)
+    axes[1].axvline(cutoff_freq, color='r', linestyle='--', label=f'Cutoff: {cutoff_freq} Hz')
+    axes[1].set_title('Phase Response', fontweight='bold', color='#764ba2')
+    axes[1].set_xlabel('Frequency (Hz)')
+    axes[1].set_ylabel('Phase (degrees)')
+    axes[1].grid(True, alpha=0.3)
+    axes[1].legend()
+
+    fig.tight_layout()
+    return fig
+
+
+show_figure("05.bode_plot", draw_bode_plot,
+            freq_range, magnitude_response, phase_response, cutoff_freq)
 
 st.markdown("---")
 
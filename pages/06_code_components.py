@@ -56,7 +56,14 @@ The app includes custom CSS for vibrant, modern styling:
 
 ### 3. Navigation System
 - Sidebar radio buttons for page navigation
-- Each page is loaded dynamically using `exec()`
+- Each page is compiled once by `fourier.page_loader.PageRegistry` and re-executed on rerun
+- Pages are recompiled only when their file changes; timings are shown in the sidebar
+- Heavy libraries (numpy, matplotlib) are imported only for pages that plot, and are
+  warmed up in the background on a cold start (see the sidebar import profile)
+- An FFT backend selector (`numpy.fft`, multithreaded `scipy.fft`, or optional
+  `pyfftw` / `mkl_fft` when installed) used by every page's transforms
+- A spectrum window selector (Hann, Hamming, Blackman-Harris, Kaiser, flat-top, DPSS or
+  none); windows are cached per length and spectra are corrected by the coherent gain
 - Clean, intuitive navigation structure
 """)
 
@@ -105,7 +112,8 @@ st.markdown("""
 - Three complete code examples:
   1. Basic Fourier Transform
   2. Filtering with FFT
-  3. Frequency analysis of complex signals
+  3. Frequency analysis of complex signals (whole-signal spectrum and a streaming
+     STFT spectrogram with window, hop and FFT size controls, in frames/s)
 - Interactive demos for each example
 - Code snippets with syntax highlighting
 
@@ -128,7 +136,20 @@ st.markdown("""
 - FFT types and variants
 
 **Key Features**:
+- Runnable Cooley-Tukey variants (recursive, iterative, radix-4, split-radix) with
+  operation counts
 - Performance timing comparisons
+- Empirical scaling suite: log-log plot with fitted exponents
+  (also `python -m fourier.scaling` from a shell)
+- FFT backend throughput comparison (1D, 2D and batched transforms)
+- Large-N mode: multithreaded four-step FFT up to 2^26 samples, float32 or float64
+- Out-of-core six-step FFT for files larger than RAM
+  (`python -m fourier.out_of_core`)
+- Any-length FFT engine (mixed radix, Rader, Bluestein) with a padding advisor
+- Goertzel amplitudes of the two known tones, without a full FFT
+- Streaming sliding DFT: three bins updated every sample, in updates/s vs an FFT per sample
+- Zoom FFT (chirp-z) of one band on a fine grid, timed against a zero-padded FFT
+- Zoom and pan over a million-bin spectrum through a max-pooled, tiled pyramid
 - Interactive N-value selection
 - Complexity analysis visualization
 """)
@@ -146,7 +167,7 @@ st.markdown("""
   4. Control Systems
   5. Medical Imaging
   6. Other Applications
-- Interactive demos for each area
+- Interactive demos for each area (carrier/sideband and filtered tone levels by Goertzel)
 - Real-world examples
 
 **Key Features**:
@@ -317,7 +338,8 @@ st.markdown("""
 4. **Interactive Elements**: Sliders and controls for exploration
 5. **Visual Feedback**: Real-time updates based on user input
 6. **Error Handling**: Graceful handling of edge cases
-7. **Performance**: Efficient FFT usage for large datasets
+7. **Performance**: Efficient FFT usage for large datasets; long line plots are decimated
+   to the pixels they cover (min/max envelope or LTTB) before matplotlib draws them
 """)
 
 st.header("🔍 Key Functions Reference")
@@ -49,6 +49,16 @@ with col1:
                         arcname = os.path.relpath(file_path, base_dir)
                         zip_file.write(file_path, arcname)
             
+            # Add shared helper package
+            package_dir = os.path.join(base_dir, 'fourier')
+            if os.path.exists(package_dir):
+                for root, dirs, files in os.walk(package_dir):
+                    dirs[:] = [d for d in dirs if d != '__pycache__']
+                    for file in files:
+                        file_path = os.path.join(root, file)
+                        arcname = os.path.relpath(file_path, base_dir)
+                        zip_file.write(file_path, arcname)
+            
             # Add requirements.txt
             req_path = os.path.join(base_dir, 'requirements.txt')
             if os.path.exists(req_path):